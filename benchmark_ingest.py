@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+HALbasic Ingest Benchmark Script
+Measures parser record building throughput and peak memory, and database
+insert throughput, on a synthetic LINAC log so ingest optimizations can be
+compared against the old paths.
+
+Usage:
+    python benchmark_ingest.py [--lines N] [--file existing_log.txt]
+
+Developer: gobioeng.com
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from unified_parser import UnifiedParser, ColumnarRecordBuilder
+
+
+SAMPLE_PARAMETERS = [
+    "logStatistics CoolingpumpPressureStatistics",
+    "logStatistics FanremoteTempStatistics",
+    "logStatistics FanhumidityStatistics",
+    "logStatistics FanfanSpeed1Statistics",
+    "CoolingmagnetronFlowLowStatistics",
+    "MLC_ADC_CHAN_TEMP_BANKA_STAT_24V",
+]
+
+
+def generate_sample_log(file_path: str, line_count: int, stats_ratio: float = 0.4):
+    """Write a synthetic HAL log with a mix of event and statistics lines"""
+    rng = random.Random(42)
+    with open(file_path, "w", encoding="utf-8") as f:
+        for i in range(line_count):
+            day = 1 + (i // 5000) % 28
+            stamp = f"2025-08-{day:02d}\t{(i // 200) % 24:02d}:{(i // 4) % 60:02d}:{i % 60:02d}"
+            serial = rng.choice(["2123", "2207", "2350"])
+            if rng.random() < stats_ratio:
+                avg = round(rng.uniform(10, 30), 2)
+                f.write(
+                    f"{stamp}\tINFO\tSTN\tSN# {serial}\t{rng.choice(SAMPLE_PARAMETERS)}: "
+                    f"count={rng.randint(1, 200)}, max={avg + 1}, min={avg - 1}, avg={avg}\n"
+                )
+            else:
+                f.write(f"{stamp}\tINFO\tSTN\tSN# {serial}\tevent id={i}\n")
+
+
+def _read_chunks(file_path: str, chunk_size: int = 1000):
+    """Read the file into (line_number, line) chunks like parse_linac_file does"""
+    chunks, chunk_lines = [], []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line:
+                chunk_lines.append((line_number, line))
+                if len(chunk_lines) >= chunk_size:
+                    chunks.append(chunk_lines)
+                    chunk_lines = []
+    if chunk_lines:
+        chunks.append(chunk_lines)
+    return chunks
+
+
+def _build_with_dicts(parser: UnifiedParser, chunks) -> pd.DataFrame:
+    """Previous path: one dict per record, DataFrame built from the dict list"""
+    records = []
+    for chunk_lines in chunks:
+        records.extend(parser._process_chunk_optimized(chunk_lines))
+    return pd.DataFrame(records)
+
+
+def _build_with_columns(parser: UnifiedParser, chunks) -> pd.DataFrame:
+    """Current path: typed column buffers, DataFrame built once"""
+    builder = ColumnarRecordBuilder()
+    for chunk_lines in chunks:
+        parser._process_chunk_columnar(chunk_lines, builder)
+    return builder.to_dataframe()
+
+
+def _measure(build_func, chunks):
+    """Return (seconds, peak_bytes, DataFrame) for one record building path"""
+    parser = UnifiedParser()
+    start = time.perf_counter()
+    df = build_func(parser, chunks)
+    elapsed = time.perf_counter() - start
+    del df
+
+    # Separate run for memory - tracemalloc slows allocation-heavy code down
+    parser = UnifiedParser()
+    tracemalloc.start()
+    df = build_func(parser, chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, df
+
+
+def benchmark_record_builders(file_path: str):
+    """Compare dict records against the columnar record builder"""
+    print("\n🧱 Record builder benchmark (dict records vs column buffers)")
+    chunks = _read_chunks(file_path)
+
+    results = {}
+    for name, build_func in [("dict records", _build_with_dicts),
+                             ("column buffers", _build_with_columns)]:
+        elapsed, peak, df = _measure(build_func, chunks)
+        results[name] = (elapsed, peak, df)
+        rate = len(df) / elapsed if elapsed > 0 else 0
+        print(f"  {name:<15} {len(df):>10,} records  {elapsed:7.2f}s  "
+              f"{rate:>12,.0f} records/sec  peak {peak / 1024 / 1024:8.1f} MB")
+
+    dict_df = results["dict records"][2]
+    columnar_df = results["column buffers"][2]
+    pd.testing.assert_frame_equal(dict_df, columnar_df)
+    print("  ✓ Both paths produce identical DataFrames")
+
+    dict_time, dict_peak = results["dict records"][:2]
+    col_time, col_peak = results["column buffers"][:2]
+    if col_time > 0 and col_peak > 0:
+        print(f"  ⚡ Speedup: {dict_time / col_time:.2f}x, "
+              f"peak memory reduction: {dict_peak / col_peak:.2f}x")
+
+
+def benchmark_database_inserts(file_path: str, work_dir: str):
+    """Compare insert_data_batch against the insert_bulk fast path"""
+    from database import DatabaseManager
+
+    print("\n💾 Database insert benchmark (batch insert vs bulk load)")
+    df = UnifiedParser().parse_linac_file(file_path, enable_validation=False,
+                                          explode_statistics=False)
+
+    paths = [
+        ("insert_data_batch", lambda db: db.insert_data_batch(df)),
+        ("insert_bulk", lambda db: db.insert_bulk(df)),
+        ("bulk + import mode", lambda db: db.insert_bulk(df, import_mode=True)),
+    ]
+
+    # DatabaseManager keeps its backups under ./data
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        results = {}
+        for index, (name, insert) in enumerate(paths):
+            db = DatabaseManager(db_path=os.path.join(work_dir, f"benchmark_{index}.db"))
+            start = time.perf_counter()
+            inserted = insert(db)
+            elapsed = time.perf_counter() - start
+            results[name] = (elapsed, inserted, db.get_all_logs())
+            db.connection_pool.close_all()
+            # Collect it here, so its exit backup lands in the temporary ./data
+            del db
+            gc.collect()
+
+        print()
+        for name, (elapsed, inserted, _) in results.items():
+            rate = inserted / elapsed if elapsed > 0 else 0
+            print(f"  {name:<19} {inserted:>10,} records  {elapsed:7.2f}s  {rate:>12,.0f} records/sec")
+
+        baseline = results["insert_data_batch"]
+        for name, (_, _, logs) in results.items():
+            pd.testing.assert_frame_equal(baseline[2], logs)
+        print("  ✓ All paths store identical readings")
+
+        for name, (elapsed, _, _) in list(results.items())[1:]:
+            if elapsed > 0:
+                print(f"  ⚡ {name}: {baseline[0] / elapsed:.2f}x")
+    finally:
+        os.chdir(previous_dir)
+
+
+def main():
+    """Run the ingest benchmarks"""
+    parser = argparse.ArgumentParser(description="HALbasic ingest benchmark")
+    parser.add_argument("--lines", type=int, default=500_000,
+                        help="lines in the generated sample log")
+    parser.add_argument("--file", help="benchmark an existing log file instead")
+    parser.add_argument("--skip-database", action="store_true",
+                        help="only benchmark parsing, not database inserts")
+    args = parser.parse_args()
+
+    print("🧪 HALbasic Ingest Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = args.file
+        if not file_path:
+            file_path = os.path.join(temp_dir, "benchmark_log.txt")
+            print(f"📝 Generating {args.lines:,} line sample log...")
+            generate_sample_log(file_path, args.lines)
+
+        size_mb = os.path.getsize(file_path) / 1024 / 1024
+        print(f"📁 {file_path} ({size_mb:.1f} MB)")
+
+        benchmark_record_builders(file_path)
+        if not args.skip_database:
+            benchmark_database_inserts(file_path, temp_dir)
+
+    print("\n" + "=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+SQLite Connection Pool for HALbasic
+Shared, bounded connection management for the HALog databases.
+
+One pool per database file provides:
+- Up to max_readers WAL reader connections, reused across threads
+- A single writer connection, held by one thread at a time
+- PRAGMAs applied once, when a connection is opened
+- A health check (SELECT 1) before reusing a connection that sat idle
+- Eviction of connections idle for longer than idle_timeout
+
+Nested use on one thread gets the connection that thread already holds, and
+reads inside a held writer use the writer, so they see its uncommitted
+changes.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of SQLite reader connections plus a single writer connection"""
+
+    DEFAULT_PRAGMAS = [
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=30000",
+    ]
+
+    def __init__(self, db_path: str, max_readers: int = 4, pragmas: Optional[List[str]] = None,
+                 idle_timeout: float = 300.0, health_check_interval: float = 30.0,
+                 timeout: float = 30.0):
+        """
+        Args:
+            db_path: SQLite database file
+            max_readers: Reader connections open at most at the same time
+            pragmas: Statements run once on every new connection
+            idle_timeout: Seconds after which an unused connection is closed
+            health_check_interval: Idle seconds after which a connection is
+                checked before it is handed out again
+            timeout: Seconds to wait for a free reader or the writer
+        """
+        self.db_path = db_path
+        self.max_readers = max(1, max_readers)
+        self.pragmas = list(pragmas) if pragmas is not None else list(self.DEFAULT_PRAGMAS)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._reader_available = threading.Condition(self._lock)
+        self._idle_readers = []  # [(connection, last_used)], most recently used last
+        self._readers_in_use = 0
+        self._writer = None
+        self._writer_last_used = 0.0
+        self._writer_lock = threading.RLock()
+        self._local = threading.local()
+        self._closed = False
+
+        self._metrics = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "reader_acquisitions": 0,
+            "writer_acquisitions": 0,
+            "reader_waits": 0,
+            "wait_time": 0.0,
+            "health_check_failures": 0,
+            "idle_evictions": 0,
+        }
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a configured connection outside the pool (caller closes it)"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=False)
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        with self._lock:
+            self._metrics["connections_opened"] += 1
+        return conn
+
+    def _close(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._metrics["connections_closed"] += 1
+
+    def _is_healthy(self, conn: sqlite3.Connection, last_used: float) -> bool:
+        """SELECT 1 on a connection that has been idle for a while"""
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            self._metrics["health_check_failures"] += 1
+            return False
+
+    def _evict_idle(self):
+        """Close idle connections unused for longer than idle_timeout (lock held)"""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [conn for conn, last_used in self._idle_readers if last_used < cutoff]
+        if expired:
+            self._idle_readers = [(c, t) for c, t in self._idle_readers if t >= cutoff]
+            for conn in expired:
+                self._close(conn)
+            self._metrics["idle_evictions"] += len(expired)
+
+        if self._writer is not None and self._writer_last_used < cutoff and \
+                self._writer_lock.acquire(blocking=False):
+            try:
+                if self._writer is not None and not getattr(self._local, "writer_depth", 0):
+                    self._close(self._writer)
+                    self._writer = None
+                    self._metrics["idle_evictions"] += 1
+            finally:
+                self._writer_lock.release()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            self._metrics["reader_acquisitions"] += 1
+            self._evict_idle()
+            waited = False
+            while True:
+                while self._idle_readers:
+                    conn, last_used = self._idle_readers.pop()
+                    if self._is_healthy(conn, last_used):
+                        self._readers_in_use += 1
+                        return conn
+                    self._close(conn)
+
+                if self._readers_in_use < self.max_readers:
+                    self._readers_in_use += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(
+                        f"No reader connection available after {self.timeout:.0f}s"
+                    )
+                if not waited:
+                    self._metrics["reader_waits"] += 1
+                    waited = True
+                wait_start = time.monotonic()
+                self._reader_available.wait(remaining)
+                self._metrics["wait_time"] += time.monotonic() - wait_start
+
+        # Open outside the lock; the slot is already reserved
+        try:
+            return self.connect()
+        except Exception:
+            with self._lock:
+                self._readers_in_use -= 1
+                self._reader_available.notify()
+            raise
+
+    def _release_reader(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._readers_in_use -= 1
+            if self._closed:
+                self._close(conn)
+            else:
+                self._idle_readers.append((conn, time.monotonic()))
+            self._reader_available.notify()
+
+    @contextmanager
+    def reader(self):
+        """Reader connection for the duration of the block"""
+        local = self._local
+        if getattr(local, "writer_depth", 0):
+            # Reads inside a write see its uncommitted changes
+            yield self._writer
+            return
+        if getattr(local, "reader_depth", 0):
+            local.reader_depth += 1
+            try:
+                yield local.reader
+            finally:
+                local.reader_depth -= 1
+            return
+
+        conn = self._acquire_reader()
+        local.reader, local.reader_depth = conn, 1
+        try:
+            yield conn
+        finally:
+            local.reader, local.reader_depth = None, 0
+            self._release_reader(conn)
+
+    @contextmanager
+    def writer(self, timeout: Optional[float] = None):
+        """The single writer connection, exclusive to this thread for the block
+
+        Args:
+            timeout: Seconds to wait for the writer (default the pool
+                timeout, -1 waits indefinitely)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if not self._writer_lock.acquire(timeout=timeout):
+            raise sqlite3.OperationalError(f"Writer connection busy for {timeout:.0f}s")
+        local = self._local
+        try:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            if not getattr(local, "writer_depth", 0):
+                with self._lock:
+                    self._metrics["writer_acquisitions"] += 1
+                    if self._writer is not None and not self._is_healthy(self._writer, self._writer_last_used):
+                        self._close(self._writer)
+                        self._writer = None
+                if self._writer is None:
+                    self._writer = self.connect()
+
+            local.writer_depth = getattr(local, "writer_depth", 0) + 1
+            try:
+                yield self._writer
+            except Exception:
+                if local.writer_depth == 1 and self._writer.in_transaction:
+                    self._writer.rollback()
+                raise
+            finally:
+                local.writer_depth -= 1
+                self._writer_last_used = time.monotonic()
+        finally:
+            self._writer_lock.release()
+
+    def get_metrics(self) -> Dict:
+        """Pool counters plus the current number of idle and in-use connections"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["readers_idle"] = len(self._idle_readers)
+            metrics["readers_in_use"] = self._readers_in_use
+            metrics["max_readers"] = self.max_readers
+            metrics["writer_open"] = self._writer is not None
+            return metrics
+
+    def close_all(self):
+        """Close idle connections and the writer; readers in use close when released"""
+        with self._writer_lock:
+            with self._lock:
+                for conn, _ in self._idle_readers:
+                    self._close(conn)
+                self._idle_readers = []
+                if self._writer is not None:
+                    self._close(self._writer)
+                    self._writer = None
+                self._closed = True
+
+    def reopen(self):
+        """Accept connections again after close_all (e.g. once a backup is restored)"""
+        with self._lock:
+            self._closed = False
@@ -5,18 +5,29 @@ Enhanced with backup and recovery capabilities
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, List, Any, Tuple
 import os
-from functools import reduce
+import json
+import threading
 import time
 import traceback
 from contextlib import contextmanager
 
+from connection_pool import SQLiteConnectionPool
+from write_queue import DatabaseWriteQueue
+
 
 class DatabaseManager:
     """Enhanced database manager with batch operations, optimized queries, and backup support"""
 
+    # Run once on every pooled connection
+    CONNECTION_PRAGMAS = SQLiteConnectionPool.DEFAULT_PRAGMAS + [
+        "PRAGMA cache_size=50000",
+        "PRAGMA mmap_size=268435456",
+    ]
+
     def __init__(self, db_path: str = None):
         # Import backup manager
         from database_backup_manager import DatabaseBackupManager
@@ -30,8 +41,15 @@ class DatabaseManager:
         else:
             self.db_path = db_path
             
-        self.connection_pool = {}
+        self.connection_pool = SQLiteConnectionPool(self.db_path, pragmas=self.CONNECTION_PRAGMAS)
+        # Single-writer job queue, started on first submit_write
+        self.write_queue = None
+        self._write_queue_lock = threading.Lock()
         self.prepared_statements = {}
+        # serials/parameters value -> id, per table
+        self._dimension_cache = {}
+        # month index -> partition table name (None if archived)
+        self._partition_cache = {}
         
         # Initialize error handling system
         self.error_manager = None
@@ -117,25 +135,26 @@ class DatabaseManager:
             conn.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
 
             # Create tables if they don't exist
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS water_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    datetime TEXT NOT NULL,
-                    serial_number TEXT NOT NULL,
-                    parameter_type TEXT NOT NULL,
-                    statistic_type TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    count INTEGER,
-                    unit TEXT,
-                    description TEXT,
-                    data_quality TEXT,
-                    raw_parameter TEXT,
-                    line_number INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-            )
+            self._create_reading_tables(conn)
+
+            # Convert a legacy long-format water_logs table and a single
+            # water_readings table into monthly partitions, then expose
+            # water_readings and the long water_logs layout as views
+            self._migrate_long_water_logs(conn)
+            self._partition_water_readings(conn)
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name='water_readings'"
+            ).fetchone():
+                self._refresh_readings_view(conn)
+            self._create_water_logs_view(conn)
+
+            # Fill the hourly/daily rollups of readings stored before they existed
+            if not conn.execute("SELECT 1 FROM readings_hourly LIMIT 1").fetchone() and \
+                    conn.execute("SELECT 1 FROM water_readings LIMIT 1").fetchone():
+                self._rebuild_rollups(conn)
+            if not conn.execute("SELECT 1 FROM reading_stats LIMIT 1").fetchone() and \
+                    conn.execute("SELECT 1 FROM water_readings LIMIT 1").fetchone():
+                self._rebuild_reading_stats(conn)
 
             # Create optimized indices
             self._create_indices(conn)
@@ -153,6 +172,37 @@ class DatabaseManager:
                 )
             """
             )
+
+            # Incremental ingest position per log file (see incremental_ingest.py)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ingest_state (
+                    file_path TEXT PRIMARY KEY,
+                    byte_offset INTEGER NOT NULL,
+                    line_number INTEGER NOT NULL,
+                    head_fingerprint TEXT,
+                    head_length INTEGER,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
+            # Content-addressed registry of imported files (see import_registry.py)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS import_registry (
+                    content_hash TEXT PRIMARY KEY,
+                    file_size INTEGER NOT NULL,
+                    line_count INTEGER,
+                    filename TEXT,
+                    records_imported INTEGER,
+                    import_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_import_registry_size ON import_registry(file_size)"
+            )
             
             # Create import validation log table
             conn.execute(
@@ -179,160 +229,968 @@ class DatabaseManager:
 
             conn.commit()
 
-    def _create_indices(self, conn):
-        """Create optimized database indices"""
-        # Check if indices already exist to avoid redundant operations
-        indices = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='index'"
-        ).fetchall()
-        existing_indices = [idx[0] for idx in indices]
-
-        index_definitions = [
-            (
-                "idx_datetime",
-                "CREATE INDEX IF NOT EXISTS idx_datetime ON water_logs(datetime)",
-            ),
-            (
-                "idx_parameter_type",
-                "CREATE INDEX IF NOT EXISTS idx_parameter_type ON water_logs(parameter_type)",
-            ),
-            (
-                "idx_serial_parameter",
-                "CREATE INDEX IF NOT EXISTS idx_serial_parameter ON water_logs(serial_number, parameter_type)",
-            ),
-            (
-                "idx_datetime_parameter",
-                "CREATE INDEX IF NOT EXISTS idx_datetime_parameter ON water_logs(datetime, parameter_type)",
-            ),
-            (
-                "idx_statistic_type",
-                "CREATE INDEX IF NOT EXISTS idx_statistic_type ON water_logs(statistic_type)",
-            ),
-            (
-                "idx_combined",
-                "CREATE INDEX IF NOT EXISTS idx_combined ON water_logs(datetime, serial_number, parameter_type, statistic_type)",
-            ),
-        ]
+    # water_readings statistic columns with their statistic_types ids, in the
+    # order the water_logs view produces rows
+    READING_STATISTICS = [(1, "avg", "avg_value"), (2, "min", "min_value"), (3, "max", "max_value")]
+
+    # Columns of water_readings and of each monthly partition table. One row
+    # per reading; ts is epoch seconds of the (naive) log time
+    READINGS_TABLE_SQL = """(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts INTEGER NOT NULL,
+        serial_id INTEGER NOT NULL REFERENCES serials(id),
+        parameter_id INTEGER NOT NULL REFERENCES parameters(id),
+        avg_value REAL,
+        min_value REAL,
+        max_value REAL,
+        count INTEGER,
+        data_quality TEXT,
+        line_number INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )"""
+    READINGS_COLUMNS = [
+        "id", "ts", "serial_id", "parameter_id", "avg_value", "min_value",
+        "max_value", "count", "data_quality", "line_number", "created_at",
+    ]
+
+    # Rollup tables with their bucket width in seconds, coarsest first
+    ROLLUP_TABLES = {"readings_daily": 86400, "readings_hourly": 3600}
+
+    # Merges the readings selected by {condition} from {source} into {rollup}
+    ROLLUP_UPSERT_SQL = """
+        INSERT INTO {rollup}
+        (serial_id, parameter_id, bucket_ts, avg_sum, avg_count, min_value, max_value, reading_count)
+        SELECT serial_id, parameter_id, ts / {width} * {width},
+               TOTAL(avg_value), COUNT(avg_value), MIN(min_value), MAX(max_value), COUNT(*)
+        FROM {source}
+        WHERE {condition}
+        GROUP BY serial_id, parameter_id, ts / {width}
+        ON CONFLICT (serial_id, parameter_id, bucket_ts) DO UPDATE SET
+            avg_sum = avg_sum + excluded.avg_sum,
+            avg_count = avg_count + excluded.avg_count,
+            min_value = CASE WHEN min_value IS NULL OR excluded.min_value < min_value
+                             THEN excluded.min_value ELSE min_value END,
+            max_value = CASE WHEN max_value IS NULL OR excluded.max_value > max_value
+                             THEN excluded.max_value ELSE max_value END,
+            reading_count = reading_count + excluded.reading_count
+    """
+
+    def _update_rollups(self, conn, source: str, condition: str, params: tuple = ()):
+        """Add the readings of source matching condition to every rollup table"""
+        for rollup, width in self.ROLLUP_TABLES.items():
+            conn.execute(
+                self.ROLLUP_UPSERT_SQL.format(rollup=rollup, width=width, source=source, condition=condition),
+                params,
+            )
 
-        for idx_name, idx_query in index_definitions:
-            if idx_name not in existing_indices:
-                conn.execute(idx_query)
+    def _rebuild_rollups(self, conn, start_ts: Optional[int] = None, end_ts: Optional[int] = None):
+        """Recompute rollups from the hot partitions, for [start_ts, end_ts) or everything"""
+        start_ts = start_ts if start_ts is not None else -(2 ** 62)
+        end_ts = end_ts if end_ts is not None else 2 ** 62
+        for rollup in self.ROLLUP_TABLES:
+            conn.execute(f"DELETE FROM {rollup} WHERE bucket_ts >= ? AND bucket_ts < ?", (start_ts, end_ts))
+        for table in self._reading_partitions(conn, start_ts, end_ts - 1):
+            self._update_rollups(conn, table, "ts >= ? AND ts < ?", (start_ts, end_ts))
+
+    # Merges the readings of partition {table} selected by {condition} into reading_stats
+    STATS_UPSERT_SQL = """
+        INSERT INTO reading_stats
+        (table_name, serial_id, parameter_id, data_quality, reading_count, statistic_count, min_ts, max_ts)
+        SELECT '{table}', serial_id, parameter_id, IFNULL(data_quality, ''), COUNT(*),
+               COUNT(avg_value) + COUNT(min_value) + COUNT(max_value), MIN(ts), MAX(ts)
+        FROM {table}
+        WHERE {condition}
+        GROUP BY serial_id, parameter_id, IFNULL(data_quality, '')
+        ON CONFLICT (table_name, serial_id, parameter_id, data_quality) DO UPDATE SET
+            reading_count = reading_count + excluded.reading_count,
+            statistic_count = statistic_count + excluded.statistic_count,
+            min_ts = MIN(min_ts, excluded.min_ts),
+            max_ts = MAX(max_ts, excluded.max_ts)
+    """
+
+    def _update_reading_stats(self, conn, table: str, condition: str = "1", params: tuple = ()):
+        """Add the readings of a partition matching condition to the stats catalog"""
+        conn.execute(self.STATS_UPSERT_SQL.format(table=table, condition=condition), params)
+
+    def _rebuild_reading_stats(self, conn, tables: Optional[List[str]] = None):
+        """Recompute the stats catalog of the given hot partitions, or of all of them"""
+        if tables is None:
+            conn.execute("DELETE FROM reading_stats")
+            tables = self._reading_partitions(conn)
+        for table in tables:
+            conn.execute("DELETE FROM reading_stats WHERE table_name = ?", (table,))
+            self._update_reading_stats(conn, table)
+
+    # Readings are stored in one table per month (readings_YYYY_MM). Ids of a
+    # partition start at month_index * PARTITION_ID_SPAN, so they stay unique
+    # across partitions
+    PARTITION_ID_SPAN = 10 ** 9
+
+    # Dimension tables referenced by the readings (also copied into archives)
+    DIMENSION_TABLES = {
+        "serials": """(
+            id INTEGER PRIMARY KEY,
+            serial_number TEXT NOT NULL UNIQUE
+        )""",
+        "parameters": """(
+            id INTEGER PRIMARY KEY,
+            parameter_type TEXT NOT NULL UNIQUE,
+            unit TEXT,
+            description TEXT
+        )""",
+        "statistic_types": """(
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )""",
+    }
+
+    def _create_reading_tables(self, conn):
+        """Create the dimension tables and the reading partition catalog"""
+        for table, columns_sql in self.DIMENSION_TABLES.items():
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} {columns_sql}")
+        conn.executemany(
+            "INSERT OR IGNORE INTO statistic_types (id, name) VALUES (?, ?)",
+            [(stat_id, name) for stat_id, name, _ in self.READING_STATISTICS],
+        )
+
+        # Ingest-time rollups per (serial, parameter, bucket); mean = avg_sum / avg_count
+        for table in self.ROLLUP_TABLES:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    serial_id INTEGER NOT NULL,
+                    parameter_id INTEGER NOT NULL,
+                    bucket_ts INTEGER NOT NULL,
+                    avg_sum REAL NOT NULL DEFAULT 0,
+                    avg_count INTEGER NOT NULL DEFAULT 0,
+                    min_value REAL,
+                    max_value REAL,
+                    reading_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (serial_id, parameter_id, bucket_ts)
+                ) WITHOUT ROWID
+            """
+            )
 
-    @contextmanager
-    def get_connection(self):
-        """Get a database connection with thread safety and performance optimizations"""
-        # Thread-safe connection pool
-        import threading
+        # Stats catalog behind get_summary_statistics: statistic records and
+        # time range per partition, serial, parameter and quality ('' for none)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reading_stats (
+                table_name TEXT NOT NULL,
+                serial_id INTEGER NOT NULL,
+                parameter_id INTEGER NOT NULL,
+                data_quality TEXT NOT NULL,
+                reading_count INTEGER NOT NULL DEFAULT 0,
+                statistic_count INTEGER NOT NULL DEFAULT 0,
+                min_ts INTEGER,
+                max_ts INTEGER,
+                PRIMARY KEY (table_name, serial_id, parameter_id, data_quality)
+            ) WITHOUT ROWID
+        """
+        )
 
-        thread_id = threading.get_ident()
+        # Partition catalog: [start_ts, end_ts) per monthly table; archive_path
+        # is set while the partition lives in an archive file
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reading_partitions (
+                table_name TEXT PRIMARY KEY,
+                month TEXT NOT NULL UNIQUE,
+                start_ts INTEGER NOT NULL,
+                end_ts INTEGER NOT NULL,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                archive_path TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+    @staticmethod
+    def _month_index(epochs: pd.Series) -> pd.Series:
+        """Months since 1970-01 for epoch seconds"""
+        times = pd.to_datetime(epochs.astype("int64"), unit="s")
+        return (times.dt.year - 1970) * 12 + times.dt.month - 1
+
+    @staticmethod
+    def _partition_bounds(month_index: int) -> Tuple[str, str, int, int]:
+        """(table name, 'YYYY-MM', start_ts, end_ts) of a monthly partition"""
+        year, month = divmod(int(month_index), 12)
+        start = pd.Timestamp(year=1970 + year, month=month + 1, day=1)
+        end = start + pd.offsets.MonthBegin(1)
+        second = pd.Timedelta(seconds=1)
+        return (
+            f"readings_{start:%Y_%m}",
+            f"{start:%Y-%m}",
+            int((start - pd.Timestamp(0)) // second),
+            int((end - pd.Timestamp(0)) // second),
+        )
+
+    def _create_partition_indices(self, conn, table: str, schema: str = "main"):
+        """Natural key, time and covering lookup indices of one partition table
+
+        The statistic values ride along in the parameter and serial indices,
+        so trend reads never touch the table rows.
+        """
+        self._create_natural_key(conn, table, schema)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_ts ON {table}(ts)")
+        conn.execute(
+            f"""CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_parameter_ts_cover
+                ON {table}(parameter_id, ts, serial_id, avg_value, min_value, max_value)"""
+        )
+        conn.execute(
+            f"""CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_serial_parameter_ts_cover
+                ON {table}(serial_id, parameter_id, ts, avg_value, min_value, max_value)"""
+        )
+
+    def _create_natural_key(self, conn, table: str, schema: str = "main"):
+        """Unique (serial_id, parameter_id, ts) index - one reading per machine, parameter and time"""
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.idx_{table}_natural_key "
+            f"ON {table}(serial_id, parameter_id, ts)"
+        )
+
+    def _ensure_natural_key(self, conn, table: str):
+        """Add the natural key to a partition created before it, dropping duplicate readings"""
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (f"idx_{table}_natural_key",)
+        ).fetchone():
+            return
 
-        if thread_id not in self.connection_pool:
-            self.connection_pool[thread_id] = sqlite3.connect(
-                self.db_path, timeout=30.0, isolation_level=None
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            # The first stored copy of a reading wins, as with ON CONFLICT DO NOTHING
+            cursor = conn.execute(
+                f"""
+                DELETE FROM {table} WHERE id NOT IN (
+                    SELECT MIN(id) FROM {table} GROUP BY serial_id, parameter_id, ts
+                )
+            """
             )
-            conn = self.connection_pool[thread_id]
-            
-            # Apply performance optimizations to new connections
-            conn.execute("PRAGMA foreign_keys=ON")
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=50000")
-            conn.execute("PRAGMA temp_store=MEMORY")
-            conn.execute("PRAGMA mmap_size=268435456")
-            conn.execute("PRAGMA busy_timeout=30000")
+            if cursor.rowcount:
+                print(f"🔄 Removed {cursor.rowcount:,} duplicate readings from {table}")
+                conn.execute(
+                    "UPDATE reading_partitions SET row_count = row_count - ? WHERE table_name = ?",
+                    (cursor.rowcount, table),
+                )
+                start_ts, end_ts = conn.execute(
+                    "SELECT start_ts, end_ts FROM reading_partitions WHERE table_name = ?", (table,)
+                ).fetchone()
+                self._rebuild_rollups(conn, start_ts, end_ts)
+                self._rebuild_reading_stats(conn, [table])
+            self._create_natural_key(conn, table)
+            conn.execute("COMMIT")
+        except Exception as e:
+            print(f"❌ Adding the natural key to {table} failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+    def _drop_partition_indices(self, conn, table: str):
+        """Drop the secondary indices of a partition (rebuilt by _create_partition_indices)
+
+        The natural key stays, so duplicate readings are still skipped.
+        """
+        for suffix in ("ts", "parameter_ts_cover", "serial_parameter_ts_cover"):
+            conn.execute(f"DROP INDEX IF EXISTS idx_{table}_{suffix}")
 
-        conn = self.connection_pool[thread_id]
+    def _ensure_partition(self, conn, month_index: int, refresh_view: bool = True) -> Optional[str]:
+        """Table name of a month's partition, creating it if needed
+
+        Returns None if the month is archived.
+        """
+        month_index = int(month_index)
+        if month_index in self._partition_cache:
+            return self._partition_cache[month_index]
+
+        table, month, start_ts, end_ts = self._partition_bounds(month_index)
+        row = conn.execute(
+            "SELECT archive_path FROM reading_partitions WHERE table_name = ?", (table,)
+        ).fetchone()
+        if row and row[0]:
+            print(f"⚠️ Partition {month} is archived in {row[0]} - restore it to add readings")
+            self._partition_cache[month_index] = None
+            return None
+
+        if not row:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} {self.READINGS_TABLE_SQL}")
+            self._create_partition_indices(conn, table)
+            # Start this partition's AUTOINCREMENT ids at its own base
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+            conn.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                (table, month_index * self.PARTITION_ID_SPAN),
+            )
+            conn.execute(
+                "INSERT INTO reading_partitions (table_name, month, start_ts, end_ts) VALUES (?, ?, ?, ?)",
+                (table, month, start_ts, end_ts),
+            )
+            if refresh_view:
+                self._refresh_readings_view(conn)
+
+        self._partition_cache[month_index] = table
+        return table
+
+    def _refresh_readings_view(self, conn):
+        """(Re)create water_readings as the UNION ALL of the hot partitions"""
+        tables = [
+            row[0]
+            for row in conn.execute(
+                "SELECT table_name FROM reading_partitions WHERE archive_path IS NULL ORDER BY start_ts"
+            )
+        ]
+        columns = ", ".join(self.READINGS_COLUMNS)
+        if tables:
+            body = " UNION ALL ".join(f"SELECT {columns} FROM {table}" for table in tables)
+        else:
+            body = "SELECT " + ", ".join(f"NULL AS {col}" for col in self.READINGS_COLUMNS) + " LIMIT 0"
+        conn.execute("DROP VIEW IF EXISTS water_readings")
+        conn.execute(f"CREATE VIEW water_readings AS {body}")
+
+    def _reading_partitions(self, conn, start_ts: Optional[int] = None,
+                            end_ts: Optional[int] = None) -> List[str]:
+        """Hot partition tables overlapping [start_ts, end_ts], oldest first"""
+        rows = conn.execute(
+            """
+            SELECT table_name FROM reading_partitions
+            WHERE archive_path IS NULL
+              AND (? IS NULL OR end_ts > ?)
+              AND (? IS NULL OR start_ts <= ?)
+            ORDER BY start_ts
+        """,
+            (start_ts, start_ts, end_ts, end_ts),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _partition_water_readings(self, conn):
+        """Split a single water_readings table into monthly partitions"""
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='water_readings'"
+        ).fetchone():
+            return
+
+        start_time = time.time()
+        columns = ", ".join(self.READINGS_COLUMNS[1:])
         try:
-            yield conn
+            conn.execute("BEGIN TRANSACTION")
+            months = conn.execute(
+                """
+                SELECT DISTINCT (CAST(strftime('%Y', ts, 'unixepoch') AS INTEGER) - 1970) * 12
+                                + CAST(strftime('%m', ts, 'unixepoch') AS INTEGER) - 1
+                FROM water_readings
+            """
+            ).fetchall()
+            for (month_index,) in months:
+                table = self._ensure_partition(conn, month_index, refresh_view=False)
+                _, _, start_ts, end_ts = self._partition_bounds(month_index)
+                # Duplicate readings of the unpartitioned table are dropped here
+                cursor = conn.execute(
+                    f"""
+                    INSERT OR IGNORE INTO {table} ({columns})
+                    SELECT {columns} FROM water_readings
+                    WHERE ts >= ? AND ts < ? ORDER BY id
+                """,
+                    (start_ts, end_ts),
+                )
+                conn.execute(
+                    "UPDATE reading_partitions SET row_count = row_count + ? WHERE table_name = ?",
+                    (cursor.rowcount, table),
+                )
+            conn.execute("DROP TABLE water_readings")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name='water_readings'")
+            self._refresh_readings_view(conn)
+            conn.execute("COMMIT")
+            print(f"✓ Split water_readings into {len(months)} monthly partitions in {time.time() - start_time:.2f}s")
         except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            # Don't close the connection, keep it in the pool
-            pass
+            print(f"❌ Partitioning water_readings failed: {e}")
+            traceback.print_exc()
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._partition_cache.clear()
+            raise
+
+    def _create_water_logs_view(self, conn):
+        """Expose water_readings in the legacy long layout (one row per statistic)
+
+        Rows come out as avg, min, max per reading like the old table; the
+        CROSS JOIN keeps statistic_types as the inner loop.
+        """
+        conn.execute(
+            """
+            CREATE VIEW IF NOT EXISTS water_logs AS
+            SELECT
+                r.id * 3 + st.id - 3 AS id,
+                datetime(r.ts, 'unixepoch') AS datetime,
+                s.serial_number AS serial_number,
+                p.parameter_type AS parameter_type,
+                st.name AS statistic_type,
+                CASE st.id WHEN 1 THEN r.avg_value WHEN 2 THEN r.min_value ELSE r.max_value END AS value,
+                r.count AS count,
+                p.unit AS unit,
+                p.description AS description,
+                r.data_quality AS data_quality,
+                NULL AS raw_parameter,
+                r.line_number AS line_number,
+                r.created_at AS created_at
+            FROM water_readings r
+            JOIN serials s ON s.id = r.serial_id
+            JOIN parameters p ON p.id = r.parameter_id
+            CROSS JOIN statistic_types st
+            WHERE CASE st.id WHEN 1 THEN r.avg_value WHEN 2 THEN r.min_value ELSE r.max_value END IS NOT NULL
+        """
+        )
+
+    def _migrate_long_water_logs(self, conn):
+        """Move rows of a legacy water_logs table into water_readings
+
+        avg/min/max rows of the same (datetime, serial, parameter) become one
+        reading. Rows with unparseable datetimes or other statistic types are
+        dropped. The legacy table is replaced by the water_logs view.
+        """
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='water_logs'"
+        ).fetchone()
+        if not legacy:
+            return
+
+        legacy_rows = conn.execute("SELECT COUNT(*) FROM water_logs").fetchone()[0]
+        print(f"🔄 Migrating {legacy_rows:,} water_logs rows to the wide water_readings table...")
+        start_time = time.time()
+
+        if legacy_rows and os.path.exists(self.db_path):
+            self.backup_manager.create_backup(self.db_path)
+
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            # Staging table, split into monthly partitions afterwards
+            conn.execute(f"CREATE TABLE water_readings {self.READINGS_TABLE_SQL}")
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO serials (serial_number)
+                SELECT DISTINCT serial_number FROM water_logs
+            """
+            )
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO parameters (parameter_type, unit, description)
+                SELECT parameter_type, MAX(unit), MAX(description)
+                FROM water_logs GROUP BY parameter_type
+            """
+            )
+            conn.execute(
+                """
+                INSERT INTO water_readings
+                (ts, serial_id, parameter_id, avg_value, min_value, max_value,
+                 count, data_quality, line_number, created_at)
+                SELECT
+                    CAST(strftime('%s', w.datetime) AS INTEGER) AS ts,
+                    s.id,
+                    p.id,
+                    MAX(CASE WHEN w.statistic_type = 'avg' THEN w.value END),
+                    MAX(CASE WHEN w.statistic_type = 'min' THEN w.value END),
+                    MAX(CASE WHEN w.statistic_type = 'max' THEN w.value END),
+                    MAX(w.count),
+                    MAX(w.data_quality),
+                    MIN(w.line_number),
+                    MIN(w.created_at)
+                FROM water_logs w
+                JOIN serials s ON s.serial_number = w.serial_number
+                JOIN parameters p ON p.parameter_type = w.parameter_type
+                WHERE w.statistic_type IN ('avg', 'min', 'max')
+                  AND strftime('%s', w.datetime) IS NOT NULL
+                GROUP BY ts, s.id, p.id
+                ORDER BY MIN(w.id)
+            """
+            )
+            readings = conn.execute("SELECT COUNT(*) FROM water_readings").fetchone()[0]
+            conn.execute("DROP TABLE water_logs")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name='water_logs'")
+            self._create_water_logs_view(conn)
+            conn.execute("COMMIT")
+
+            elapsed = time.time() - start_time
+            print(f"✓ Migrated water_logs: {legacy_rows:,} rows -> {readings:,} readings in {elapsed:.2f}s")
+        except Exception as e:
+            print(f"❌ water_logs migration failed, keeping the legacy table: {e}")
+            traceback.print_exc()
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def _create_indices(self, conn):
+        """Create optimized database indices"""
+        for table in self._reading_partitions(conn):
+            self._ensure_natural_key(conn, table)
+            self._create_partition_indices(conn, table)
+
+    @contextmanager
+    def get_connection(self, timeout: Optional[float] = None):
+        """Get the pool's writer connection (one thread at a time; reads inside it use it too)
+
+        Args:
+            timeout: Seconds to wait for the writer (default 30, -1 waits indefinitely)
+        """
+        with self.connection_pool.writer(timeout) as conn:
+            yield conn
+
+    @contextmanager
+    def get_read_connection(self):
+        """Get a pooled WAL reader connection for read-only queries"""
+        with self.connection_pool.reader() as conn:
+            yield conn
+
+    def submit_write(self, fn, *args, coalesce: bool = False, **kwargs):
+        """Run a write on the single-writer queue instead of the calling thread
+
+        Args:
+            fn: Callable doing the write, e.g. self.insert_file_metadata
+            coalesce: Share a transaction with other small queued writes;
+                only for writes that do not BEGIN/COMMIT themselves
+
+        Returns:
+            concurrent.futures.Future with fn's result
+        """
+        with self._write_queue_lock:
+            if self.write_queue is None or not self.write_queue.is_alive():
+                self.write_queue = DatabaseWriteQueue(self)
+                self.write_queue.start()
+        return self.write_queue.submit(fn, *args, coalesce=coalesce, **kwargs)
+
+    def flush_writes(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the queued writes to finish"""
+        if self.write_queue is None:
+            return True
+        return self.write_queue.flush(timeout)
+
+    def get_pool_metrics(self) -> Dict:
+        """Connection pool counters (connections opened/closed, waits, evictions, in use)"""
+        return self.connection_pool.get_metrics()
 
     def insert_data_batch(self, df: pd.DataFrame, batch_size: int = 1000) -> int:
-        """Insert data in optimized batches for better performance"""
+        """Insert data in optimized batches for better performance
+
+        Accepts either long frames (one row per statistic with a 'value'
+        column) or wide parser frames with avg_value/min_value/max_value.
+        Long frames are pivoted to one row per reading first.
+
+        Returns:
+            Number of statistic records inserted (avg, min and max count
+            separately, as in the long layout)
+        """
+        if df.empty:
+            return 0
+
+        if "value" in df.columns:
+            df = self._long_to_wide(df)
+
+        return self.insert_wide_batch(df, batch_size=batch_size)
+
+    def _long_to_wide(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Pivot a long frame (one row per statistic) to one row per reading"""
+        df = df.copy()
+        for col in ["serial_number", "parameter_type", "statistic_type", "count",
+                    "unit", "description", "data_quality", "line_number"]:
+            if col not in df.columns:
+                df[col] = None
+        df = df[df["statistic_type"].isin(["avg", "min", "max"])]
+
+        keys = ["datetime", "serial_number", "parameter_type"]
+        values = (
+            df.groupby(keys + ["statistic_type"], sort=False, dropna=False)["value"]
+            .last()
+            .unstack("statistic_type")
+            .reindex(columns=["avg", "min", "max"])
+            .rename(columns=lambda stat: f"{stat}_value")
+        )
+        details = df.groupby(keys, sort=False, dropna=False).agg(
+            count=("count", "max"),
+            unit=("unit", "first"),
+            description=("description", "first"),
+            data_quality=("data_quality", "first"),
+            line_number=("line_number", "min"),
+        )
+        return details.join(values).reset_index()
+
+    def _dimension_ids(self, conn: sqlite3.Connection, table: str, column: str,
+                       values) -> Dict[str, int]:
+        """Map serial numbers / parameter names to their small-integer ids, adding new ones"""
+        cache = self._dimension_cache.setdefault(table, {})
+        missing = [value for value in set(values) if value not in cache]
+        if missing:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)",
+                [(value,) for value in missing],
+            )
+            placeholders = ",".join("?" * len(missing))
+            for row_id, value in conn.execute(
+                f"SELECT id, {column} FROM {table} WHERE {column} IN ({placeholders})",
+                missing,
+            ):
+                cache[value] = row_id
+        return cache
+
+    def _update_parameter_details(self, conn: sqlite3.Connection, df: pd.DataFrame):
+        """Store unit/description of parameters where the frame provides them"""
+        if "unit" not in df.columns and "description" not in df.columns:
+            return
+        details = df.reindex(columns=["parameter_type", "unit", "description"])
+        details = details.dropna(subset=["unit", "description"], how="all")
+        if details.empty:
+            return
+        details = details.drop_duplicates("parameter_type").astype(object)
+        details = details.where(details.notna(), None)
+        conn.executemany(
+            """
+            UPDATE parameters
+            SET unit = COALESCE(?, unit), description = COALESCE(?, description)
+            WHERE parameter_type = ?
+        """,
+            [(unit, description, param) for param, unit, description in details.values.tolist()],
+        )
+
+    @staticmethod
+    def _to_epoch_seconds(datetimes: pd.Series) -> pd.Series:
+        """Epoch seconds of naive datetimes (NaN where unparseable)"""
+        if not pd.api.types.is_datetime64_any_dtype(datetimes):
+            datetimes = pd.to_datetime(datetimes, errors="coerce", format="mixed")
+        return (datetimes - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+
+    # Readings already stored (same natural key) are skipped, so re-imports
+    # and overlapping logs are idempotent
+    READING_INSERT_SQL = """
+        INSERT INTO {table}
+        (ts, serial_id, parameter_id, avg_value, min_value, max_value,
+         count, data_quality, line_number)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (serial_id, parameter_id, ts) DO NOTHING
+    """
+
+    # Same insert with a whole batch passed as one JSON array - a single
+    # statement step per batch, so the GIL is released once per batch instead
+    # of once per row while another thread is parsing (needs SQLite 3.38+)
+    READING_INSERT_JSON_SQL = """
+        INSERT INTO {table}
+        (ts, serial_id, parameter_id, avg_value, min_value, max_value,
+         count, data_quality, line_number)
+        SELECT value->>0, value->>1, value->>2, value->>3, value->>4,
+               value->>5, value->>6, value->>7, value->>8
+        FROM json_each(?)
+        WHERE true
+        ON CONFLICT (serial_id, parameter_id, ts) DO NOTHING
+    """
+    JSON_BATCH_INSERT = sqlite3.sqlite_version_info >= (3, 38, 0)
+
+    def _wide_columns(self, conn: sqlite3.Connection, df: pd.DataFrame) -> List[pd.Series]:
+        """INSERT columns of a wide frame, resolving serial/parameter ids
+
+        Rows without a parseable datetime are dropped; readings without a
+        serial number are stored under 'Unknown'. Returns [] for no rows.
+        """
+        epochs = self._to_epoch_seconds(df["datetime"])
+        valid = epochs.notna()
+        if not valid.all():
+            print(f"⚠️ Skipping {int((~valid).sum()):,} readings without a valid datetime")
+            df = df[valid]
+            epochs = epochs[valid]
+        if df.empty:
+            return []
+
+        def column_or_none(name):
+            return df[name] if name in df.columns else pd.Series([None] * len(df), index=df.index)
+
+        serials = column_or_none("serial_number").fillna("Unknown").astype(str)
+        parameters = df["parameter_type"].astype(str)
+        serial_ids = serials.map(self._dimension_ids(conn, "serials", "serial_number", serials.unique()))
+        parameter_ids = parameters.map(
+            self._dimension_ids(conn, "parameters", "parameter_type", parameters.unique())
+        )
+        self._update_parameter_details(conn, df)
+
+        return [
+            epochs.astype("int64"),
+            serial_ids,
+            parameter_ids,
+            df["avg_value"],
+            df["min_value"],
+            df["max_value"],
+            column_or_none("count"),
+            column_or_none("data_quality"),
+            column_or_none("line_number"),
+        ]
+
+    def _iter_wide_rows(self, conn: sqlite3.Connection, df: pd.DataFrame, batch_size: int = 1000):
+        """Yield (partition table, INSERT rows) for a wide frame, batch by batch
+
+        Rows of archived months are skipped (see _wide_columns for the rest).
+        """
+        columns = self._wide_columns(conn, df)
+        if not columns:
+            return
+
+        # NaN/NaT -> None so sqlite3 stores NULL
+        columns = [series.astype(object).where(series.notna(), None) for series in columns]
+
+        for table, positions in self._iter_partition_positions(conn, columns[0]):
+            for start_idx in range(0, len(positions), batch_size):
+                batch_positions = positions[start_idx:start_idx + batch_size]
+                yield table, list(zip(*(series.iloc[batch_positions].tolist() for series in columns)))
+
+    def _iter_partition_positions(self, conn: sqlite3.Connection, epochs: pd.Series):
+        """Yield (partition table, row positions) per month, skipping archived months"""
+        month_positions = pd.Series(range(len(epochs))).groupby(self._month_index(epochs).values).indices
+        for month_index, positions in sorted(month_positions.items()):
+            table = self._ensure_partition(conn, month_index)
+            if table is not None:
+                yield table, positions
+
+    def insert_wide_batch(self, df: pd.DataFrame, batch_size: int = 1000) -> int:
+        """Insert a wide parser frame (avg/min/max per row) as one row per reading
+
+        Readings already stored are skipped and count as inserted, so
+        re-importing a log is a no-op that still reports success.
+
+        Returns:
+            Number of statistic records inserted (three per reading)
+        """
         if df.empty:
             return 0
 
         total_inserted = 0
+        duplicates = 0
         start_time = time.time()
 
         try:
             with self.get_connection() as conn:
-                # Begin transaction for all inserts
                 conn.execute("BEGIN TRANSACTION")
 
-                # Prepare DataFrame for insertion
-                df_clean = df.copy()
-                if (
-                    "datetime" in df_clean.columns
-                    and pd.api.types.is_datetime64_any_dtype(df_clean["datetime"])
-                ):
-                    df_clean["datetime"] = df_clean["datetime"].dt.strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    )
-
-                # Ensure all required columns exist
-                columns_to_insert = [
-                    "datetime",
-                    "serial_number",
-                    "parameter_type",
-                    "statistic_type",
-                    "value",
-                    "count",
-                    "unit",
-                    "description",
-                    "data_quality",
-                    "raw_parameter",
-                    "line_number",
-                ]
-
-                for col in columns_to_insert:
-                    if col not in df_clean.columns:
-                        df_clean[col] = None
-
-                # Prepare the insert statement once
-                insert_sql = """
-                    INSERT INTO water_logs
-                    (datetime, serial_number, parameter_type, statistic_type,
-                     value, count, unit, description, data_quality,
-                     raw_parameter, line_number)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-
-                # Process in batches for memory efficiency
-                for start_idx in range(0, len(df_clean), batch_size):
-                    end_idx = min(start_idx + batch_size, len(df_clean))
-                    batch_df = df_clean.iloc[start_idx:end_idx]
-                    data_to_insert = batch_df[columns_to_insert].values.tolist()
-
-                    # Execute batch insert
-                    conn.executemany(insert_sql, data_to_insert)
-                    total_inserted += len(batch_df)
+                rows_since_commit = 0
+                for table, rows in self._iter_wide_rows(conn, df, batch_size):
+                    duplicates += len(rows) - self._execute_wide_rows(conn, table, rows)
+                    total_inserted += len(rows) * 3
+                    rows_since_commit += len(rows)
 
                     # Intermediate commit for very large datasets to avoid transaction overhead
-                    if total_inserted % 10000 == 0:
+                    if rows_since_commit >= 10000:
                         conn.execute("COMMIT")
                         conn.execute("BEGIN TRANSACTION")
+                        rows_since_commit = 0
 
-                # Final commit
                 conn.execute("COMMIT")
 
-                # Log performance metrics
                 elapsed = time.time() - start_time
                 print(
-                    f"Batch insert completed: {total_inserted:,} records in {elapsed:.2f}s ({total_inserted/elapsed:.1f} records/sec)"
+                    f"Wide batch insert completed: {total_inserted:,} records in {elapsed:.2f}s ({total_inserted/max(elapsed, 1e-6):.1f} records/sec)"
                 )
+                if duplicates:
+                    print(f"🔄 Skipped {duplicates:,} readings already in the database")
 
         except Exception as e:
-            print(f"Error inserting data: {e}")
+            print(f"Error inserting wide data: {e}")
             traceback.print_exc()
+            # Dimension rows and partitions added in the failed transaction are gone
+            self._dimension_cache.clear()
+            self._partition_cache.clear()
             return 0
 
         return total_inserted
 
+    def _execute_wide_rows(self, conn: sqlite3.Connection, table: str, rows, row_count: Optional[int] = None):
+        """Insert one batch of readings into a partition, as a JSON array where supported
+
+        With row_count given, rows may be any iterable of tuples and go to
+        executemany as they are (bulk path). The hourly/daily rollups and the
+        stats catalog are updated from the inserted rows in the same
+        transaction.
+
+        Returns:
+            Number of readings inserted (rows already stored are skipped)
+        """
+        last_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+        payload = None
+        if row_count is None:
+            row_count = len(rows)
+            if self.JSON_BATCH_INSERT:
+                try:
+                    payload = json.dumps(rows, allow_nan=False)
+                except (TypeError, ValueError):
+                    payload = None  # NaN or non-JSON values - use plain parameters
+        if payload is not None:
+            inserted = conn.execute(self.READING_INSERT_JSON_SQL.format(table=table), (payload,)).rowcount
+        else:
+            inserted = conn.executemany(self.READING_INSERT_SQL.format(table=table), rows).rowcount
+        if inserted:
+            conn.execute(
+                "UPDATE reading_partitions SET row_count = row_count + ? WHERE table_name = ?",
+                (inserted, table),
+            )
+            self._update_rollups(conn, table, "id > ?", (last_id[0] if last_id else 0,))
+            self._update_reading_stats(conn, table, "id > ?", (last_id[0] if last_id else 0,))
+        return inserted
+
+    def open_writer_connection(self) -> sqlite3.Connection:
+        """Open a dedicated connection for a writer thread (caller closes it)"""
+        return self.connection_pool.connect()
+
+    def insert_bulk(self, df: pd.DataFrame, commit_rows: int = 100000, import_mode: bool = False) -> int:
+        """Bulk-load a frame, streaming rows straight from its NumPy column arrays
+
+        Each batch goes to executemany as an iterator of tuples of native
+        values (ndarray.tolist), without per-cell object conversion or JSON
+        encoding; NaN binds as NULL. Rollups are updated once per batch.
+        Rows already committed stay in the database if a later batch fails;
+        readings already stored are skipped and count as inserted.
+
+        Args:
+            df: Wide parser frame (long frames are pivoted first)
+            commit_rows: Readings per transaction
+            import_mode: Drop the secondary indices of the partitions being
+                loaded and rebuild them afterwards - faster for large loads
+                into new or small months, slower for small loads into big ones
+
+        Returns:
+            Number of statistic records inserted (committed), three per reading
+        """
+        if df.empty:
+            return 0
+        if "value" in df.columns:
+            df = self._long_to_wide(df)
+
+        commit_rows = max(1, int(commit_rows))
+        total_inserted = 0
+        committed = 0
+        duplicates = 0
+        dropped = []
+        start_time = time.time()
+
+        try:
+            with self.get_connection() as conn:
+                try:
+                    conn.execute("BEGIN TRANSACTION")
+                    columns = self._wide_columns(conn, df)
+                    # Extension dtypes (strings, nullable ints) -> object arrays with None
+                    arrays = [
+                        series.to_numpy() if isinstance(series.dtype, np.dtype)
+                        else series.to_numpy(dtype=object, na_value=None)
+                        for series in columns
+                    ]
+                    rows_since_commit = 0
+
+                    partitions = self._iter_partition_positions(conn, columns[0]) if columns else []
+                    for table, positions in partitions:
+                        if import_mode and table not in dropped:
+                            self._drop_partition_indices(conn, table)
+                            dropped.append(table)
+
+                        for start_idx in range(0, len(positions), commit_rows):
+                            batch_positions = positions[start_idx:start_idx + commit_rows]
+                            rows = zip(*(array[batch_positions].tolist() for array in arrays))
+                            duplicates += len(batch_positions) - self._execute_wide_rows(
+                                conn, table, rows, row_count=len(batch_positions))
+                            total_inserted += len(batch_positions) * 3
+                            rows_since_commit += len(batch_positions)
+
+                            if rows_since_commit >= commit_rows:
+                                conn.execute("COMMIT")
+                                committed = total_inserted
+                                conn.execute("BEGIN TRANSACTION")
+                                rows_since_commit = 0
+
+                    conn.execute("COMMIT")
+                    committed = total_inserted
+                finally:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    if dropped:
+                        index_start = time.time()
+                        for table in dropped:
+                            self._create_partition_indices(conn, table)
+                        print(f"✓ Rebuilt indices of {len(dropped)} partition(s) in {time.time() - index_start:.2f}s")
+
+            elapsed = time.time() - start_time
+            print(
+                f"Bulk insert completed: {committed:,} records in {elapsed:.2f}s ({committed/max(elapsed, 1e-6):.1f} records/sec)"
+            )
+            if duplicates:
+                print(f"🔄 Skipped {duplicates:,} readings already in the database")
+
+        except Exception as e:
+            print(f"Error in bulk insert: {e}")
+            traceback.print_exc()
+            self._dimension_cache.clear()
+            self._partition_cache.clear()
+
+        return committed
+
+    def insert_wide_stream(self, chunks, batch_size: int = 1000, commit_rows: int = 50000,
+                           progress_callback=None, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Insert an iterable of wide parser frames as they arrive
+
+        Each chunk is written batch by batch and then released, so memory
+        is bounded by what the producer keeps in flight (see ingest_pipeline).
+        Rows already committed stay in the database if a later chunk fails;
+        readings already stored are skipped and count as inserted.
+
+        Args:
+            chunks: Iterable of wide DataFrames, or (DataFrame, position) tuples
+            commit_rows: Rows per transaction
+            progress_callback: Called with (rows_inserted, position) after each chunk
+            conn: Connection to write with (e.g. from open_writer_connection);
+                defaults to this thread's pooled connection
+
+        Returns:
+            Number of statistic records inserted (committed), three per reading
+        """
+        if conn is None:
+            with self.get_connection() as pooled_conn:
+                return self.insert_wide_stream(chunks, batch_size, commit_rows,
+                                               progress_callback, conn=pooled_conn)
+
+        total_inserted = 0
+        committed = 0
+        duplicates = 0
+        start_time = time.time()
+
+        try:
+            conn.execute("BEGIN TRANSACTION")
+            rows_since_commit = 0
+
+            for chunk in chunks:
+                df, position = chunk if isinstance(chunk, tuple) else (chunk, None)
+                if df.empty:
+                    continue
+
+                for table, rows in self._iter_wide_rows(conn, df, batch_size):
+                    duplicates += len(rows) - self._execute_wide_rows(conn, table, rows)
+                    total_inserted += len(rows) * 3
+                    rows_since_commit += len(rows) * 3
+
+                if rows_since_commit >= commit_rows:
+                    conn.execute("COMMIT")
+                    committed = total_inserted
+                    conn.execute("BEGIN TRANSACTION")
+                    rows_since_commit = 0
+
+                if progress_callback:
+                    progress_callback(total_inserted, position)
+
+            conn.execute("COMMIT")
+            committed = total_inserted
+
+            elapsed = time.time() - start_time
+            print(
+                f"Streaming insert completed: {total_inserted:,} records in {elapsed:.2f}s ({total_inserted/max(elapsed, 1e-6):.1f} records/sec)"
+            )
+            if duplicates:
+                print(f"🔄 Skipped {duplicates:,} readings already in the database")
+
+        except Exception as e:
+            print(f"Error in streaming insert: {e}")
+            traceback.print_exc()
+            if conn.in_transaction:
+                conn.rollback()
+            self._dimension_cache.clear()
+            self._partition_cache.clear()
+
+        return committed
+
     def insert_file_metadata(
         self, filename: str, file_size: int, records_imported: int, parsing_stats: str
     ):
@@ -351,6 +1209,105 @@ class DatabaseManager:
             print(f"Error inserting file metadata: {e}")
             traceback.print_exc()
     
+    def get_ingest_state(self, file_path: str) -> Optional[Dict]:
+        """Get the last incremental ingest position for a log file, or None"""
+        try:
+            with self.get_read_connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT byte_offset, line_number, head_fingerprint, head_length
+                    FROM ingest_state WHERE file_path = ?
+                """,
+                    (file_path,),
+                ).fetchone()
+                if row is None:
+                    return None
+                return {
+                    "byte_offset": row[0],
+                    "line_number": row[1],
+                    "head_fingerprint": row[2],
+                    "head_length": row[3],
+                }
+        except Exception as e:
+            print(f"Error reading ingest state: {e}")
+            return None
+
+    def save_ingest_state(
+        self, file_path: str, byte_offset: int, line_number: int,
+        head_fingerprint: str, head_length: int
+    ):
+        """Record how far a log file has been ingested"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO ingest_state
+                    (file_path, byte_offset, line_number, head_fingerprint, head_length, updated_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    (file_path, byte_offset, line_number, head_fingerprint, head_length),
+                )
+        except Exception as e:
+            print(f"Error saving ingest state: {e}")
+            traceback.print_exc()
+
+    def get_registered_import_sizes(self, max_size: int) -> List[int]:
+        """Distinct sizes of registered imports up to max_size bytes"""
+        try:
+            with self.get_read_connection() as conn:
+                rows = conn.execute(
+                    "SELECT DISTINCT file_size FROM import_registry WHERE file_size <= ? ORDER BY file_size",
+                    (max_size,),
+                ).fetchall()
+                return [row[0] for row in rows]
+        except Exception as e:
+            print(f"Error reading import registry: {e}")
+            return []
+
+    def find_registered_import(self, content_hash: str) -> Optional[Dict]:
+        """Look up a registered import by SHA-256 content hash"""
+        try:
+            with self.get_read_connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT file_size, line_count, filename, records_imported, import_timestamp
+                    FROM import_registry WHERE content_hash = ?
+                """,
+                    (content_hash,),
+                ).fetchone()
+                if row is None:
+                    return None
+                return {
+                    "content_hash": content_hash,
+                    "file_size": row[0],
+                    "line_count": row[1],
+                    "filename": row[2],
+                    "records_imported": row[3],
+                    "import_timestamp": row[4],
+                }
+        except Exception as e:
+            print(f"Error reading import registry: {e}")
+            return None
+
+    def register_import(
+        self, content_hash: str, file_size: int, line_count: int,
+        filename: str, records_imported: int
+    ):
+        """Record a successfully imported file by content hash"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO import_registry
+                    (content_hash, file_size, line_count, filename, records_imported)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (content_hash, file_size, line_count, filename, records_imported),
+                )
+        except Exception as e:
+            print(f"Error registering import: {e}")
+            traceback.print_exc()
+
     def insert_validation_log(
         self, filename: str, validation_summary: Dict, validation_report: str = ""
     ):
@@ -398,7 +1355,7 @@ class DatabaseManager:
     def get_validation_history(self, limit: int = 50) -> pd.DataFrame:
         """Get validation history from import_validation_log table"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 query = """
                     SELECT
                         filename,
@@ -428,90 +1385,41 @@ class DatabaseManager:
         self, limit: Optional[int] = None, chunk_size: int = None
     ) -> pd.DataFrame:
         """
-        Get all logs with memory-optimized processing for large datasets
+        Get all logs as one row per reading with avg/min/max/diff columns
+
+        Reads the reading partitions directly, so no per-statistic merge is needed.
         """
         try:
-            with self.get_connection() as conn:
-                stats = ["avg", "min", "max"]
-                frames = []
+            with self.get_read_connection() as conn:
+                query = """
+                    SELECT
+                        r.ts AS datetime,
+                        s.serial_number AS serial,
+                        p.parameter_type AS param,
+                        r.avg_value AS avg,
+                        p.unit AS unit,
+                        r.min_value AS min,
+                        r.max_value AS max
+                    FROM {readings} r
+                    JOIN serials s ON s.id = r.serial_id
+                    JOIN parameters p ON p.id = r.parameter_id
+                    ORDER BY r.ts, s.serial_number, p.parameter_type, p.unit
+                """
 
-                # Process each statistic type separately for memory efficiency
-                for stat in stats:
-                    stat_query = f"""
-                        SELECT
-                            datetime,
-                            serial_number AS serial,
-                            parameter_type AS param,
-                            value AS {stat},
-                            unit
-                        FROM water_logs
-                        WHERE statistic_type = ?
-                    """
+                df = self._read_partitions(
+                    conn, query, limit=int(limit) if limit else None, chunk_size=chunk_size
+                )
 
-                    # Add limit if specified
-                    if limit:
-                        stat_query += f" LIMIT {limit}"
-
-                    # Use chunked reading for large datasets
-                    if chunk_size:
-                        chunks = []
-                        for chunk in pd.read_sql_query(
-                            stat_query,
-                            conn,
-                            params=[stat],
-                            parse_dates=["datetime"],
-                            chunksize=chunk_size,
-                        ):
-                            chunks.append(chunk)
-
-                        if chunks:
-                            df_stat = pd.concat(chunks)
-                        else:
-                            df_stat = pd.DataFrame()
-                    else:
-                        df_stat = pd.read_sql_query(
-                            stat_query, conn, params=[stat], parse_dates=["datetime"]
-                        )
-
-                    print(f"Retrieved {len(df_stat)} records for statistic type '{stat}'")
-                    frames.append(df_stat)
-
-                # Only return empty if ALL frames are empty (more lenient)
-                non_empty_frames = [df for df in frames if not df.empty]
-                if not non_empty_frames:
-                    print("⚠️ No data found for any statistic type")
+                if df.empty:
+                    print("⚠️ No data found in water_readings")
                     return pd.DataFrame()
-                
-                # Use only non-empty frames for merging
-                if len(non_empty_frames) == 1:
-                    df_merged = non_empty_frames[0].copy()
-                    # Add missing columns with NaN values
-                    for stat in stats:
-                        if stat not in df_merged.columns:
-                            df_merged[stat] = pd.NA
-                else:
-                    # Optimize merge for memory efficiency
-                    def merge_func(left, right):
-                        return pd.merge(
-                            left,
-                            right,
-                            on=["datetime", "serial", "param", "unit"],
-                            how="outer",
-                            # Use copy=False for memory efficiency (modifies in place)
-                            copy=False,
-                        )
-
-                    df_merged = reduce(merge_func, non_empty_frames)
-
-                # Calculate diff column safely
-                if 'max' in df_merged.columns and 'min' in df_merged.columns:
-                    df_merged["diff"] = df_merged["max"] - df_merged["min"]
-                else:
-                    df_merged["diff"] = 0
-                
-                print(f"Final merged dataset: {len(df_merged)} records with columns: {list(df_merged.columns)}")
 
-                return df_merged
+                df["datetime"] = pd.to_datetime(df["datetime"], unit="s")
+                df["diff"] = df["max"] - df["min"]
+
+                print(f"Retrieved {len(df):,} readings with columns: {list(df.columns)}")
+
+                return df
 
         except Exception as e:
             print(f"Error retrieving logs: {e}")
@@ -521,7 +1429,7 @@ class DatabaseManager:
     def diagnose_data_issues(self) -> Dict:
         """Diagnose potential data issues that could cause dashboard problems"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 diagnosis = {
                     "issues_found": [],
                     "recommendations": [],
@@ -529,7 +1437,7 @@ class DatabaseManager:
                 }
                 
                 # Check 1: Total records
-                total_records = conn.execute("SELECT COUNT(*) FROM water_logs").fetchone()[0]
+                total_records = self._count_statistic_records(conn)
                 if total_records == 0:
                     diagnosis["issues_found"].append("No data in database")
                     diagnosis["recommendations"].append("Import LINAC log files")
@@ -537,13 +1445,12 @@ class DatabaseManager:
                     return diagnosis
                 
                 # Check 2: Statistic type distribution
-                stat_types = conn.execute("""
-                    SELECT statistic_type, COUNT(*) as count 
-                    FROM water_logs 
-                    GROUP BY statistic_type
-                """).fetchall()
+                stat_counts = conn.execute("""
+                    SELECT COUNT(avg_value), COUNT(min_value), COUNT(max_value)
+                    FROM water_readings
+                """).fetchone()
                 
-                stat_dict = dict(stat_types)
+                stat_dict = {stat: count for stat, count in zip(['avg', 'min', 'max'], stat_counts) if count}
                 required_stats = ['avg', 'min', 'max']
                 missing_stats = [stat for stat in required_stats if stat not in stat_dict]
                 
@@ -553,7 +1460,7 @@ class DatabaseManager:
                     diagnosis["data_health"] = "poor"
                 
                 # Check 3: Parameter diversity
-                param_count = conn.execute("SELECT COUNT(DISTINCT parameter_type) FROM water_logs").fetchone()[0]
+                param_count = conn.execute("SELECT COUNT(DISTINCT parameter_id) FROM water_readings").fetchone()[0]
                 if param_count < 3:
                     diagnosis["issues_found"].append(f"Low parameter diversity: only {param_count} unique parameters")
                     diagnosis["recommendations"].append("Import more comprehensive log files")
@@ -563,8 +1470,8 @@ class DatabaseManager:
                 # Check 4: Data availability (any age within reasonable range)
                 # Check for data within last 2 months instead of just 7 days
                 recent_data = conn.execute("""
-                    SELECT COUNT(*) FROM water_logs 
-                    WHERE datetime >= datetime('now', '-2 months')
+                    SELECT COUNT(avg_value) + COUNT(min_value) + COUNT(max_value) FROM water_readings 
+                    WHERE ts >= CAST(strftime('%s', 'now', '-2 months') AS INTEGER)
                 """).fetchone()[0]
                 
                 if recent_data == 0:
@@ -575,14 +1482,14 @@ class DatabaseManager:
                 else:
                     # Add informational message about data age without blocking
                     oldest_data = conn.execute("""
-                        SELECT MIN(datetime) FROM water_logs 
-                        WHERE datetime >= datetime('now', '-2 months')
+                        SELECT datetime(MIN(ts), 'unixepoch') FROM water_readings 
+                        WHERE ts >= CAST(strftime('%s', 'now', '-2 months') AS INTEGER)
                     """).fetchone()[0]
                     if oldest_data:
                         diagnosis["recommendations"].append(f"Data available from {oldest_data} onwards")
                 
                 # Check 5: Serial number consistency
-                serial_count = conn.execute("SELECT COUNT(DISTINCT serial_number) FROM water_logs").fetchone()[0]
+                serial_count = conn.execute("SELECT COUNT(DISTINCT serial_id) FROM water_readings").fetchone()[0]
                 if serial_count == 0:
                     diagnosis["issues_found"].append("No valid serial numbers found")
                     diagnosis["recommendations"].append("Check log file format and parsing")
@@ -604,87 +1511,190 @@ class DatabaseManager:
                 "error": str(e)
             }
 
-    def get_logs_by_parameter(
+    @staticmethod
+    def _epoch_bound(value) -> Optional[int]:
+        """Epoch seconds for a datetime bound (string, datetime or Timestamp)"""
+        if value is None or value == "":
+            return None
+        timestamp = pd.Timestamp(value)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        return int((timestamp - pd.Timestamp(0)) // pd.Timedelta(seconds=1))
+
+    def get_statistic_rows(
         self,
-        parameter_type: str,
-        serial_number: Optional[str] = None,
+        serial_numbers=None,
+        parameter_types=None,
+        start=None,
+        end=None,
+        statistics: Optional[List[str]] = None,
+        include_details: bool = False,
         chunk_size: Optional[int] = None,
     ) -> pd.DataFrame:
-        """Get logs filtered by parameter type with chunked processing"""
-        try:
-            with self.get_connection() as conn:
-                query = """
-                    SELECT
-                        datetime,
-                        serial_number as serial,
-                        parameter_type as param,
-                        value as avg,
-                        unit,
-                        statistic_type,
-                        data_quality
-                    FROM water_logs
-                    WHERE parameter_type = ?
-                """
-                params = [parameter_type]
+        """Read readings in the long layout (one row per statistic), ordered by time
 
-                if serial_number:
-                    query += " AND serial_number = ?"
-                    params.append(serial_number)
+        Filters compare integer ids and epoch seconds and are served by the
+        covering indexes; only monthly partitions overlapping [start, end]
+        are read. datetime is materialised from the epoch column without
+        string parsing.
 
-                query += " ORDER BY datetime ASC"
+        Args:
+            serial_numbers: Serial number or list of serial numbers
+            parameter_types: Parameter type or list of parameter types
+            start: Inclusive lower datetime bound
+            end: Inclusive upper datetime bound
+            statistics: Subset of 'avg', 'min', 'max' (default all)
+            include_details: Also return count, description and data_quality
+            chunk_size: Read the result in chunks of this many rows
 
-                # Use chunked reading for large datasets
-                if chunk_size:
-                    chunks = []
-                    for chunk in pd.read_sql_query(
-                        query,
-                        conn,
-                        params=params,
-                        parse_dates=["datetime"],
-                        chunksize=chunk_size,
-                    ):
-                        chunks.append(chunk)
+        Returns:
+            DataFrame with datetime, serial_number, parameter_type,
+            statistic_type, value and unit columns
+        """
+        value_sql = "CASE st.id WHEN 1 THEN r.avg_value WHEN 2 THEN r.min_value ELSE r.max_value END"
+        columns = [
+            "r.ts AS datetime",
+            "s.serial_number AS serial_number",
+            "p.parameter_type AS parameter_type",
+            "st.name AS statistic_type",
+            f"{value_sql} AS value",
+            "p.unit AS unit",
+        ]
+        if include_details:
+            columns += ["r.count AS count", "p.description AS description", "r.data_quality AS data_quality"]
+
+        conditions = [f"{value_sql} IS NOT NULL"]
+        params = []
+
+        def add_in_filter(column, values):
+            if values is None:
+                return
+            values = [values] if isinstance(values, str) else list(values)
+            conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+
+        add_in_filter("s.serial_number", serial_numbers)
+        add_in_filter("p.parameter_type", parameter_types)
+        add_in_filter("st.name", statistics)
+
+        start_ts, end_ts = self._epoch_bound(start), self._epoch_bound(end)
+        if start_ts is not None:
+            conditions.append("r.ts >= ?")
+            params.append(start_ts)
+        if end_ts is not None:
+            conditions.append("r.ts <= ?")
+            params.append(end_ts)
+
+        query = f"""
+            SELECT {', '.join(columns)}
+            FROM {{readings}} r
+            JOIN serials s ON s.id = r.serial_id
+            JOIN parameters p ON p.id = r.parameter_id
+            CROSS JOIN statistic_types st
+            WHERE {' AND '.join(conditions)}
+            ORDER BY r.ts
+        """
 
-                    if chunks:
-                        return pd.concat(chunks)
-                    return pd.DataFrame()
-                else:
-                    return pd.read_sql_query(
-                        query, conn, params=params, parse_dates=["datetime"]
-                    )
+        try:
+            with self.get_read_connection() as conn:
+                # Only partitions overlapping [start, end] are read
+                df = self._read_partitions(
+                    conn, query, params, start_ts=start_ts, end_ts=end_ts, chunk_size=chunk_size
+                )
+
+            if not df.empty:
+                df["datetime"] = pd.to_datetime(df["datetime"], unit="s")
+            return df
 
         except Exception as e:
-            print(f"Error retrieving parameter logs: {e}")
+            print(f"Error reading statistic rows: {e}")
             traceback.print_exc()
             return pd.DataFrame()
 
+    def _read_partitions(self, conn, query: str, params: Optional[list] = None,
+                         start_ts: Optional[int] = None, end_ts: Optional[int] = None,
+                         limit: Optional[int] = None, newest_first: bool = False,
+                         chunk_size: Optional[int] = None) -> pd.DataFrame:
+        """Run a query on each hot partition overlapping [start_ts, end_ts]
+
+        The query reads from {readings}, which is replaced by each partition
+        table in turn. Partitions cover disjoint months, so per-partition
+        results ordered by ts concatenate in time order.
+        """
+        tables = self._reading_partitions(conn, start_ts, end_ts)
+        if newest_first:
+            tables.reverse()
+
+        frames = []
+        remaining = limit
+        for table in tables:
+            sql = query.format(readings=table)
+            run_params = list(params or [])
+            if remaining is not None:
+                sql += " LIMIT ?"
+                run_params.append(remaining)
+
+            if chunk_size:
+                chunks = list(pd.read_sql_query(sql, conn, params=run_params, chunksize=chunk_size))
+                frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            else:
+                frame = pd.read_sql_query(sql, conn, params=run_params)
+
+            if frame.empty:
+                continue
+            frames.append(frame)
+            if remaining is not None:
+                remaining -= len(frame)
+                if remaining <= 0:
+                    break
+
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def get_logs_by_parameter(
+        self,
+        parameter_type: str,
+        serial_number: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Get logs filtered by parameter type with chunked processing"""
+        df = self.get_statistic_rows(
+            serial_numbers=serial_number,
+            parameter_types=parameter_type,
+            include_details=True,
+            chunk_size=chunk_size,
+        )
+        if df.empty:
+            return df
+
+        return df.rename(
+            columns={"serial_number": "serial", "parameter_type": "param", "value": "avg"}
+        )[["datetime", "serial", "param", "avg", "unit", "statistic_type", "data_quality"]]
+
     def get_recent_logs(self, limit: int = 1000) -> pd.DataFrame:
         """Get recent logs for fast startup - optimized for performance"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 # Get only recent records with average values for quick loading
                 query = """
                     SELECT
-                        datetime,
-                        serial_number as serial,
-                        parameter_type as param,
-                        value as avg,
-                        unit
-                    FROM water_logs
-                    WHERE statistic_type = 'avg'
-                    ORDER BY datetime DESC
-                    LIMIT ?
+                        r.ts AS datetime,
+                        s.serial_number AS serial,
+                        p.parameter_type AS param,
+                        r.avg_value AS avg,
+                        p.unit AS unit
+                    FROM {readings} r
+                    JOIN serials s ON s.id = r.serial_id
+                    JOIN parameters p ON p.id = r.parameter_id
+                    WHERE r.avg_value IS NOT NULL
+                    ORDER BY r.ts DESC
                 """
                 
-                df = pd.read_sql_query(
-                    query, 
-                    conn, 
-                    params=[limit], 
-                    parse_dates=["datetime"]
-                )
+                # Newest partitions first, stopping once the limit is reached
+                df = self._read_partitions(conn, query, limit=limit, newest_first=True)
                 
                 # Reverse to get chronological order
                 if not df.empty:
+                    df["datetime"] = pd.to_datetime(df["datetime"], unit="s")
                     df = df.iloc[::-1].reset_index(drop=True)
                 
                 return df
@@ -694,35 +1704,211 @@ class DatabaseManager:
             traceback.print_exc()
             return pd.DataFrame()
 
-    def get_summary_statistics(self) -> Dict:
-        """Get summary statistics with optimized queries"""
+    # Relative windows of the trend tab time buttons
+    TIME_WINDOWS = {
+        "1day": pd.Timedelta(days=1),
+        "1week": pd.Timedelta(weeks=1),
+        "1month": pd.Timedelta(days=30),
+    }
+
+    def get_window_slice(
+        self,
+        window: str = "1day",
+        serial_numbers=None,
+        parameter_types=None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        Get the readings of a (serial, parameter, time window) slice
+
+        The window is an epoch range on the covering indexes, so only the
+        partitions and index ranges inside it are read.
+
+        Args:
+            window: Key of TIME_WINDOWS, ending at end (default now);
+                ignored when start is given
+            serial_numbers: Serial number or list of serial numbers (default all)
+            parameter_types: Parameter type or list of parameter types (default all)
+            start: Inclusive lower datetime bound
+            end: Inclusive upper datetime bound
+
+        Returns:
+            DataFrame in the get_all_logs layout
+        """
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+        if start is None:
+            start = end - self.TIME_WINDOWS.get(window, self.TIME_WINDOWS["1day"])
+        start_ts, end_ts = self._epoch_bound(start), self._epoch_bound(end)
+
+        conditions, params = ["r.ts >= ?", "r.ts <= ?"], [start_ts, end_ts]
+        for column, values in (("s.serial_number", serial_numbers), ("p.parameter_type", parameter_types)):
+            if values is None:
+                continue
+            values = [values] if isinstance(values, str) else list(values)
+            conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+
+        query = f"""
+            SELECT
+                r.ts AS datetime,
+                s.serial_number AS serial,
+                p.parameter_type AS param,
+                r.avg_value AS avg,
+                p.unit AS unit,
+                r.min_value AS min,
+                r.max_value AS max
+            FROM {{readings}} r
+            JOIN serials s ON s.id = r.serial_id
+            JOIN parameters p ON p.id = r.parameter_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY r.ts, s.serial_number, p.parameter_type, p.unit
+        """
+
         try:
-            with self.get_connection() as conn:
-                # Use a single transaction for better performance
-                conn.execute("BEGIN")
+            with self.get_read_connection() as conn:
+                df = self._read_partitions(conn, query, params, start_ts=start_ts, end_ts=end_ts)
 
-                # Get basic counts with optimized queries
-                total_records = conn.execute(
-                    "SELECT COUNT(*) FROM water_logs"
-                ).fetchone()[0]
+            if not df.empty:
+                df["datetime"] = pd.to_datetime(df["datetime"], unit="s")
+                df["diff"] = df["max"] - df["min"]
+            return df
 
-                unique_params = conn.execute(
-                    "SELECT COUNT(DISTINCT parameter_type) FROM water_logs"
-                ).fetchone()[0]
+        except Exception as e:
+            print(f"Error reading time window slice: {e}")
+            traceback.print_exc()
+            return pd.DataFrame()
 
-                unique_serials = conn.execute(
-                    "SELECT COUNT(DISTINCT serial_number) FROM water_logs"
-                ).fetchone()[0]
+    def get_trend_series(
+        self,
+        serial_number: Optional[str] = None,
+        parameter_type: Optional[str] = None,
+        start=None,
+        end=None,
+        min_points: int = 500,
+    ) -> pd.DataFrame:
+        """
+        Get a trend for a time window at the coarsest adequate resolution
+
+        Daily rollups are used when the window spans at least min_points days,
+        hourly rollups when it spans at least min_points hours, and the raw
+        readings otherwise. Rollup avg is the mean of the bucket's readings,
+        min/max the extremes.
+
+        Returns:
+            DataFrame with datetime, serial, param, avg, unit, min, max,
+            count (readings per point) and diff; attrs["resolution"] is "daily",
+            "hourly" or "raw"
+        """
+        try:
+            with self.get_read_connection() as conn:
+                conditions, params = [], []
+                if serial_number:
+                    conditions.append("s.serial_number = ?")
+                    params.append(serial_number)
+                if parameter_type:
+                    conditions.append("p.parameter_type = ?")
+                    params.append(parameter_type)
+
+                start_ts, end_ts = self._epoch_bound(start), self._epoch_bound(end)
+                if start_ts is None or end_ts is None:
+                    # Open ends of the window from the (small) hourly rollup
+                    first, last = conn.execute(
+                        f"""
+                        SELECT MIN(r.bucket_ts), MAX(r.bucket_ts) + 3599
+                        FROM readings_hourly r
+                        JOIN serials s ON s.id = r.serial_id
+                        JOIN parameters p ON p.id = r.parameter_id
+                        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                    """,
+                        params,
+                    ).fetchone()
+                    if first is None:
+                        return pd.DataFrame()
+                    start_ts = first if start_ts is None else start_ts
+                    end_ts = last if end_ts is None else end_ts
+
+                span = max(0, end_ts - start_ts)
+                resolution, width = "raw", None
+                for rollup, bucket_width in self.ROLLUP_TABLES.items():
+                    if span // bucket_width >= min_points:
+                        resolution, width = rollup.split("_")[1], bucket_width
+                        break
+
+                if width:
+                    query = f"""
+                        SELECT
+                            r.bucket_ts AS datetime,
+                            s.serial_number AS serial,
+                            p.parameter_type AS param,
+                            r.avg_sum / NULLIF(r.avg_count, 0) AS avg,
+                            p.unit AS unit,
+                            r.min_value AS min,
+                            r.max_value AS max,
+                            r.reading_count AS count
+                        FROM readings_{resolution} r
+                        JOIN serials s ON s.id = r.serial_id
+                        JOIN parameters p ON p.id = r.parameter_id
+                        WHERE {" AND ".join(conditions + ["r.bucket_ts >= ?", "r.bucket_ts <= ?"])}
+                        ORDER BY r.bucket_ts, s.serial_number, p.parameter_type
+                    """
+                    df = pd.read_sql_query(
+                        query, conn, params=params + [start_ts - start_ts % width, end_ts]
+                    )
+                else:
+                    query = f"""
+                        SELECT
+                            r.ts AS datetime,
+                            s.serial_number AS serial,
+                            p.parameter_type AS param,
+                            r.avg_value AS avg,
+                            p.unit AS unit,
+                            r.min_value AS min,
+                            r.max_value AS max,
+                            1 AS count
+                        FROM {{readings}} r
+                        JOIN serials s ON s.id = r.serial_id
+                        JOIN parameters p ON p.id = r.parameter_id
+                        WHERE {" AND ".join(conditions + ["r.ts >= ?", "r.ts <= ?"])}
+                        ORDER BY r.ts, s.serial_number, p.parameter_type
+                    """
+                    df = self._read_partitions(
+                        conn, query, params + [start_ts, end_ts], start_ts=start_ts, end_ts=end_ts
+                    )
+
+                if not df.empty:
+                    df["datetime"] = pd.to_datetime(df["datetime"], unit="s")
+                    df["diff"] = df["max"] - df["min"]
+                df.attrs["resolution"] = resolution
+                return df
+
+        except Exception as e:
+            print(f"Error retrieving trend series: {e}")
+            traceback.print_exc()
+            return pd.DataFrame()
+
+    def get_summary_statistics(self) -> Dict:
+        """Get summary statistics from the stats catalog (no reading scans)"""
+        try:
+            with self.get_read_connection() as conn:
+                # Both queries read the same snapshot
+                conn.execute("BEGIN")
 
-                date_range = conn.execute(
-                    "SELECT MIN(datetime), MAX(datetime) FROM water_logs"
+                total_records, unique_params, unique_serials, first, last = conn.execute(
+                    """
+                    SELECT IFNULL(SUM(statistic_count), 0),
+                           COUNT(DISTINCT parameter_id), COUNT(DISTINCT serial_id),
+                           datetime(MIN(min_ts), 'unixepoch'), datetime(MAX(max_ts), 'unixepoch')
+                    FROM reading_stats
+                    """
                 ).fetchone()
+                date_range = (first, last)
 
-                # Get quality distribution efficiently
+                # Statistic records per quality
                 quality_dist = pd.read_sql_query(
                     """
-                    SELECT data_quality, COUNT(*) as count
-                    FROM water_logs
+                    SELECT NULLIF(data_quality, '') AS data_quality, SUM(statistic_count) AS count
+                    FROM reading_stats
                     GROUP BY data_quality
                     """,
                     conn,
@@ -750,7 +1936,7 @@ class DatabaseManager:
     def get_file_history(self, chunk_size: Optional[int] = None) -> pd.DataFrame:
         """Get file import history with chunked reading"""
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 query = """
                     SELECT
                         filename,
@@ -790,15 +1976,33 @@ class DatabaseManager:
         try:
             with self.get_connection() as conn:
                 conn.execute("BEGIN TRANSACTION")
-                conn.execute("DELETE FROM water_logs")
+                # Hot partitions are dropped; archived ones stay restorable
+                partitions = self._reading_partitions(conn)
+                for table in partitions:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute("DELETE FROM reading_partitions WHERE archive_path IS NULL")
+                self._refresh_readings_view(conn)
+                # Rollups refer to the serial/parameter ids cleared below;
+                # restore_partition rebuilds those of an archived month
+                for rollup in self.ROLLUP_TABLES:
+                    conn.execute(f"DELETE FROM {rollup}")
+                conn.execute("DELETE FROM reading_stats")
+                conn.execute("DELETE FROM serials")
+                conn.execute("DELETE FROM parameters")
                 conn.execute("DELETE FROM file_metadata")
+                conn.execute("DELETE FROM ingest_state")
+                conn.execute("DELETE FROM import_registry")
                 conn.execute("COMMIT")
 
                 # Reset auto-increment counters
                 conn.execute("BEGIN TRANSACTION")
-                conn.execute("DELETE FROM sqlite_sequence WHERE name='water_logs'")
+                conn.executemany(
+                    "DELETE FROM sqlite_sequence WHERE name = ?", [(table,) for table in partitions]
+                )
                 conn.execute("DELETE FROM sqlite_sequence WHERE name='file_metadata'")
                 conn.execute("COMMIT")
+                self._dimension_cache.clear()
+                self._partition_cache.clear()
 
         except Exception as e:
             print(f"Error clearing database: {e}")
@@ -823,6 +2027,182 @@ class DatabaseManager:
             print(f"Error getting database size: {e}")
             return 0
 
+    def get_partition_catalog(self) -> pd.DataFrame:
+        """Monthly reading partitions with row counts and archive locations"""
+        try:
+            with self.get_read_connection() as conn:
+                return pd.read_sql_query(
+                    """
+                    SELECT month, table_name, row_count, archive_path, created_at
+                    FROM reading_partitions
+                    ORDER BY start_ts
+                    """,
+                    conn,
+                )
+        except Exception as e:
+            print(f"Error reading partition catalog: {e}")
+            return pd.DataFrame()
+
+    def archive_partition(self, month: str, archive_dir: Optional[str] = None) -> Optional[str]:
+        """Move one monthly partition out of the main database into its own file
+
+        The partition and copies of the dimension tables are written to
+        <archive_dir>/readings_YYYY_MM.db and the partition is dropped from
+        the main database. Other partitions are not rewritten (no VACUUM);
+        the freed pages are reused by later imports. The month's hourly and
+        daily rollups are kept (until clear_all), so long-range trends still
+        cover it.
+
+        Args:
+            month: Partition month as 'YYYY-MM'
+            archive_dir: Defaults to an 'archive' folder next to the database
+
+        Returns:
+            Path of the archive file, or None if nothing was archived
+        """
+        archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(self.db_path)), "archive")
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT table_name, archive_path FROM reading_partitions WHERE month = ?", (month,)
+                ).fetchone()
+                if not row:
+                    print(f"⚠️ No partition for {month}")
+                    return None
+                table, archive_path = row
+                if archive_path:
+                    print(f"✓ Partition {month} is already archived in {archive_path}")
+                    return archive_path
+
+                os.makedirs(archive_dir, exist_ok=True)
+                archive_path = os.path.join(archive_dir, f"{table}.db")
+                if os.path.exists(archive_path):
+                    print(f"❌ Archive file already exists: {archive_path}")
+                    return None
+
+                conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+                archived = False
+                try:
+                    conn.execute("BEGIN TRANSACTION")
+                    for dimension, columns_sql in self.DIMENSION_TABLES.items():
+                        conn.execute(f"CREATE TABLE archive.{dimension} {columns_sql}")
+                        conn.execute(f"INSERT INTO archive.{dimension} SELECT * FROM main.{dimension}")
+                    conn.execute(f"CREATE TABLE archive.{table} {self.READINGS_TABLE_SQL}")
+                    conn.execute(f"INSERT INTO archive.{table} SELECT * FROM main.{table}")
+                    conn.execute(f"DROP TABLE main.{table}")
+                    conn.execute("DELETE FROM main.sqlite_sequence WHERE name = ?", (table,))
+                    conn.execute("DELETE FROM main.reading_stats WHERE table_name = ?", (table,))
+                    conn.execute(
+                        "UPDATE reading_partitions SET archive_path = ? WHERE table_name = ?",
+                        (archive_path, table),
+                    )
+                    self._refresh_readings_view(conn)
+                    conn.execute("COMMIT")
+                    archived = True
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+                finally:
+                    conn.execute("DETACH DATABASE archive")
+                    if not archived and os.path.exists(archive_path):
+                        os.remove(archive_path)
+
+                self._partition_cache.clear()
+                print(f"✓ Archived partition {month} to {archive_path}")
+                return archive_path
+
+        except Exception as e:
+            print(f"Error archiving partition {month}: {e}")
+            traceback.print_exc()
+            return None
+
+    def restore_partition(self, month: str) -> bool:
+        """Bring an archived monthly partition back into the main database
+
+        Serial and parameter ids are remapped by name, so this also works
+        after the main database was cleared. The archive file is removed
+        once the partition is restored.
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT table_name, archive_path FROM reading_partitions WHERE month = ?", (month,)
+                ).fetchone()
+                if not row or not row[1]:
+                    print(f"⚠️ Partition {month} is not archived")
+                    return False
+                table, archive_path = row
+                if not os.path.exists(archive_path):
+                    print(f"❌ Archive file not found: {archive_path}")
+                    return False
+
+                columns = ", ".join(self.READINGS_COLUMNS)
+                source_columns = ", ".join(
+                    {"serial_id": "ms.id", "parameter_id": "mp.id"}.get(col, f"r.{col}")
+                    for col in self.READINGS_COLUMNS
+                )
+
+                conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+                try:
+                    conn.execute("BEGIN TRANSACTION")
+                    conn.execute(
+                        "INSERT OR IGNORE INTO main.serials (serial_number) SELECT serial_number FROM archive.serials"
+                    )
+                    conn.execute(
+                        """
+                        INSERT OR IGNORE INTO main.parameters (parameter_type, unit, description)
+                        SELECT parameter_type, unit, description FROM archive.parameters
+                    """
+                    )
+                    conn.execute(f"CREATE TABLE main.{table} {self.READINGS_TABLE_SQL}")
+                    # Archives written before the natural key may hold duplicates
+                    self._create_natural_key(conn, table)
+                    cursor = conn.execute(
+                        f"""
+                        INSERT OR IGNORE INTO main.{table} ({columns})
+                        SELECT {source_columns}
+                        FROM archive.{table} r
+                        JOIN archive.serials a_s ON a_s.id = r.serial_id
+                        JOIN main.serials ms ON ms.serial_number = a_s.serial_number
+                        JOIN archive.parameters a_p ON a_p.id = r.parameter_id
+                        JOIN main.parameters mp ON mp.parameter_type = a_p.parameter_type
+                        ORDER BY r.id
+                    """
+                    )
+                    self._create_partition_indices(conn, table)
+                    conn.execute(
+                        """
+                        UPDATE reading_partitions SET archive_path = NULL, row_count = ?
+                        WHERE table_name = ?
+                    """,
+                        (cursor.rowcount, table),
+                    )
+                    self._refresh_readings_view(conn)
+                    start_ts, end_ts = conn.execute(
+                        "SELECT start_ts, end_ts FROM reading_partitions WHERE table_name = ?", (table,)
+                    ).fetchone()
+                    self._rebuild_rollups(conn, start_ts, end_ts)
+                    self._rebuild_reading_stats(conn, [table])
+                    conn.execute("COMMIT")
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+                finally:
+                    conn.execute("DETACH DATABASE archive")
+
+                os.remove(archive_path)
+                self._partition_cache.clear()
+                self._dimension_cache.clear()
+                print(f"✓ Restored partition {month} ({cursor.rowcount:,} readings)")
+                return True
+
+        except Exception as e:
+            print(f"Error restoring partition {month}: {e}")
+            traceback.print_exc()
+            return False
+
     def optimize_for_reading(self):
         """Apply optimizations for read performance"""
         try:
@@ -835,7 +2215,8 @@ class DatabaseManager:
                 conn.execute("PRAGMA mmap_size=30000000")
 
                 # Analyze tables for query planner
-                conn.execute("ANALYZE water_logs")
+                for table in self._reading_partitions(conn):
+                    conn.execute(f"ANALYZE {table}")
                 conn.execute("ANALYZE file_metadata")
 
                 print("Database optimized for reading")
@@ -846,17 +2227,66 @@ class DatabaseManager:
     def get_record_count(self) -> int:
         """Get total record count from database"""
         try:
-            with self.get_connection() as conn:
-                result = conn.execute("SELECT COUNT(*) FROM water_logs").fetchone()
-                return result[0] if result else 0
+            with self.get_read_connection() as conn:
+                return self._count_statistic_records(conn)
         except Exception as e:
             print(f"Error getting record count: {e}")
             return 0
 
+    def _count_statistic_records(self, conn: sqlite3.Connection) -> int:
+        """Rows of the water_logs view, taken from the stats catalog"""
+        result = conn.execute("SELECT IFNULL(SUM(statistic_count), 0) FROM reading_stats").fetchone()
+        return result[0] if result else 0
+
+    def check_stats_catalog(self, repair: bool = True) -> bool:
+        """Compare the stats catalog with the hot partitions, rebuilding it if they differ
+
+        Args:
+            repair: Rebuild the whole catalog from the partitions on a mismatch
+
+        Returns:
+            True if the catalog matched the stored readings
+        """
+        columns = "table_name, serial_id, parameter_id, data_quality, reading_count, statistic_count, min_ts, max_ts"
+        try:
+            with self.get_connection() as conn:
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    stored = set(conn.execute(f"SELECT {columns} FROM reading_stats").fetchall())
+                    conn.execute("SAVEPOINT stats_check")
+                    self._rebuild_reading_stats(conn)
+                    expected = set(conn.execute(f"SELECT {columns} FROM reading_stats").fetchall())
+                    consistent = stored == expected
+                    if consistent or not repair:
+                        conn.execute("ROLLBACK TO stats_check")
+                    conn.execute("RELEASE stats_check")
+                    conn.execute("COMMIT")
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+
+            if consistent:
+                print("✓ Stats catalog is consistent")
+            elif repair:
+                print(f"🔄 Stats catalog rebuilt ({len(stored ^ expected)} rows differed)")
+            else:
+                print(f"⚠️ Stats catalog differs from the readings in {len(stored ^ expected)} rows")
+            return consistent
+
+        except Exception as e:
+            print(f"Error checking stats catalog: {e}")
+            traceback.print_exc()
+            return False
+
     def create_backup(self) -> bool:
         """Create a backup of the current database"""
         try:
-            return self.backup_manager.create_backup(self.db_path)
+            # Hold the writer so nothing is written mid-copy, and fold the WAL
+            # into the database file that is copied
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(FULL)")
+                return self.backup_manager.create_backup(self.db_path)
         except Exception as e:
             print(f"Error creating database backup: {e}")
             return False
@@ -872,8 +2302,15 @@ class DatabaseManager:
     def restore_from_backup(self, backup_filename: str) -> bool:
         """Restore database from specified backup"""
         try:
+            # The database file is replaced, so no write may be pending and no
+            # pooled connection may stay open
+            self.flush_writes()
+            self.connection_pool.close_all()
             success = self.backup_manager.restore_backup(backup_filename)
+            self.connection_pool.reopen()
             if success:
+                self._dimension_cache.clear()
+                self._partition_cache.clear()
                 # Reinitialize after restore
                 self.init_db()
             return success
@@ -888,12 +2325,10 @@ class DatabaseManager:
             if hasattr(self, 'backup_manager') and os.path.exists(self.db_path):
                 self.backup_manager.create_backup(self.db_path)
                 
-            # Close all pooled connections
-            for thread_id, conn in self.connection_pool.items():
-                try:
-                    conn.close()
-                except:
-                    pass
+            # Finish queued writes, then close all pooled connections
+            if self.write_queue is not None:
+                self.write_queue.shutdown()
+            self.connection_pool.close_all()
         except:
             pass
     
@@ -908,69 +2343,52 @@ class DatabaseManager:
             Dictionary with performance metrics
         """
         try:
-            with self.get_connection() as conn:
-                # Base query
-                base_query = """
-                    SELECT parameter_type, statistic_type, value, datetime, unit
-                    FROM water_logs 
-                    WHERE serial_number = ?
-                """
-                params = [machine_id]
-                
-                # Add date range filter if provided
-                if date_range and len(date_range) == 2:
-                    base_query += " AND datetime BETWEEN ? AND ?"
-                    params.extend(date_range)
-                
-                base_query += " ORDER BY datetime"
-                
-                data = pd.read_sql_query(
-                    base_query, conn, params=params, parse_dates=['datetime']
-                )
-                
-                if data.empty:
-                    return {'machine_id': machine_id, 'metrics': {}, 'error': 'No data found'}
+            start, end = date_range if date_range and len(date_range) == 2 else (None, None)
+            data = self.get_statistic_rows(serial_numbers=machine_id, start=start, end=end)
+            
+            if data.empty:
+                return {'machine_id': machine_id, 'metrics': {}, 'error': 'No data found'}
+            
+            metrics = {
+                'machine_id': machine_id,
+                'date_range': {
+                    'start': data['datetime'].min(),
+                    'end': data['datetime'].max(),
+                    'span_days': (data['datetime'].max() - data['datetime'].min()).days
+                },
+                'data_volume': {
+                    'total_records': len(data),
+                    'unique_parameters': data['parameter_type'].nunique(),
+                    'parameters': list(data['parameter_type'].unique())
+                },
+                'parameter_metrics': {}
+            }
+            
+            # Calculate metrics per parameter
+            for parameter in data['parameter_type'].unique():
+                param_data = data[data['parameter_type'] == parameter]
                 
-                metrics = {
-                    'machine_id': machine_id,
-                    'date_range': {
-                        'start': data['datetime'].min(),
-                        'end': data['datetime'].max(),
-                        'span_days': (data['datetime'].max() - data['datetime'].min()).days
-                    },
-                    'data_volume': {
-                        'total_records': len(data),
-                        'unique_parameters': data['parameter_type'].nunique(),
-                        'parameters': list(data['parameter_type'].unique())
-                    },
-                    'parameter_metrics': {}
+                # Get statistics for this parameter
+                param_metrics = {
+                    'record_count': len(param_data),
+                    'statistics': {}
                 }
                 
-                # Calculate metrics per parameter
-                for parameter in data['parameter_type'].unique():
-                    param_data = data[data['parameter_type'] == parameter]
-                    
-                    # Get statistics for this parameter
-                    param_metrics = {
-                        'record_count': len(param_data),
-                        'statistics': {}
-                    }
-                    
-                    for stat_type in ['avg', 'min', 'max']:
-                        stat_data = param_data[param_data['statistic_type'] == stat_type]['value'].dropna()
-                        if not stat_data.empty:
-                            param_metrics['statistics'][stat_type] = {
-                                'mean': stat_data.mean(),
-                                'std': stat_data.std(),
-                                'min': stat_data.min(),
-                                'max': stat_data.max(),
-                                'count': len(stat_data)
-                            }
-                    
-                    metrics['parameter_metrics'][parameter] = param_metrics
-                
-                return metrics
+                for stat_type in ['avg', 'min', 'max']:
+                    stat_data = param_data[param_data['statistic_type'] == stat_type]['value'].dropna()
+                    if not stat_data.empty:
+                        param_metrics['statistics'][stat_type] = {
+                            'mean': stat_data.mean(),
+                            'std': stat_data.std(),
+                            'min': stat_data.min(),
+                            'max': stat_data.max(),
+                            'count': len(stat_data)
+                        }
                 
+                metrics['parameter_metrics'][parameter] = param_metrics
+            
+            return metrics
+            
         except Exception as e:
             print(f"Error getting machine performance metrics: {e}")
             return {'machine_id': machine_id, 'metrics': {}, 'error': str(e)}
@@ -989,42 +2407,17 @@ class DatabaseManager:
             if not machine_ids or not parameters:
                 return pd.DataFrame()
                 
-            comparison_data = []
-            
-            with self.get_connection() as conn:
-                for machine_id in machine_ids:
-                    for parameter in parameters:
-                        # Get statistics for this machine-parameter combination
-                        query = """
-                            SELECT 
-                                serial_number,
-                                parameter_type,
-                                statistic_type,
-                                AVG(value) as avg_value,
-                                STDEV(value) as std_value,
-                                MIN(value) as min_value,
-                                MAX(value) as max_value,
-                                COUNT(value) as record_count,
-                                MIN(datetime) as start_date,
-                                MAX(datetime) as end_date
-                            FROM water_logs
-                            WHERE serial_number = ? AND parameter_type = ?
-                            GROUP BY serial_number, parameter_type, statistic_type
-                        """
-                        
-                        stats_data = pd.read_sql_query(
-                            query, conn, params=[machine_id, parameter],
-                            parse_dates=['start_date', 'end_date']
-                        )
-                        
-                        if not stats_data.empty:
-                            comparison_data.append(stats_data)
-            
-            if comparison_data:
-                result_df = pd.concat(comparison_data, ignore_index=True)
-                return result_df
-            else:
+            data = self.get_statistic_rows(serial_numbers=machine_ids, parameter_types=parameters)
+            if data.empty:
                 return pd.DataFrame()
+            
+            grouped = data.groupby(['serial_number', 'parameter_type', 'statistic_type'])
+            result_df = grouped['value'].agg(
+                avg_value='mean', std_value='std', min_value='min', max_value='max', record_count='count'
+            )
+            result_df['start_date'] = grouped['datetime'].min()
+            result_df['end_date'] = grouped['datetime'].max()
+            return result_df.reset_index()
                 
         except Exception as e:
             print(f"Error getting machine comparison stats: {e}")
@@ -1040,33 +2433,22 @@ class DatabaseManager:
             Dictionary with alert information
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 # Get data availability (any recent data within 2 months)
                 # Changed from 24-hour restriction to 2-month window
                 recent_data_query = """
-                    SELECT COUNT(*) as recent_records
-                    FROM water_logs 
-                    WHERE serial_number = ? 
-                    AND datetime >= datetime('now', '-2 months')
+                    SELECT COUNT(r.avg_value) + COUNT(r.min_value) + COUNT(r.max_value) as recent_records
+                    FROM water_readings r
+                    WHERE r.serial_id = ?
+                    AND r.ts >= CAST(strftime('%s', 'now', '-2 months') AS INTEGER)
                 """
-                recent_count = conn.execute(recent_data_query, (machine_id,)).fetchone()[0]
+                recent_count = conn.execute(
+                    recent_data_query, (self._serial_id(conn, machine_id),)
+                ).fetchone()[0]
                 
-                # Get total parameters
-                param_query = """
-                    SELECT COUNT(DISTINCT parameter_type) as param_count
-                    FROM water_logs 
-                    WHERE serial_number = ?
-                """
-                param_count = conn.execute(param_query, (machine_id,)).fetchone()[0]
-                
-                # Get latest data timestamp
-                latest_query = """
-                    SELECT MAX(datetime) as latest_datetime
-                    FROM water_logs 
-                    WHERE serial_number = ?
-                """
-                latest_result = conn.execute(latest_query, (machine_id,)).fetchone()
-                latest_datetime = latest_result[0] if latest_result[0] else None
+                summary = self.get_serial_summary(machine_id)
+                param_count = summary['parameter_count']
+                latest_datetime = summary['end_date']
                 
                 # Determine alert level based on data availability and freshness
                 alert_level = 'normal'
@@ -1133,6 +2515,40 @@ class DatabaseManager:
                 'status_color': '#808080'
             }
 
+    def _serial_id(self, conn, serial_number: str) -> Optional[int]:
+        """serials.id of a serial number (a bound id lets SQLite push the
+        filter into every partition of the water_readings view)"""
+        row = conn.execute("SELECT id FROM serials WHERE serial_number = ?", (serial_number,)).fetchone()
+        return row[0] if row else None
+
+    def get_serial_summary(self, serial_number: str) -> Dict[str, Any]:
+        """Record count, parameter count and date range for one serial number
+        
+        Returns:
+            Dictionary with record_count (statistic records), parameter_count,
+            and start_date/end_date as 'YYYY-MM-DD HH:MM:SS' strings (None if no data)
+        """
+        summary = {'record_count': 0, 'parameter_count': 0, 'start_date': None, 'end_date': None}
+        try:
+            with self.get_read_connection() as conn:
+                serial_id = self._serial_id(conn, serial_number)
+                if serial_id is None:
+                    return summary
+                row = conn.execute("""
+                    SELECT
+                        COUNT(r.avg_value) + COUNT(r.min_value) + COUNT(r.max_value),
+                        COUNT(DISTINCT r.parameter_id),
+                        datetime(MIN(r.ts), 'unixepoch'),
+                        datetime(MAX(r.ts), 'unixepoch')
+                    FROM water_readings r
+                    WHERE r.serial_id = ?
+                """, (serial_id,)).fetchone()
+                if row:
+                    summary.update(zip(['record_count', 'parameter_count', 'start_date', 'end_date'], row))
+        except Exception as e:
+            print(f"Error getting serial summary for {serial_number}: {e}")
+        return summary
+
     def get_unique_serial_numbers(self) -> List[str]:
         """Get list of unique serial numbers from the database
         
@@ -1140,14 +2556,14 @@ class DatabaseManager:
             List of unique serial numbers, excluding 'Unknown' and empty values
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 cursor = conn.execute("""
-                    SELECT DISTINCT serial_number 
-                    FROM water_logs 
-                    WHERE serial_number IS NOT NULL 
-                    AND serial_number != ''
-                    AND serial_number != 'Unknown'
-                    ORDER BY serial_number
+                    SELECT s.serial_number 
+                    FROM serials s 
+                    WHERE s.serial_number != ''
+                    AND s.serial_number != 'Unknown'
+                    AND s.id IN (SELECT serial_id FROM water_readings)
+                    ORDER BY s.serial_number
                 """)
                 return [row[0] for row in cursor.fetchall()]
         except Exception as e:
@@ -621,19 +621,20 @@ class DatabaseResilienceManager:
                     health_status['metrics']['integrity'] = 'ok'
                 
                 # Check table existence
-                cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+                # water_logs is a view over water_readings
+                cursor = conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
                 tables = [row[0] for row in cursor.fetchall()]
                 
-                required_tables = ['water_logs', 'file_metadata', 'import_validation_log']
+                required_tables = ['water_readings', 'water_logs', 'file_metadata', 'import_validation_log']
                 missing_tables = [table for table in required_tables if table not in tables]
                 
                 if missing_tables:
                     health_status['issues_found'].append(f"Missing tables: {missing_tables}")
                     health_status['recommendations'].append("Reinitialize database schema")
                 
-                # Check database size and performance metrics
-                cursor = conn.execute("SELECT COUNT(*) FROM water_logs")
-                record_count = cursor.fetchone()[0]
+                # Check database size and performance metrics (record count from
+                # the stats catalog; counting the water_logs view scans every partition)
+                record_count = self.db_manager.get_record_count()
                 health_status['metrics']['record_count'] = record_count
                 
                 # Check for index effectiveness
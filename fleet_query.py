@@ -0,0 +1,449 @@
+"""
+Fleet Query Executor for HALbasic
+Parallel fan-out of read queries across the per-machine SQLite databases.
+
+Every machine has its own halog_machine_<id>.db (see
+single_machine_database.py). Fleet views run the same parameterized query
+against each of them; here the queries run in a thread pool, each on its
+own read-only connection, so a fleet view takes about as long as its
+slowest machine instead of the sum of all of them. SQLite releases the GIL
+while it executes, so the threads overlap.
+
+Results are concatenated into one DataFrame with a machine_id column.
+Machines whose query fails are skipped and reported in the result's
+attrs['errors'].
+
+FederatedFleetView instead ATTACHes the machine databases to one
+connection, in groups below SQLite's attach limit, behind a UNION ALL
+fleet_logs view. Fleet aggregations (counts, means, standard deviations,
+percentiles) run inside SQLite and only their small results reach Python.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class FleetQueryExecutor:
+    """Runs one query or function against many machine databases in parallel"""
+
+    READ_PRAGMAS = [
+        "PRAGMA busy_timeout=30000",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+    def __init__(self, max_workers: int = 8, timeout: float = 30.0):
+        """
+        Args:
+            max_workers: Machine databases queried at the same time
+            timeout: Seconds a connection waits on a locked database
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.last_timings = {}  # machine_id -> seconds of the last fan-out
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="fleet-query")
+            return self._executor
+
+    def connect(self, db_path: str) -> sqlite3.Connection:
+        """Read-only connection to one machine database (caller closes it)"""
+        conn = sqlite3.connect(f"{Path(db_path).absolute().as_uri()}?mode=ro", uri=True, timeout=self.timeout,
+                               check_same_thread=False)
+        for pragma in self.READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def map(self, databases: Dict[str, str], fn: Callable) -> Dict[str, object]:
+        """Call fn(conn, machine_id) for every machine database in parallel
+
+        Args:
+            databases: machine_id -> database path
+            fn: Function of a read-only connection and the machine id
+
+        Returns:
+            machine_id -> fn's result, or the exception it raised
+        """
+        timings = {}
+
+        def run(machine_id, db_path):
+            start = time.time()
+            try:
+                conn = self.connect(db_path)
+                try:
+                    return fn(conn, machine_id)
+                finally:
+                    conn.close()
+            except Exception as e:
+                return e
+            finally:
+                timings[machine_id] = time.time() - start
+
+        if not databases:
+            return {}
+
+        start = time.time()
+        futures = {
+            machine_id: self._get_executor().submit(run, machine_id, db_path)
+            for machine_id, db_path in databases.items()
+        }
+        results = {machine_id: future.result() for machine_id, future in futures.items()}
+
+        elapsed = time.time() - start
+        self.last_timings = timings
+        slowest = max(timings, key=timings.get)
+        print(
+            f"✓ Fleet query on {len(databases)} machines in {elapsed:.2f}s "
+            f"(slowest {slowest}: {timings[slowest]:.2f}s)"
+        )
+        return results
+
+    def query(self, databases: Dict[str, str], sql: str,
+              params: Union[Sequence, Dict[str, Sequence]] = (),
+              parse_dates: Optional[List[str]] = None,
+              dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Run sql on every machine database and concatenate the results
+
+        Args:
+            databases: machine_id -> database path
+            sql: Query with ? placeholders
+            params: Parameters for every machine, or a dict of per-machine
+                parameters keyed by machine_id
+            parse_dates: Columns to convert to datetime64 on each machine
+            dtypes: Column dtypes applied to the combined frame
+
+        Returns:
+            DataFrame with a leading machine_id column, in the order of
+            databases; attrs['errors'] maps failed machines to their error
+        """
+        def run(conn, machine_id):
+            machine_params = params.get(machine_id, ()) if isinstance(params, dict) else params
+            return pd.read_sql_query(sql, conn, params=list(machine_params), parse_dates=parse_dates)
+
+        results = self.map(databases, run)
+
+        frames = []
+        errors = {}
+        for machine_id, result in results.items():
+            if isinstance(result, Exception):
+                print(f"⚠️ Fleet query failed for machine {machine_id}: {result}")
+                errors[machine_id] = str(result)
+                continue
+            result.insert(0, "machine_id", machine_id)
+            frames.append(result)
+
+        # Empty frames carry object columns; leave them out so dtypes survive
+        non_empty = [frame for frame in frames if not frame.empty]
+        if non_empty:
+            combined = pd.concat(non_empty, ignore_index=True)
+        elif frames:
+            combined = frames[0]
+        else:
+            combined = pd.DataFrame(columns=["machine_id"])
+
+        if dtypes:
+            combined = combined.astype({col: dtype for col, dtype in dtypes.items() if col in combined.columns})
+        combined.attrs["errors"] = errors
+        return combined
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class FederatedFleetView:
+    """UNION ALL view over the water_logs tables of ATTACHed machine databases
+
+    A connection attaches at most SQLITE_LIMIT_ATTACHED databases (10 by
+    default), so the machines are attached group by group to one private
+    temporary database. Aggregations are pushed into a subquery per machine;
+    the partial results of each group are merged in SQL and the groups'
+    results in Python (counts, means and variances merge exactly).
+    Percentiles need every value: the values are staged in the temporary
+    database and indexed, and each percentile is read from the two values
+    around its rank.
+    """
+
+    VIEW_NAME = "fleet_logs"
+    TABLE_NAME = "water_logs"
+    COLUMNS = ["datetime", "serial_number", "parameter_type", "statistic_type",
+               "value", "count", "unit", "data_quality"]
+
+    def __init__(self, databases: Dict[str, str], group_size: Optional[int] = None,
+                 timeout: float = 30.0):
+        """
+        Args:
+            databases: machine_id -> database path
+            group_size: Machines attached at a time (default the attach limit)
+            timeout: Seconds to wait on a locked machine database
+        """
+        self.databases = dict(databases)
+        self.timeout = timeout
+        if group_size is None:
+            with closing(sqlite3.connect(":memory:")) as probe:
+                group_size = probe.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        self.group_size = max(1, group_size)
+
+    def groups(self) -> List[Dict[str, str]]:
+        """The machines split into attach groups"""
+        items = list(self.databases.items())
+        return [dict(items[i:i + self.group_size]) for i in range(0, len(items), self.group_size)]
+
+    @contextmanager
+    def connect(self):
+        """Connection on a private temporary database (removed when closed)"""
+        conn = sqlite3.connect("", timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _literal(value: str) -> str:
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def _attach_group(self, conn: sqlite3.Connection, group: Dict[str, str]) -> Dict[str, str]:
+        """ATTACH a group read-only and (re)create the fleet_logs view
+
+        Returns:
+            machine_id -> schema name of its attached database
+        """
+        schemas = {}
+        for index, (machine_id, db_path) in enumerate(group.items()):
+            schema = f"fleet_{index}"
+            conn.execute(f"ATTACH DATABASE ? AS {schema}",
+                         (f"{Path(db_path).absolute().as_uri()}?mode=ro",))
+            schemas[machine_id] = schema
+
+        columns = ", ".join(self.COLUMNS)
+        conn.execute(f"DROP VIEW IF EXISTS temp.{self.VIEW_NAME}")
+        conn.execute(
+            f"CREATE TEMP VIEW {self.VIEW_NAME} AS "
+            + " UNION ALL ".join(
+                f"SELECT {self._literal(machine_id)} AS machine_id, {columns} FROM {schema}.{self.TABLE_NAME}"
+                for machine_id, schema in schemas.items()
+            )
+        )
+        return schemas
+
+    def _detach_group(self, conn: sqlite3.Connection, schemas: Dict[str, str]):
+        conn.execute(f"DROP VIEW IF EXISTS temp.{self.VIEW_NAME}")
+        for schema in schemas.values():
+            conn.execute(f"DETACH DATABASE {schema}")
+
+    def iter_groups(self, conn: sqlite3.Connection):
+        """Yield machine_id -> schema for each attach group, with fleet_logs covering that group"""
+        for group in self.groups():
+            schemas = self._attach_group(conn, group)
+            try:
+                yield schemas
+            finally:
+                self._detach_group(conn, schemas)
+
+    @staticmethod
+    def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        non_empty = [frame for frame in frames if not frame.empty]
+        if non_empty:
+            return pd.concat(non_empty, ignore_index=True)
+        return frames[0] if frames else pd.DataFrame()
+
+    def query(self, sql: str, params: Sequence = (), parse_dates: Optional[List[str]] = None) -> pd.DataFrame:
+        """Run sql against the fleet_logs view of every group and concatenate the results
+
+        Aggregates are per group, so group by machine_id (or merge the
+        results) for fleet-wide figures.
+        """
+        frames = []
+        with self.connect() as conn:
+            for _ in self.iter_groups(conn):
+                frames.append(pd.read_sql_query(sql, conn, params=list(params), parse_dates=parse_dates))
+        return self._concat(frames)
+
+    def _filter_sql(self, statistic_type: Optional[str], parameters: Optional[List[str]],
+                    start=None, end=None) -> Tuple[str, list]:
+        """WHERE clause (and its parameters) selecting the values to aggregate"""
+        clauses, params = ["value IS NOT NULL"], []
+        if statistic_type:
+            clauses.append("statistic_type = ?")
+            params.append(statistic_type)
+        if parameters:
+            clauses.append(f"parameter_type IN ({', '.join('?' * len(parameters))})")
+            params.extend(parameters)
+        for op, bound in ((">=", start), ("<=", end)):
+            if bound is not None:
+                clauses.append(f"datetime {op} ?")
+                params.append(pd.Timestamp(bound).strftime("%Y-%m-%d %H:%M:%S"))
+        return " AND ".join(clauses), params
+
+    def machine_summary(self) -> pd.DataFrame:
+        """record_count, parameter_count, start_date and end_date per machine"""
+        frames = []
+        with self.connect() as conn:
+            for schemas in self.iter_groups(conn):
+                sql = " UNION ALL ".join(
+                    f"""SELECT {self._literal(machine_id)} AS machine_id, COUNT(*) AS record_count,
+                               COUNT(DISTINCT parameter_type) AS parameter_count,
+                               MIN(datetime) AS start_date, MAX(datetime) AS end_date
+                        FROM {schema}.{self.TABLE_NAME}"""
+                    for machine_id, schema in schemas.items()
+                )
+                frames.append(pd.read_sql_query(sql, conn))
+        return self._concat(frames)
+
+    def machine_parameters(self) -> pd.DataFrame:
+        """Distinct (machine_id, parameter_type) pairs"""
+        frames = []
+        with self.connect() as conn:
+            for schemas in self.iter_groups(conn):
+                sql = " UNION ALL ".join(
+                    f"SELECT DISTINCT {self._literal(machine_id)} AS machine_id, parameter_type "
+                    f"FROM {schema}.{self.TABLE_NAME}"
+                    for machine_id, schema in schemas.items()
+                )
+                frames.append(pd.read_sql_query(sql, conn))
+        return self._concat(frames)
+
+    def parameter_statistics(self, statistic_type: Optional[str] = "avg",
+                             percentiles: Sequence[float] = (0.25, 0.5, 0.75),
+                             by_machine: bool = False, parameters: Optional[List[str]] = None,
+                             start=None, end=None) -> pd.DataFrame:
+        """count, mean, std, min, max and percentiles of the values per parameter
+
+        Args:
+            statistic_type: Statistic rows to aggregate ('avg', 'min', 'max'; None for all)
+            percentiles: Quantiles in [0, 1], linearly interpolated like pandas
+            by_machine: One row per machine and parameter instead of per parameter
+            parameters: Parameter types to include (default all)
+            start, end: Optional datetime bounds (inclusive)
+
+        Returns:
+            DataFrame keyed by [machine_id,] parameter_type with count, mean,
+            std (sample), min, max and one column per percentile ('25%', ...)
+        """
+        keys = ["machine_id", "parameter_type"] if by_machine else ["parameter_type"]
+        where, where_params = self._filter_sql(statistic_type, parameters, start, end)
+        percentiles = [float(q) for q in percentiles]
+        # Unfiltered aggregations read whole tables, faster in table order than through an index
+        source = f"{{schema}}.{self.TABLE_NAME}" + (" NOT INDEXED" if not parameters and start is None and end is None else "")
+
+        moment_frames = []
+        percentile_df = None
+        with self.connect() as conn:
+            if percentiles:
+                conn.execute(f"CREATE TABLE fleet_values ({', '.join(keys)}, value REAL)")
+
+            for schemas in self.iter_groups(conn):
+                moment_frames.append(self._group_moments(conn, schemas, source, keys, where, where_params))
+                for machine_id, schema in (schemas.items() if percentiles else ()):
+                    machine_column = f"{self._literal(machine_id)}, " if by_machine else ""
+                    conn.execute(
+                        f"INSERT INTO fleet_values SELECT {machine_column}parameter_type, value "
+                        f"FROM {source.format(schema=schema)} WHERE {where}",
+                        where_params,
+                    )
+
+            if percentiles:
+                percentile_df = self._staged_percentiles(conn, keys, percentiles)
+
+        stats = self._merge_moments(self._concat(moment_frames), keys)
+        if percentile_df is not None and not percentile_df.empty:
+            stats = stats.merge(percentile_df, on=keys, how="left")
+        return stats.sort_values(keys).reset_index(drop=True)
+
+    def _group_moments(self, conn, schemas: Dict[str, str], source: str, keys: List[str], where: str,
+                       where_params: list) -> pd.DataFrame:
+        """n, mean, M2 (sum of squared deviations), min and max per key within one group
+
+        source is the table expression of a machine, formatted with its schema.
+        """
+        # Two passes per machine (mean, then deviations) keep the variance
+        # accurate where sum-of-squares formulas would cancel
+        parts = " UNION ALL ".join(
+            f"""SELECT {self._literal(machine_id)} AS machine_id, parameter_type, COUNT(value) AS n,
+                       AVG(value) AS mean, SUM((value - mu) * (value - mu)) AS m2,
+                       MIN(value) AS min_value, MAX(value) AS max_value
+                FROM {source.format(schema=schema)}
+                JOIN (SELECT parameter_type AS mu_parameter, AVG(value) AS mu
+                      FROM {source.format(schema=schema)} WHERE {where} GROUP BY parameter_type)
+                  ON parameter_type = mu_parameter
+                WHERE {where}
+                GROUP BY parameter_type"""
+            for machine_id, schema in schemas.items()
+        )
+        key_sql = ", ".join(keys)
+        sql = f"""
+            WITH parts AS ({parts}),
+            totals AS (
+                SELECT {key_sql}, SUM(n) AS n, SUM(n * mean) / SUM(n) AS mean,
+                       MIN(min_value) AS min_value, MAX(max_value) AS max_value
+                FROM parts GROUP BY {key_sql}
+            )
+            SELECT {", ".join(f"t.{key}" for key in keys)}, t.n, t.mean,
+                   SUM(p.m2 + p.n * (p.mean - t.mean) * (p.mean - t.mean)) AS m2,
+                   t.min_value, t.max_value
+            FROM parts p JOIN totals t USING ({key_sql})
+            GROUP BY {", ".join(f"t.{key}" for key in keys)}
+        """
+        return pd.read_sql_query(sql, conn, params=where_params * 2 * len(schemas))
+
+    @staticmethod
+    def _merge_moments(moments: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+        """Combine per-group moments (Chan et al.) into count/mean/std/min/max"""
+        columns = keys + ["count", "mean", "std", "min", "max"]
+        if moments.empty:
+            return pd.DataFrame(columns=columns)
+
+        grouped = moments.assign(weighted=moments["n"] * moments["mean"]).groupby(keys, sort=False)
+        totals = grouped.agg(count=("n", "sum"), weighted=("weighted", "sum"),
+                             min=("min_value", "min"), max=("max_value", "max")).reset_index()
+        totals["mean"] = totals["weighted"] / totals["count"]
+
+        moments = moments.merge(totals[keys + ["mean"]], on=keys, suffixes=("", "_total"))
+        moments["m2"] = moments["m2"] + moments["n"] * (moments["mean"] - moments["mean_total"]) ** 2
+        m2 = moments.groupby(keys, sort=False)["m2"].sum().rename("m2").reset_index()
+        totals = totals.merge(m2, on=keys)
+        totals["std"] = np.sqrt(totals["m2"] / (totals["count"] - 1)).where(totals["count"] > 1)
+        totals["count"] = totals["count"].astype("int64")
+        return totals[columns]
+
+    @staticmethod
+    def _staged_percentiles(conn, keys: List[str], percentiles: List[float]) -> pd.DataFrame:
+        """Percentiles per key of the staged fleet_values, interpolated like pandas"""
+        key_sql = ", ".join(keys)
+        key_match = " AND ".join(f"{key} = ?" for key in keys)
+        labels = [f"{q * 100:g}%" for q in percentiles]
+        conn.execute(f"CREATE INDEX fleet_values_rank ON fleet_values ({key_sql}, value)")
+
+        rows = []
+        for *key, n in conn.execute(f"SELECT {key_sql}, COUNT(*) FROM fleet_values GROUP BY {key_sql}").fetchall():
+            row = dict(zip(keys, key))
+            for q, label in zip(percentiles, labels):
+                position = q * (n - 1)
+                lower = int(position)
+                values = [value for (value,) in conn.execute(
+                    f"SELECT value FROM fleet_values WHERE {key_match} ORDER BY value LIMIT 2 OFFSET ?",
+                    (*key, lower),
+                )]
+                upper = values[1] if len(values) > 1 else values[0]
+                row[label] = values[0] + (upper - values[0]) * (position - lower)
+            rows.append(row)
+        return pd.DataFrame(rows, columns=keys + labels)
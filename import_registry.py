@@ -0,0 +1,125 @@
+"""
+Import Registry for HALbasic
+Content-addressed duplicate-import detection for LINAC log files.
+
+Files are identified by the SHA-256 of their content, so a log that was
+already imported is recognised even when copied under another filename:
+- An identical file is skipped without parsing
+- A file whose leading bytes match a registered file (the same log after it
+  grew) is imported as a delta from the end of the known part
+
+Both checks are done in a single read of the file. Registered hashes are
+stored in the import_registry table of the main database.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import hashlib
+import os
+from typing import Dict
+
+from database import DatabaseManager
+
+
+class ImportRegistry:
+    """Checks log files against previously imported content before parsing"""
+
+    READ_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+    def __init__(self, database: DatabaseManager):
+        self.db = database
+
+    def _hash_with_prefixes(self, file_path: str, file_size: int) -> Dict[int, str]:
+        """SHA-256 of the whole file plus of every registered-size prefix of it
+
+        The running hash is snapshotted whenever the read position reaches a
+        size that is in the registry, so prefixes cost no extra reads.
+        """
+        boundaries = [size for size in self.db.get_registered_import_sizes(file_size) if size > 0]
+        if not boundaries or boundaries[-1] != file_size:
+            boundaries.append(file_size)
+
+        sha256_hash = hashlib.sha256()
+        digests = {}
+        position = 0
+
+        with open(file_path, "rb") as f:
+            for boundary in boundaries:
+                while position < boundary:
+                    block = f.read(min(self.READ_BLOCK_SIZE, boundary - position))
+                    if not block:
+                        break
+                    sha256_hash.update(block)
+                    position += len(block)
+                digests[boundary] = sha256_hash.hexdigest()
+
+        return digests
+
+    def _next_line_start(self, file_path: str, offset: int) -> int:
+        """First line boundary at or after offset"""
+        if offset == 0:
+            return 0
+        with open(file_path, "rb") as f:
+            f.seek(offset - 1)
+            if f.read(1) == b"\n":
+                return offset
+            f.readline()  # rest of a line that was imported unterminated
+            return f.tell()
+
+    def check_file(self, file_path: str) -> Dict:
+        """Classify a file before import
+
+        Returns:
+            Dict with status ('new', 'duplicate' or 'extension'), content_hash,
+            file_size, and for extensions start_offset/start_line of the delta
+            plus the matched registry entry under 'known'
+        """
+        file_size = os.path.getsize(file_path)
+        digests = self._hash_with_prefixes(file_path, file_size)
+        content_hash = digests[file_size]
+        result = {
+            "status": "new",
+            "content_hash": content_hash,
+            "file_size": file_size,
+            "start_offset": 0,
+            "start_line": 1,
+        }
+
+        known = self.db.find_registered_import(content_hash)
+        if known:
+            result["status"] = "duplicate"
+            result["known"] = known
+            return result
+
+        # Longest registered prefix wins
+        for size in sorted(digests, reverse=True):
+            if size >= file_size:
+                continue
+            known = self.db.find_registered_import(digests[size])
+            if known and known["file_size"] == size:
+                result["status"] = "extension"
+                result["known"] = known
+                result["start_offset"] = self._next_line_start(file_path, size)
+                result["start_line"] = (known["line_count"] or 0) + 1
+                break
+
+        return result
+
+    def register(self, check_result: Dict, filename: str, lines_parsed: int, records_imported: int):
+        """Register a file after a successful import
+
+        Args:
+            check_result: Result of check_file for the imported file
+            filename: Name shown in the import history
+            lines_parsed: Lines parsed in this import (the delta for extensions)
+            records_imported: Rows inserted by this import
+        """
+        line_count = check_result["start_line"] - 1 + lines_parsed
+        self.db.register_import(
+            check_result["content_hash"],
+            check_result["file_size"],
+            line_count,
+            filename,
+            records_imported,
+        )
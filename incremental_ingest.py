@@ -0,0 +1,158 @@
+"""
+Incremental Ingest for HALbasic
+Tail-follow import of growing LINAC log files.
+
+Log files copied from the console PCs keep growing between copies. Instead of
+re-importing the whole file every time, this module:
+- Records the last ingested byte offset and line number per file
+- Fingerprints the head of the file to detect rotation
+- Detects truncation (file shorter than the recorded offset)
+- Parses only the appended complete lines with parse_linac_file
+
+State is kept in the ingest_state table next to file_metadata.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from database import DatabaseManager
+from unified_parser import UnifiedParser
+
+
+class IncrementalIngestor:
+    """Imports only the new part of LINAC log files that were imported before"""
+
+    # Bytes at the start of the file used to recognise the same log
+    HEAD_FINGERPRINT_SIZE = 64 * 1024
+
+    def __init__(self, database: DatabaseManager, parser: Optional[UnifiedParser] = None):
+        self.db = database
+        self.parser = parser or UnifiedParser()
+
+    def _head_fingerprint(self, file_path: str, length: int) -> str:
+        """SHA-1 of the first `length` bytes of the file"""
+        with open(file_path, 'rb') as f:
+            return hashlib.sha1(f.read(length)).hexdigest()
+
+    def _last_line_end(self, file_path: str, file_size: int, block_size: int = 64 * 1024) -> int:
+        """Offset just past the last newline, so a partly written last line is left for next time"""
+        with open(file_path, 'rb') as f:
+            position = file_size
+            while position > 0:
+                block_start = max(0, position - block_size)
+                f.seek(block_start)
+                block = f.read(position - block_start)
+                newline = block.rfind(b'\n')
+                if newline != -1:
+                    return block_start + newline + 1
+                position = block_start
+        return 0
+
+    def get_resume_point(self, file_path: str, file_size: int) -> Dict:
+        """Work out where to resume parsing a file
+
+        Returns:
+            Dict with mode ('new', 'append', 'truncated', 'rotated'),
+            start_offset and start_line
+        """
+        state = self.db.get_ingest_state(file_path)
+        if state is None:
+            return {"mode": "new", "start_offset": 0, "start_line": 1}
+
+        if file_size < state["byte_offset"]:
+            return {"mode": "truncated", "start_offset": 0, "start_line": 1}
+
+        head_length = state["head_length"] or 0
+        if head_length and self._head_fingerprint(file_path, head_length) != state["head_fingerprint"]:
+            return {"mode": "rotated", "start_offset": 0, "start_line": 1}
+
+        return {
+            "mode": "append",
+            "start_offset": state["byte_offset"],
+            "start_line": state["line_number"] + 1,
+        }
+
+    def ingest(self, file_path: str, progress_callback=None, cancel_callback=None,
+               enable_validation: bool = True) -> Dict:
+        """Import the lines appended to a log file since its last import
+
+        Truncated or rotated files are imported again from the start.
+
+        Returns:
+            Dict with mode, records_inserted, start_offset and end_offset
+        """
+        file_path = os.path.abspath(file_path)
+        result = {"mode": "unchanged", "records_inserted": 0, "start_offset": 0, "end_offset": 0}
+
+        try:
+            file_size = os.path.getsize(file_path)
+            resume = self.get_resume_point(file_path, file_size)
+            end_offset = self._last_line_end(file_path, file_size)
+
+            result["start_offset"] = resume["start_offset"]
+            result["end_offset"] = end_offset
+
+            if resume["mode"] in ("truncated", "rotated"):
+                print(f"⚠️ {os.path.basename(file_path)} was {resume['mode']} - importing from the start")
+
+            if end_offset <= resume["start_offset"]:
+                print(f"✓ No new complete lines in {os.path.basename(file_path)}")
+                return result
+
+            result["mode"] = resume["mode"]
+
+            df = self.parser.parse_linac_file(
+                file_path,
+                progress_callback=progress_callback,
+                cancel_callback=cancel_callback,
+                enable_validation=enable_validation,
+                explode_statistics=False,
+                start_offset=resume["start_offset"],
+                end_offset=end_offset,
+                start_line=resume["start_line"],
+            )
+
+            if cancel_callback and cancel_callback():
+                result["mode"] = "cancelled"
+                return result
+
+            records_inserted = 0
+            if not df.empty:
+                records_inserted = self.db.insert_data_batch(df)
+                if records_inserted == 0:
+                    # Leave the state alone so the same bytes are retried next time
+                    print(f"❌ Insert failed for {os.path.basename(file_path)}, ingest state not advanced")
+                    result["mode"] = "failed"
+                    return result
+
+            parsing_stats = self.parser.get_parsing_stats()
+            self.db.insert_file_metadata(
+                filename=os.path.basename(file_path),
+                file_size=end_offset - resume["start_offset"],
+                records_imported=records_inserted,
+                parsing_stats=json.dumps(parsing_stats, default=str),
+            )
+
+            head_length = min(self.HEAD_FINGERPRINT_SIZE, end_offset)
+            self.db.save_ingest_state(
+                file_path,
+                byte_offset=end_offset,
+                line_number=resume["start_line"] - 1 + parsing_stats["lines_processed"],
+                head_fingerprint=self._head_fingerprint(file_path, head_length),
+                head_length=head_length,
+            )
+
+            result["records_inserted"] = records_inserted
+            print(f"✓ Incremental ingest ({result['mode']}): {records_inserted:,} records from "
+                  f"bytes {resume['start_offset']:,}-{end_offset:,} of {os.path.basename(file_path)}")
+
+        except Exception as e:
+            print(f"Error during incremental ingest of {file_path}: {e}")
+            result["mode"] = "failed"
+
+        return result
@@ -0,0 +1,169 @@
+"""
+Streaming Ingest Pipeline for HALbasic
+Parses LINAC log files straight into SQLite with bounded memory.
+
+Two stages overlap:
+    parse (calling thread): UnifiedParser.iter_linac_file_chunks
+        -> validate (DataValidator.validate_chunk, optional)
+    write (DatabaseWriterThread): holds the database's single writer
+        connection, executemany per chunk, commits in large transactions
+
+The stages are joined by a bounded queue of max_in_flight_chunks parsed
+chunks: when the writer falls behind, the parser blocks on the full queue
+instead of buffering the whole file, so wall-clock time approaches
+max(parse, write) rather than their sum.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import threading
+from queue import Queue, Full
+from typing import Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from database import DatabaseManager
+from unified_parser import UnifiedParser
+
+
+_END_OF_STREAM = object()
+
+
+class DatabaseWriterThread(threading.Thread):
+    """Dedicated writer that holds the pool's writer connection and drains a bounded chunk queue"""
+
+    def __init__(self, database: DatabaseManager, max_in_flight: int = 4,
+                 commit_rows: int = 100000, progress_callback=None):
+        super().__init__(name="ingest-writer", daemon=True)
+        self.database = database
+        self.commit_rows = commit_rows
+        self.progress_callback = progress_callback
+        self.queue = Queue(maxsize=max(1, max_in_flight))
+        self.rows_inserted = 0
+        self.error: Optional[Exception] = None
+
+    def put(self, df: pd.DataFrame, position: Optional[int] = None):
+        """Queue a parsed chunk, blocking while max_in_flight chunks are waiting"""
+        while True:
+            if not self.is_alive():
+                raise RuntimeError(f"Database writer stopped: {self.error}")
+            try:
+                self.queue.put((df, position), timeout=0.1)
+                return
+            except Full:
+                continue
+
+    def finish(self) -> int:
+        """Signal end of input, wait for the writer and return rows inserted"""
+        while self.is_alive():
+            try:
+                self.queue.put(_END_OF_STREAM, timeout=0.1)
+                break
+            except Full:
+                continue
+        self.join()
+        return self.rows_inserted
+
+    def _iter_queue(self) -> Iterator:
+        while True:
+            item = self.queue.get()
+            if item is _END_OF_STREAM:
+                return
+            yield item
+
+    def run(self):
+        try:
+            # The single writer: queued writes wait for this import to finish
+            with self.database.get_connection(timeout=-1) as conn:
+                self.rows_inserted = self.database.insert_wide_stream(
+                    self._iter_queue(),
+                    commit_rows=self.commit_rows,
+                    progress_callback=self.progress_callback,
+                    conn=conn,
+                )
+        except Exception as e:
+            self.error = e
+            print(f"❌ Database writer failed: {e}")
+
+
+def validate_chunks(chunks: Iterable, validator) -> Iterator:
+    """Pass (DataFrame, position) chunks through DataValidator.validate_chunk"""
+    for chunk_number, (df, position) in enumerate(chunks):
+        if not df.empty:
+            validator.validate_chunk(df, chunk_number)
+        yield df, position
+
+
+def stream_linac_file(
+    file_path: str,
+    database: DatabaseManager,
+    parser: Optional[UnifiedParser] = None,
+    chunk_size: int = 5000,
+    max_in_flight_chunks: int = 4,
+    enable_validation: bool = True,
+    parse_progress_callback=None,
+    write_progress_callback=None,
+    cancel_callback=None,
+    start_offset: int = 0,
+    start_line: int = 1,
+) -> Dict:
+    """Parse a LINAC log and insert it chunk by chunk with bounded memory
+
+    Args:
+        chunk_size: Statistics lines per parsed chunk
+        max_in_flight_chunks: Parsed chunks allowed between parser and writer
+        parse_progress_callback: Called with (lines_processed, byte_position)
+            after each parsed chunk
+        write_progress_callback: Called from the writer thread with
+            (rows_inserted, byte_position) after each written chunk
+
+    Returns:
+        Dict with records_parsed and records_inserted (database rows, three
+        per statistics line) and the parser's parsing_stats
+    """
+    parser = parser or UnifiedParser()
+
+    chunks = parser.iter_linac_file_chunks(
+        file_path,
+        chunk_size=chunk_size,
+        cancel_callback=cancel_callback,
+        start_offset=start_offset,
+        start_line=start_line,
+    )
+
+    validator = None
+    if enable_validation:
+        try:
+            from data_validator import DataValidator
+            validator = DataValidator(parser.parameter_mapping)
+            chunks = validate_chunks(chunks, validator)
+        except ImportError as e:
+            print(f"⚠️ Could not import DataValidator: {e}")
+
+    writer = DatabaseWriterThread(database, max_in_flight_chunks,
+                                  progress_callback=write_progress_callback)
+    writer.start()
+    records_parsed = 0
+
+    try:
+        for df, position in chunks:
+            writer.put(df, position)
+            records_parsed += len(df) * 3  # avg, min and max rows
+            if parse_progress_callback:
+                parse_progress_callback(parser.parsing_stats["lines_processed"], position)
+    except Exception as e:
+        print(f"Error in streaming parse of {file_path}: {e}")
+        parser.parsing_stats["errors_encountered"] += 1
+    finally:
+        records_inserted = writer.finish()
+
+    parsing_stats = parser.get_parsing_stats()
+    if validator:
+        parsing_stats["validation_summary"] = validator.get_validation_summary()
+
+    return {
+        "records_parsed": records_parsed,
+        "records_inserted": records_inserted,
+        "parsing_stats": parsing_stats,
+    }
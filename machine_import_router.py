@@ -0,0 +1,257 @@
+"""
+Machine Import Router for HALbasic
+Splits parsed LINAC log data by serial number into the per-machine databases.
+
+A log export may contain readings of several machines. Instead of sending a
+whole file to the machine of its first serial number, the router:
+- Partitions every parsed chunk by serial_number as it comes out of the parser
+- Keeps one open writer connection per machine database for the whole import
+- Writes each partition with one executemany inside an explicit transaction
+  per machine, committed every commit_rows rows and at the end
+- Skips readings a machine database already holds (natural-key unique index,
+  see SingleMachineDatabaseManager.NATURAL_KEY_COLUMNS), including duplicates
+  that the streaming parser leaves in different chunks
+- Sends rows without a usable serial number to the combined database
+
+so a multi-machine export is imported in a single pass over the file.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from unified_parser import UnifiedParser
+
+
+class MachineImportRouter:
+    """Routes parsed log chunks to machine databases by serial number
+
+    Use as a context manager: pending rows are committed and the writers are
+    released on exit, or rolled back if the block raised. Only rows committed
+    earlier (every commit_rows) stay stored. Writers are held for the whole
+    import, so other writes to the same machine databases wait.
+    """
+
+    # Serial numbers that do not identify a machine
+    INVALID_SERIALS = ("", "Unknown", "nan", "None")
+
+    # water_logs columns of a machine database (see create_machine_database)
+    MACHINE_LOG_COLUMNS = [
+        "datetime", "serial_number", "parameter_type", "statistic_type", "value",
+        "count", "unit", "description", "data_quality", "raw_parameter", "line_number",
+    ]
+
+    MACHINE_LOG_INSERT_SQL = (
+        f"INSERT OR IGNORE INTO water_logs ({', '.join(MACHINE_LOG_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(MACHINE_LOG_COLUMNS))})"
+    )
+
+    def __init__(self, machine_db=None, fallback_db=None, commit_rows: Optional[int] = 50000):
+        """
+        Args:
+            machine_db: SingleMachineDatabaseManager (None routes everything to fallback_db)
+            fallback_db: DatabaseManager for rows without a valid serial number
+            commit_rows: Rows written to a machine database between commits
+                (None commits only at the end, so a failed import leaves the
+                machine databases unchanged)
+        """
+        self.machine_db = machine_db
+        self.fallback_db = fallback_db
+        self.commit_rows = commit_rows
+        self.record_counts = {}  # machine_id -> records inserted
+        self.fallback_records = 0
+        self.skipped_records = 0  # readings the machine databases already held
+        self._stack = ExitStack()
+        self._writers = {}  # machine_id -> open writer connection
+        self._pending = {}  # machine_id -> records since the last commit
+        self._failed_machines = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit(reopen=False)
+            else:
+                self.rollback()
+        finally:
+            self._writers.clear()
+            self._pending.clear()
+        return self._stack.__exit__(exc_type, exc, tb)
+
+    @property
+    def total_records(self) -> int:
+        """Records written to machine databases and the fallback database"""
+        return sum(self.record_counts.values()) + self.fallback_records
+
+    @property
+    def primary_machine(self) -> Optional[str]:
+        """Machine that received the most records"""
+        if not self.record_counts:
+            return None
+        return max(self.record_counts, key=self.record_counts.get)
+
+    def _writer(self, machine_id: str):
+        """Open writer of a machine database, creating the database on first use"""
+        conn = self._writers.get(machine_id)
+        if conn is None and machine_id not in self._failed_machines:
+            if self.machine_db.create_machine_database(machine_id):
+                conn = self._stack.enter_context(self.machine_db.machine_writer(machine_id))
+                # Pool writers run in autocommit mode: batch rows explicitly
+                conn.execute("BEGIN")
+                self._writers[machine_id] = conn
+                self._pending[machine_id] = 0
+            else:
+                print(f"⚠️  Failed to create database for machine {machine_id}, using combined database")
+                self._failed_machines.add(machine_id)
+        return conn
+
+    def route(self, df: pd.DataFrame) -> int:
+        """Write a parsed chunk to the databases of the machines it contains
+
+        Args:
+            df: Wide (avg_value/min_value/max_value) or long (value) parser frame
+
+        Returns:
+            Number of records inserted (readings already stored are skipped)
+        """
+        if df is None or df.empty:
+            return 0
+
+        if self.machine_db is None or "serial_number" not in df.columns:
+            return self._write_fallback(df)
+
+        serials = df["serial_number"].astype(str).str.strip()
+        valid = df["serial_number"].notna() & ~serials.isin(self.INVALID_SERIALS)
+
+        written = 0
+        if not valid.all():
+            written += self._write_fallback(df[~valid])
+
+        for machine_id, partition in df[valid].groupby(serials[valid], sort=False):
+            conn = self._writer(machine_id)
+            if conn is None:
+                written += self._write_fallback(partition)
+                continue
+
+            rows = self._machine_log_rows(partition)
+            inserted = conn.executemany(self.MACHINE_LOG_INSERT_SQL, rows).rowcount
+            self.skipped_records += len(rows) - inserted
+            self.record_counts[machine_id] = self.record_counts.get(machine_id, 0) + inserted
+            self._pending[machine_id] += inserted
+            if self.commit_rows and self._pending[machine_id] >= self.commit_rows:
+                conn.commit()
+                conn.execute("BEGIN")
+                self._pending[machine_id] = 0
+            written += inserted
+
+        return written
+
+    def _write_fallback(self, df: pd.DataFrame) -> int:
+        if self.fallback_db is None:
+            print(f"⚠️  Dropped {len(df)} rows without a machine serial number")
+            return 0
+        inserted = self.fallback_db.insert_data_batch(df)
+        self.fallback_records += inserted
+        return inserted
+
+    def _machine_log_rows(self, df: pd.DataFrame) -> list:
+        """Rows in MACHINE_LOG_COLUMNS order, one per statistic (wide frames are expanded)"""
+        if "value" not in df.columns and "avg_value" in df.columns:
+            # Same avg/min/max row order per reading as UnifiedParser._explode_statistics
+            stat_names = [name for name, _ in UnifiedParser.STATISTIC_COLUMNS]
+            value_columns = [column for _, column in UnifiedParser.STATISTIC_COLUMNS]
+            values = df[value_columns].to_numpy(dtype=float).ravel()
+            df = df.iloc[np.repeat(np.arange(len(df)), len(stat_names))].assign(
+                statistic_type=np.tile(np.array(stat_names, dtype=object), len(df)),
+                value=values,
+            )
+
+        columns = {}
+        for column in self.MACHINE_LOG_COLUMNS:
+            if column == "data_quality" and column not in df.columns:
+                column_values = df["quality"] if "quality" in df.columns else "good"
+            else:
+                column_values = df[column] if column in df.columns else None
+            columns[column] = column_values
+        machine_logs = pd.DataFrame(columns, index=df.index)
+
+        machine_logs["datetime"] = pd.to_datetime(machine_logs["datetime"]).dt.strftime("%Y-%m-%d %H:%M:%S")
+        machine_logs = machine_logs.astype(object).where(machine_logs.notna(), None)
+        return list(machine_logs.itertuples(index=False, name=None))
+
+    def import_file(self, parser: UnifiedParser, file_path: str, chunk_size: int = 5000,
+                    cancel_callback: Optional[Callable[[], bool]] = None,
+                    chunk_callback: Optional[Callable[[pd.DataFrame], None]] = None) -> int:
+        """Parse a log file and route its chunks as they are produced
+
+        Args:
+            parser: UnifiedParser used to stream the file (iter_linac_file_chunks)
+            file_path: Log file to import
+            chunk_size: Statistics lines per parsed chunk
+            cancel_callback: Returns True to stop parsing
+            chunk_callback: Called with every parsed chunk (e.g. validation)
+
+        Returns:
+            Number of records inserted
+        """
+        start_time = time.time()
+        written = 0
+        for chunk, _ in parser.iter_linac_file_chunks(file_path, chunk_size=chunk_size,
+                                                       cancel_callback=cancel_callback):
+            if chunk_callback:
+                chunk_callback(chunk)
+            written += self.route(chunk)
+
+        machines = ", ".join(f"{machine_id}: {count}" for machine_id, count in sorted(self.record_counts.items()))
+        print(f"✓ Routed {written} records in {time.time() - start_time:.2f}s ({machines or 'no machines'})")
+        if self.skipped_records:
+            print(f"🔄 Skipped {self.skipped_records} readings already stored")
+        return written
+
+    def record_file(self, filename: str, file_size: int):
+        """Store file metadata in every database that received records of the file"""
+        for machine_id, count in self.record_counts.items():
+            self._writers[machine_id].execute(
+                """
+                INSERT INTO file_metadata (
+                    filename, file_size, records_imported, processing_status, machine_serial
+                ) VALUES (?, ?, ?, ?, ?)
+            """,
+                (filename, file_size, count, "completed", machine_id),
+            )
+        if self.fallback_records and self.fallback_db is not None:
+            self.fallback_db.insert_file_metadata(
+                filename=filename,
+                file_size=file_size,
+                records_imported=self.fallback_records,
+                parsing_stats="{}",
+            )
+
+    def commit(self, reopen: bool = True):
+        """Commit the pending rows of every machine database
+
+        Args:
+            reopen: Start the next transaction (False when the import is done)
+        """
+        for machine_id, conn in self._writers.items():
+            conn.commit()
+            if reopen:
+                conn.execute("BEGIN")
+            self._pending[machine_id] = 0
+
+    def rollback(self):
+        """Discard the rows written to the machine databases since their last commit"""
+        for machine_id, conn in self._writers.items():
+            if conn.in_transaction:
+                conn.rollback()
+            if machine_id in self.record_counts:
+                self.record_counts[machine_id] -= self._pending[machine_id]
+            self._pending[machine_id] = 0
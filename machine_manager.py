@@ -62,18 +62,9 @@ class MachineManager:
                 return machines
             
             # Fallback to legacy combined database approach
-            with self.db.get_connection() as conn:
-                cursor = conn.execute("""
-                    SELECT DISTINCT serial_number 
-                    FROM water_logs 
-                    WHERE serial_number IS NOT NULL 
-                    AND serial_number != ''
-                    AND serial_number != 'Unknown'
-                    ORDER BY serial_number
-                """)
-                machines = [row[0] for row in cursor.fetchall()]
-                self._available_machines = machines
-                return machines
+            machines = self.db.get_unique_serial_numbers()
+            self._available_machines = machines
+            return machines
         except Exception as e:
             print(f"Error getting available machines: {e}")
             return []
@@ -166,7 +157,7 @@ class MachineManager:
                 try:
                     # Switch to selected machine database and load its data
                     if self.single_machine_db.switch_to_machine(self._selected_machine):
-                        with self.single_machine_db.get_connection() as conn:
+                        with self.single_machine_db.get_read_connection() as conn:
                             data = pd.read_sql_query("""
                                 SELECT datetime, serial_number, parameter_type, 
                                        statistic_type, value, count, unit, description
@@ -183,25 +174,12 @@ class MachineManager:
                 except Exception as e:
                     print(f"Error loading data from single-machine database: {e}")
                     
-            # Fallback to legacy combined database approach
-            try:
-                with self.db.get_connection() as conn:
-                    data = pd.read_sql_query("""
-                        SELECT datetime, serial_number, parameter_type, 
-                               statistic_type, value, count, unit, description
-                        FROM water_logs
-                        ORDER BY datetime
-                    """, conn)
-                    # Convert datetime with flexible parsing
-                    if not data.empty and 'datetime' in data.columns:
-                        try:
-                            data['datetime'] = pd.to_datetime(data['datetime'], format='mixed')
-                        except:
-                            # Fallback to basic conversion
-                            data['datetime'] = pd.to_datetime(data['datetime'], errors='coerce')
-            except Exception as e:
-                print(f"Error loading raw data: {e}")
-                return pd.DataFrame()
+            # Fallback to legacy combined database approach - the machine filter
+            # is applied in SQL and datetime comes back as datetime64
+            serials = None
+            if self._selected_machines and self._selected_machine != "All Machines":
+                serials = self._selected_machines
+            data = self._load_statistic_rows(serials)
         
         if data.empty:
             return data
@@ -223,6 +201,21 @@ class MachineManager:
         filtered_data = data[data[serial_col] == self._selected_machine].copy()
         return filtered_data
     
+    def _load_statistic_rows(self, serial_numbers: Optional[List[str]] = None) -> pd.DataFrame:
+        """Long-layout rows from the combined database, optionally for some machines only"""
+        data = self.db.get_statistic_rows(serial_numbers=serial_numbers, include_details=True)
+        if data.empty:
+            return data
+        return data[['datetime', 'serial_number', 'parameter_type', 'statistic_type',
+                     'value', 'count', 'unit', 'description']]
+    
+    def _load_parameter_rows(self, machine_id: str, parameter: str) -> pd.DataFrame:
+        """datetime/value/statistic_type/unit rows of one machine parameter"""
+        data = self.db.get_statistic_rows(serial_numbers=machine_id, parameter_types=parameter)
+        if data.empty:
+            return data
+        return data[['datetime', 'value', 'statistic_type', 'unit']]
+    
     def get_machine_summary(self, machine_id: str = None) -> Dict[str, Any]:
         """Get summary statistics for a specific machine
         
@@ -237,35 +230,14 @@ class MachineManager:
             return self._get_all_machines_summary()
         
         try:
-            with self.db.get_connection() as conn:
-                # Get record count for machine
-                cursor = conn.execute("""
-                    SELECT COUNT(*) FROM water_logs 
-                    WHERE serial_number = ?
-                """, (target_machine,))
-                record_count = cursor.fetchone()[0]
-                
-                # Get parameter count for machine
-                cursor = conn.execute("""
-                    SELECT COUNT(DISTINCT parameter_type) FROM water_logs 
-                    WHERE serial_number = ?
-                """, (target_machine,))
-                parameter_count = cursor.fetchone()[0]
-                
-                # Get date range for machine
-                cursor = conn.execute("""
-                    SELECT MIN(datetime), MAX(datetime) FROM water_logs 
-                    WHERE serial_number = ?
-                """, (target_machine,))
-                date_range = cursor.fetchone()
-                
-                return {
-                    'machine_id': target_machine,
-                    'record_count': record_count,
-                    'parameter_count': parameter_count,
-                    'start_date': date_range[0] if date_range[0] else 'N/A',
-                    'end_date': date_range[1] if date_range[1] else 'N/A'
-                }
+            summary = self.db.get_serial_summary(target_machine)
+            return {
+                'machine_id': target_machine,
+                'record_count': summary['record_count'],
+                'parameter_count': summary['parameter_count'],
+                'start_date': summary['start_date'] or 'N/A',
+                'end_date': summary['end_date'] or 'N/A'
+            }
         except Exception as e:
             print(f"Error getting machine summary: {e}")
             return {}
@@ -338,22 +310,7 @@ class MachineManager:
         """
         if data is None:
             # Load raw data from database
-            try:
-                with self.db.get_connection() as conn:
-                    data = pd.read_sql_query("""
-                        SELECT datetime, serial_number, parameter_type, 
-                               statistic_type, value, count, unit, description
-                        FROM water_logs
-                        ORDER BY datetime
-                    """, conn)
-                    if not data.empty and 'datetime' in data.columns:
-                        try:
-                            data['datetime'] = pd.to_datetime(data['datetime'], format='mixed')
-                        except:
-                            data['datetime'] = pd.to_datetime(data['datetime'], errors='coerce')
-            except Exception as e:
-                print(f"Error loading raw data: {e}")
-                return {}
+            data = self._load_statistic_rows(self._selected_machines or None)
         
         if data.empty:
             return {}
@@ -380,16 +337,18 @@ class MachineManager:
                 result[machine_id] = machine_data
         return result
     
-    def get_machine_color(self, machine_id: str) -> str:
+    def get_machine_color(self, machine_id: str, available_machines: Optional[List[str]] = None) -> str:
         """Get consistently assigned color for a machine ID
         
         Args:
             machine_id: Machine ID to get color for
+            available_machines: Known machine list (discovered if None)
             
         Returns:
             Hex color code for the machine
         """
-        available_machines = self.get_available_machines()
+        if available_machines is None:
+            available_machines = self.get_available_machines()
         
         # Create consistent mapping by sorting machine IDs alphabetically  
         if machine_id in available_machines:
@@ -400,17 +359,21 @@ class MachineManager:
         # Fallback to default blue for unknown machines
         return MACHINE_COLORS['palette']['blue']
     
-    def get_machine_metadata(self, machine_id: str) -> dict:
+    def get_machine_metadata(self, machine_id: str, summary: Optional[Dict[str, Any]] = None,
+                             available_machines: Optional[List[str]] = None) -> dict:
         """Get machine metadata including color, display name, and status
         
         Args:
             machine_id: Machine ID to get metadata for
+            summary: The machine's summary, if already loaded
+            available_machines: Known machine list (discovered if None)
             
         Returns:
             Dictionary with color, display_name, status information
         """
         try:
-            available_machines = self.get_available_machines()
+            if available_machines is None:
+                available_machines = self.get_available_machines()
             
             if machine_id not in available_machines and machine_id != "All Machines":
                 return {
@@ -422,7 +385,8 @@ class MachineManager:
                 }
             
             # Get basic summary for status determination
-            summary = self.get_machine_summary(machine_id)
+            if summary is None:
+                summary = self.get_machine_summary(machine_id)
             
             # Determine status based on data availability
             status = 'active'
@@ -433,7 +397,7 @@ class MachineManager:
                 
             return {
                 'machine_id': machine_id,
-                'color': self.get_machine_color(machine_id),
+                'color': self.get_machine_color(machine_id, available_machines),
                 'display_name': machine_id.replace('_', ' ').title(),
                 'status': status,
                 'available': True,
@@ -484,18 +448,7 @@ class MachineManager:
                 self.set_selected_machine(machine_id)
                 
                 # Get parameter-specific data
-                with self.db.get_connection() as conn:
-                    query = """
-                        SELECT datetime, value, statistic_type, unit
-                        FROM water_logs 
-                        WHERE serial_number = ? AND parameter_type = ?
-                        ORDER BY datetime
-                    """
-                    data = pd.read_sql_query(
-                        query, conn, 
-                        params=[machine_id, parameter],
-                        parse_dates=['datetime']
-                    )
+                data = self._load_parameter_rows(machine_id, parameter)
                     
                 if not data.empty:
                     # Calculate statistics for this machine
@@ -568,11 +521,17 @@ class MachineManager:
                 'date_range': {'earliest': None, 'latest': None}
             }
             
+            # Summaries of all machines, queried in parallel
+            summaries = self._get_machine_summaries(available_machines)
+
             # Get statistics for each machine
             for machine_id in available_machines:
                 try:
-                    summary = self.get_machine_summary(machine_id)
-                    metadata = self.get_machine_metadata(machine_id)
+                    summary = summaries.get(machine_id)
+                    if summary is None:
+                        print(f"Warning: No summary for machine {machine_id}")
+                        continue
+                    metadata = self.get_machine_metadata(machine_id, summary, available_machines)
                     
                     machine_stats[machine_id] = {
                         **summary,
@@ -616,13 +575,19 @@ class MachineManager:
             return {
                 'machines': machine_stats,
                 'fleet_stats': fleet_stats,
-                'color_mapping': {mid: self.get_machine_color(mid) for mid in available_machines}
+                'color_mapping': {mid: self.get_machine_color(mid, available_machines) for mid in available_machines}
             }
             
         except Exception as e:
             print(f"Error getting multi-machine stats: {e}")
             return {'machines': {}, 'fleet_stats': {}, 'error': str(e)}
     
+    def _get_machine_summaries(self, machine_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Summaries of several machines - fanned out over the machine databases when available"""
+        if self._use_single_machine_architecture and self.single_machine_db:
+            return self.single_machine_db.get_fleet_summaries(machine_ids)
+        return {machine_id: self.get_machine_summary(machine_id) for machine_id in machine_ids}
+
     def export_machine_comparison(self, machines: List[str], parameters: List[str]) -> pd.DataFrame:
         """Export machine comparison data for specified machines and parameters
         
@@ -641,18 +606,7 @@ class MachineManager:
                 
                 for parameter in parameters:
                     # Get parameter data for this machine
-                    with self.db.get_connection() as conn:
-                        query = """
-                            SELECT datetime, value, statistic_type, unit
-                            FROM water_logs 
-                            WHERE serial_number = ? AND parameter_type = ?
-                            ORDER BY datetime
-                        """
-                        data = pd.read_sql_query(
-                            query, conn,
-                            params=[machine_id, parameter],
-                            parse_dates=['datetime']
-                        )
+                    data = self._load_parameter_rows(machine_id, parameter)
                     
                     if not data.empty:
                         # Calculate summary statistics for export
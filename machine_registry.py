@@ -0,0 +1,250 @@
+"""
+Machine Registry for HALbasic
+Cached discovery of the per-machine databases (halog_machine_<id>.db).
+
+Discovering machines used to open every machine database, check its schema
+and COUNT(*) its water_logs table. The registry keeps that information in a
+small catalog database and only looks inside a machine database when the
+file changed:
+- The machines directory is listed again only when its mtime changed
+- A known file is re-inspected only when its size/mtime, or those of its
+  -wal file, changed (writes in WAL mode reach the main file only at
+  checkpoints)
+- Record counts are maintained counters: the registry remembers the highest
+  water_logs id it counted and adds only the rows above it (ids are
+  AUTOINCREMENT), so a re-inspection is a primary-key range count rather
+  than a table scan
+
+A refresh with nothing changed is one stat call per file. Machine readings
+are never deleted in place; if that happens, invalidate() the machine to
+count it from scratch.
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class MachineRegistry:
+    """Catalog of machine databases, refreshed from file metadata"""
+
+    FILE_PREFIX = "halog_machine_"
+    FILE_SUFFIX = ".db"
+
+    def __init__(self, machines_dir: str, catalog_path: str, timeout: float = 30.0):
+        """
+        Args:
+            machines_dir: Directory of the halog_machine_<id>.db files
+            catalog_path: SQLite file holding the registry (outside machines_dir,
+                so registry writes do not touch the directory mtime)
+            timeout: Seconds to wait on a locked database
+        """
+        self.machines_dir = Path(machines_dir)
+        self.catalog_path = str(catalog_path)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = {}  # machine_id -> registry entry
+        self._dir_mtime = None
+        self._init_catalog()
+        self._load()
+
+    def _connect_catalog(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.catalog_path, timeout=self.timeout)
+
+    def _init_catalog(self):
+        with closing(self._connect_catalog()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS machine_registry (
+                    machine_id TEXT PRIMARY KEY,
+                    db_path TEXT NOT NULL,
+                    file_size INTEGER,
+                    file_mtime_ns INTEGER,
+                    wal_size INTEGER,
+                    wal_mtime_ns INTEGER,
+                    valid INTEGER NOT NULL DEFAULT 0,
+                    record_count INTEGER NOT NULL DEFAULT 0,
+                    last_id INTEGER NOT NULL DEFAULT 0,
+                    last_checked TIMESTAMP
+                )
+            """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS registry_state (key TEXT PRIMARY KEY, value INTEGER)"
+            )
+
+    def _load(self):
+        """Read the persisted registry into memory"""
+        with closing(self._connect_catalog()) as conn:
+            for row in conn.execute(
+                """
+                SELECT machine_id, db_path, file_size, file_mtime_ns, wal_size, wal_mtime_ns,
+                       valid, record_count, last_id, last_checked
+                FROM machine_registry
+            """
+            ):
+                self._entries[row[0]] = {
+                    "db_path": row[1],
+                    "signature": tuple(row[2:6]),
+                    "valid": bool(row[6]),
+                    "record_count": row[7],
+                    "last_id": row[8],
+                    "last_checked": row[9],
+                }
+            state = conn.execute(
+                "SELECT value FROM registry_state WHERE key = 'machines_dir_mtime_ns'"
+            ).fetchone()
+            self._dir_mtime = state[0] if state else None
+
+    @staticmethod
+    def file_signature(db_path: str) -> Optional[Tuple[int, int, int, int]]:
+        """(size, mtime_ns) of a database and of its -wal file; None if it is gone"""
+        try:
+            stat = os.stat(db_path)
+        except OSError:
+            return None
+        try:
+            wal = os.stat(db_path + "-wal")
+            wal_signature = (wal.st_size, wal.st_mtime_ns)
+        except OSError:
+            wal_signature = (0, 0)
+        return (stat.st_size, stat.st_mtime_ns) + wal_signature
+
+    def _scan_directory(self) -> Dict[str, str]:
+        """machine_id -> path of every machine database file in the directory"""
+        databases = {}
+        with os.scandir(self.machines_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(self.FILE_PREFIX) and name.endswith(self.FILE_SUFFIX) and entry.is_file():
+                    databases[name[len(self.FILE_PREFIX):-len(self.FILE_SUFFIX)]] = entry.path
+        return databases
+
+    def _inspect(self, db_path: str, entry: Optional[Dict]) -> Tuple[bool, int, int]:
+        """Validate a machine database and bring its record counter up to date
+
+        Returns:
+            (valid, record_count, last_id)
+        """
+        record_count = entry["record_count"] if entry and entry["valid"] else 0
+        last_id = entry["last_id"] if entry and entry["valid"] else 0
+
+        with closing(sqlite3.connect(db_path, timeout=self.timeout)) as conn:
+            if not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='water_logs'"
+            ).fetchone():
+                return False, 0, 0
+
+            max_id = conn.execute("SELECT MAX(id) FROM water_logs").fetchone()[0] or 0
+            if max_id < last_id:
+                # Rows were removed from the end (e.g. a restored copy): count again
+                record_count, last_id = 0, 0
+            if max_id > last_id:
+                record_count += conn.execute(
+                    "SELECT COUNT(*) FROM water_logs WHERE id > ? AND id <= ?", (last_id, max_id)
+                ).fetchone()[0]
+            return True, record_count, max_id
+
+    def refresh(self) -> List[str]:
+        """Bring the registry up to date with the machine databases on disk
+
+        Returns:
+            Sorted ids of the machines with a valid database
+        """
+        with self._lock:
+            try:
+                dir_mtime = os.stat(self.machines_dir).st_mtime_ns
+            except OSError:
+                dir_mtime = None
+
+            if dir_mtime is None:
+                candidates = {}
+            elif dir_mtime == self._dir_mtime:
+                # No file was added, removed or renamed
+                candidates = {machine_id: entry["db_path"] for machine_id, entry in self._entries.items()}
+            else:
+                candidates = self._scan_directory()
+
+            changed = {}
+            removed = [machine_id for machine_id in self._entries if machine_id not in candidates]
+            for machine_id, db_path in candidates.items():
+                entry = self._entries.get(machine_id)
+                signature = self.file_signature(db_path)
+                if signature is None:
+                    removed.append(machine_id)
+                    continue
+                if entry and entry["db_path"] == db_path and entry["signature"] == signature:
+                    continue
+
+                try:
+                    valid, record_count, last_id = self._inspect(db_path, entry)
+                except Exception as e:
+                    print(f"Warning: Could not validate database for machine {machine_id}: {e}")
+                    valid, record_count, last_id = False, 0, 0
+                changed[machine_id] = {
+                    "db_path": db_path,
+                    # Taken after the inspection: closing the last connection
+                    # to a WAL database checkpoints it and changes the files
+                    "signature": self.file_signature(db_path) or signature,
+                    "valid": valid,
+                    "record_count": record_count,
+                    "last_id": last_id,
+                    "last_checked": datetime.now().isoformat(sep=" ", timespec="seconds"),
+                }
+
+            for machine_id in removed:
+                self._entries.pop(machine_id, None)
+            self._entries.update(changed)
+            if changed or removed or dir_mtime != self._dir_mtime:
+                self._dir_mtime = dir_mtime
+                self._save(changed, removed)
+
+            return sorted(machine_id for machine_id, entry in self._entries.items() if entry["valid"])
+
+    def _save(self, changed: Dict[str, Dict], removed: List[str]):
+        """Persist changed entries and the directory mtime"""
+        try:
+            with closing(self._connect_catalog()) as conn, conn:
+                conn.executemany("DELETE FROM machine_registry WHERE machine_id = ?",
+                                 [(machine_id,) for machine_id in removed])
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO machine_registry
+                    (machine_id, db_path, file_size, file_mtime_ns, wal_size, wal_mtime_ns,
+                     valid, record_count, last_id, last_checked)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (machine_id, entry["db_path"], *entry["signature"], int(entry["valid"]),
+                         entry["record_count"], entry["last_id"], entry["last_checked"])
+                        for machine_id, entry in changed.items()
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO registry_state (key, value) VALUES ('machines_dir_mtime_ns', ?)",
+                    (self._dir_mtime,),
+                )
+        except Exception as e:
+            print(f"Warning: Could not save machine registry: {e}")
+
+    def get(self, machine_id: str) -> Optional[Dict]:
+        """Registry entry of a machine (db_path, record_count, valid, last_checked)"""
+        with self._lock:
+            entry = self._entries.get(machine_id)
+            return dict(entry) if entry else None
+
+    def invalidate(self, machine_id: Optional[str] = None):
+        """Forget a machine (or all of them) so the next refresh inspects it from scratch"""
+        with self._lock:
+            removed = [machine_id] if machine_id else list(self._entries)
+            for removed_id in removed:
+                self._entries.pop(removed_id, None)
+            self._dir_mtime = None
+            self._save({}, removed)
@@ -584,6 +584,18 @@ class HALogApp:
                         delay *= 2  # Exponential backoff
                 return None
 
+            def run_db_write(self, operation, *args, **kwargs):
+                """Run a database write on the write queue, keeping the UI responsive until it is done"""
+                if not hasattr(self.db, 'submit_write'):
+                    return operation(*args, **kwargs)
+                from concurrent.futures import wait
+
+                future = self.db.submit_write(operation, *args, **kwargs)
+                while not future.done():
+                    QtWidgets.QApplication.processEvents()
+                    wait([future], timeout=0.02)
+                return future.result()
+
             def apply_professional_styles(self):
                 """Apply comprehensive professional styling with VISIBLE MENU BAR"""
                 material_stylesheet = """
@@ -1219,8 +1231,9 @@ class HALogApp:
             def refresh_trend_tab(self, group_name):
                 """Refresh trend data for specific parameter group - SIMPLIFIED as requested"""
                 try:
-                    # Ensure full data is loaded for trend analysis
-                    self._ensure_full_data_loaded()
+                    # Ensure full data is loaded for trend analysis (not for a time window slice)
+                    if not getattr(self, '_trend_window_active', False):
+                        self._ensure_full_data_loaded()
                     
                     # Check if we have any data available in the database
                     if not hasattr(self, 'df') or self.df.empty:
@@ -1456,8 +1469,14 @@ class HALogApp:
                 try:
                     print(f"📅 Applying {time_scale} filter to {group_name} trends")
                     
-                    # Filter data based on time scale
-                    if hasattr(self, 'df') and not self.df.empty:
+                    # Query only the window from the database
+                    if hasattr(self, 'db') and hasattr(self.db, 'get_window_slice'):
+                        window_df = self.db.get_window_slice(
+                            time_scale, serial_numbers=self._selected_trend_serials()
+                        )
+                        self._refresh_trend_window(group_name, window_df)
+                        print(f"✓ Time filter applied: {len(window_df)} records for {time_scale}")
+                    elif hasattr(self, 'df') and not self.df.empty:
                         # Save original data if not already saved
                         if not hasattr(self, '_original_df'):
                             self._original_df = self.df.copy()
@@ -1484,6 +1503,25 @@ class HALogApp:
                     import traceback
                     traceback.print_exc()
             
+            def _selected_trend_serials(self):
+                """Serial numbers of the selected machines, or None for all machines"""
+                if hasattr(self, 'machine_manager'):
+                    selected = self.machine_manager.get_selected_machines()
+                    if selected and self.machine_manager.get_selected_machine() != "All Machines":
+                        return selected
+                return None
+
+            def _refresh_trend_window(self, group_name, window_df):
+                """Refresh a trend group from a time window slice instead of the full dataset"""
+                original_df = getattr(self, 'df', pd.DataFrame())
+                self._trend_window_active = True
+                self.df = window_df
+                try:
+                    self.refresh_trend_tab(group_name)
+                finally:
+                    self.df = original_df
+                    self._trend_window_active = False
+
             def _filter_data_by_time_scale(self, df, time_scale):
                 """Filter dataframe by time scale"""
                 try:
@@ -1589,7 +1627,13 @@ class HALogApp:
                 try:
                     print(f"📅 Applying custom time filter to {group_name}: {start_time} to {end_time}")
                     
-                    if hasattr(self, 'df') and not self.df.empty:
+                    if hasattr(self, 'db') and hasattr(self.db, 'get_window_slice'):
+                        window_df = self.db.get_window_slice(
+                            serial_numbers=self._selected_trend_serials(), start=start_time, end=end_time
+                        )
+                        self._refresh_trend_window(group_name, window_df)
+                        print(f"✓ Custom time filter applied: {len(window_df)} records")
+                    elif hasattr(self, 'df') and not self.df.empty:
                         # Save original data if not already saved
                         if not hasattr(self, '_original_df'):
                             self._original_df = self.df.copy()
@@ -2328,7 +2372,7 @@ Source: {result.get('source', 'unknown')} database
                             return
 
                         # Clear the database
-                        self.db.clear_all()
+                        self.run_db_write(self.db.clear_all)
 
                         # Clear UI data
                         import pandas as pd
@@ -2379,7 +2423,7 @@ Source: {result.get('source', 'unknown')} database
                     QtWidgets.QApplication.processEvents()
 
                     # Optimize database
-                    self.db.vacuum_database()
+                    self.run_db_write(self.db.vacuum_database)
 
                     progress.setValue(75)
                     progress.setLabelText("Applying reading optimizations...")
@@ -3199,17 +3243,31 @@ Source: {result.get('source', 'unknown')} database
                         serial = self.ui.comboTrendSerial.currentText()
                         param = self.ui.comboTrendParam.currentText()
 
-                        if serial == "All" and param == "All":
-                            df_trend = self.df
-                        else:
-                            import numpy as np
+                        df_trend = None
+                        if param and param != "All" and "datetime" in self.df.columns \
+                                and hasattr(self.db, "get_trend_series"):
+                            # Pre-aggregated rollups for the loaded time range
+                            df_trend = self.db.get_trend_series(
+                                serial_number=serial if serial and serial != "All" else None,
+                                parameter_type=param,
+                                start=self.df["datetime"].min(),
+                                end=self.df["datetime"].max(),
+                            )
+                            print(f"✓ Trend for {param}: {len(df_trend):,} points "
+                                  f"({df_trend.attrs.get('resolution', 'raw')} resolution)")
+
+                        if df_trend is None or df_trend.empty:
+                            if serial == "All" and param == "All":
+                                df_trend = self.df
+                            else:
+                                import numpy as np
 
-                            mask = np.ones(len(self.df), dtype=bool)
-                            if serial and serial != "All":
-                                mask &= self.df["serial"] == serial
-                            if param and param != "All":
-                                mask &= self.df["param"] == param
-                            df_trend = self.df[mask]
+                                mask = np.ones(len(self.df), dtype=bool)
+                                if serial and serial != "All":
+                                    mask &= self.df["serial"] == serial
+                                if param and param != "All":
+                                    mask &= self.df["param"] == param
+                                df_trend = self.df[mask]
 
                         from utils_plot import plot_trend
 
@@ -3506,14 +3564,6 @@ Source: {result.get('source', 'unknown')} database
                         except Exception as ve:
                             print(f"Warning: Could not store validation log: {ve}")
                     
-                    # Insert file metadata
-                    self._store_file_metadata_for_machine(
-                        filename=os.path.basename(file_path),
-                        file_size=os.path.getsize(file_path),
-                        records_imported=records_inserted,
-                        df=df
-                    )
-                    
                     return records_inserted
                     
                 except Exception as e:
@@ -3540,42 +3590,45 @@ Source: {result.get('source', 'unknown')} database
                     print(f"Error detecting machine ID: {e}")
                     return None
 
+            def _machine_import_router(self, commit_rows=50000):
+                """Router splitting imported data by serial number into the machine databases
+
+                Args:
+                    commit_rows: Rows per machine database transaction (None: one transaction)
+                """
+                from machine_import_router import MachineImportRouter
+                single_machine_db = getattr(self.machine_manager, 'single_machine_db', None)
+                if not single_machine_db:
+                    print("⚠️  Single-machine architecture not available, using combined database")
+                return MachineImportRouter(single_machine_db, fallback_db=self.db, commit_rows=commit_rows)
+
+            def _switch_to_imported_machine(self, router):
+                """Make the machine that received most of an import the current machine"""
+                machine_id = router.primary_machine
+                if machine_id:
+                    self.machine_manager.single_machine_db.switch_to_machine(machine_id)
+
             def _route_data_to_machine_database(self, df, file_path):
-                """Route data to appropriate machine database or fallback to combined database"""
+                """Route data to the databases of the machines it contains (rows without a serial go to the combined database)
+
+                Also stores the file metadata in every database that received records.
+                The machine databases are written in one transaction each, so a failure
+                leaves them unchanged before the data falls back to the combined database.
+                """
                 try:
-                    # Detect machine ID
-                    machine_id = self._detect_machine_id(df)
-                    
-                    if machine_id and hasattr(self.machine_manager, 'single_machine_db') and \
-                       self.machine_manager.single_machine_db:
-                        
-                        print(f"🎯 Detected machine {machine_id}, routing to single-machine database")
-                        
-                        # Create machine database if it doesn't exist
-                        if not self.machine_manager.single_machine_db.create_machine_database(machine_id):
-                            print(f"⚠️  Failed to create database for machine {machine_id}, using combined database")
-                            return self.db.insert_data_batch(df)
-                        
-                        # Switch to machine database and insert data
-                        if self.machine_manager.single_machine_db.switch_to_machine(machine_id):
-                            records_inserted = self.machine_manager.single_machine_db.insert_data_batch(df)
-                            print(f"✅ Inserted {records_inserted} records into machine {machine_id} database")
-                            return records_inserted
-                        else:
-                            print(f"⚠️  Failed to switch to machine {machine_id} database, using combined database")
-                            return self.db.insert_data_batch(df)
-                    
-                    else:
-                        # No machine ID detected or single-machine architecture not available
-                        if not machine_id:
-                            print("⚠️  No machine ID detected, using combined database")
-                        else:
-                            print("⚠️  Single-machine architecture not available, using combined database")
-                        return self.db.insert_data_batch(df)
+                    with self._machine_import_router(commit_rows=None) as router:
+                        router.route(df)
+                        router.record_file(os.path.basename(file_path), os.path.getsize(file_path))
+
+                    for machine_id, count in sorted(router.record_counts.items()):
+                        print(f"✅ Inserted {count} records into machine {machine_id} database")
+                    self._switch_to_imported_machine(router)
+                    return router.total_records
                         
                 except Exception as e:
                     print(f"Error routing data to machine database: {e}")
-                    # Fallback to combined database
+                    # Machine writes were rolled back; rows already sent to the
+                    # combined database are skipped there (natural-key index)
                     return self.db.insert_data_batch(df)
 
             def _store_validation_log_for_machine(self, filename, validation_summary, validation_report, df):
@@ -3606,47 +3659,12 @@ Source: {result.get('source', 'unknown')} database
                         print(f"✅ Stored validation log in machine {machine_id} database")
                     else:
                         # Store in combined database
-                        self.db.insert_validation_log(filename, validation_summary, validation_report)
+                        self.db.submit_write(self.db.insert_validation_log, filename, validation_summary,
+                                             validation_report, coalesce=True)
                         
                 except Exception as e:
                     print(f"Warning: Could not store validation log for machine: {e}")
 
-            def _store_file_metadata_for_machine(self, filename, file_size, records_imported, df):
-                """Store file metadata in appropriate database (machine-specific or combined)"""
-                try:
-                    machine_id = self._detect_machine_id(df)
-                    
-                    if machine_id and hasattr(self.machine_manager, 'single_machine_db') and \
-                       self.machine_manager.single_machine_db and \
-                       self.machine_manager.single_machine_db.current_machine_id == machine_id:
-                        
-                        # Store in machine-specific database
-                        with self.machine_manager.single_machine_db.get_connection() as conn:
-                            conn.execute("""
-                                INSERT INTO file_metadata (
-                                    filename, file_size, records_imported, 
-                                    processing_status, machine_serial
-                                ) VALUES (?, ?, ?, ?, ?)
-                            """, (
-                                filename,
-                                file_size,
-                                records_imported,
-                                'completed',
-                                machine_id
-                            ))
-                        print(f"✅ Stored file metadata in machine {machine_id} database")
-                    else:
-                        # Store in combined database
-                        self.db.insert_file_metadata(
-                            filename=filename,
-                            file_size=file_size,
-                            records_imported=records_imported,
-                            parsing_stats="{}",
-                        )
-                        
-                except Exception as e:
-                    print(f"Warning: Could not store file metadata for machine: {e}")
-
             def _import_large_file_single(self, file_path, file_size):
                 """Import single large log file with checkpoint recovery and error handling"""
                 checkpoint_id = None
@@ -3678,36 +3696,55 @@ Source: {result.get('source', 'unknown')} database
                                 if self.error_manager:
                                     self.error_manager.logger.info(f"Resuming import from checkpoint: {latest_checkpoint.checkpoint_id}")
                     
-                    # Enable validation for large files too
-                    df = parser.parse_linac_file(file_path, chunk_size=5000, enable_validation=True)
-                    
-                    if df.empty:
-                        print(f"No valid data found in {os.path.basename(file_path)}")
-                        return 0
-                    
-                    print(f"✓ Data cleaned: {len(df)} records ready for database")
-                    
-                    # Create checkpoint before database insertion
+                    # Create checkpoint before database insertion (parsing and
+                    # insertion are a single streaming pass below)
                     if self.import_recovery:
                         try:
                             checkpoint_id = self.import_recovery.create_checkpoint(
                                 file_path=file_path,
-                                records_processed=len(df),
+                                records_processed=0,
                                 additional_data={'file_size': file_size, 'parser_type': 'large_file_single'}
                             )
                             print(f"✓ Checkpoint created: {checkpoint_id}")
                         except Exception as cp_error:
                             print(f"Warning: Could not create checkpoint: {cp_error}")
                     
+                    # Enable validation for large files too: every parsed chunk is
+                    # validated before it is routed
+                    validator = None
+                    try:
+                        from data_validator import DataValidator
+                        validator = DataValidator(parser.parameter_mapping)
+                    except ImportError as e:
+                        print(f"⚠️ Could not import DataValidator: {e}")
+                    chunk_count = [0]
+                    
+                    def validate_chunk(chunk):
+                        if validator:
+                            validator.validate_chunk(chunk, chunk_count[0])
+                        chunk_count[0] += 1
+                    
                     # Insert data in optimized batches with timing
                     import time
                     start_time = time.time()
                     
-                    # Use machine-specific routing instead of direct database insertion
-                    records_inserted = self._route_data_to_machine_database(df, file_path)
+                    # Parse and split by serial number in one pass: each chunk goes
+                    # to the machine databases it contains as soon as it is parsed
+                    with self._machine_import_router() as router:
+                        router.import_file(parser, file_path, chunk_size=5000, chunk_callback=validate_chunk)
+                        router.record_file(os.path.basename(file_path), file_size)
+                    records_inserted = router.total_records
+                    self._switch_to_imported_machine(router)
                     
                     end_time = time.time()
                     
+                    if records_inserted == 0:
+                        print(f"No valid data found in {os.path.basename(file_path)}")
+                        return 0
+                    
+                    if validator:
+                        parser.parsing_stats['validation_summary'] = validator.get_validation_summary()
+                    
                     # Calculate and display performance metrics
                     duration = end_time - start_time
                     records_per_sec = records_inserted / duration if duration > 0 else 0
@@ -3730,10 +3767,12 @@ Source: {result.get('source', 'unknown')} database
                             })
                             validation_report = dummy_validator.export_validation_report()
                             
-                            self.db.insert_validation_log(
+                            self.db.submit_write(
+                                self.db.insert_validation_log,
                                 os.path.basename(file_path), 
                                 validation_summary, 
-                                validation_report
+                                validation_report,
+                                coalesce=True,
                             )
                         except Exception as ve:
                             if self.error_manager:
@@ -3742,32 +3781,6 @@ Source: {result.get('source', 'unknown')} database
                                     show_dialog=False)
                             print(f"Warning: Could not store validation log: {ve}")
                     
-                    # Insert file metadata with error handling
-                    try:
-                        filename = os.path.basename(file_path)
-                        parsing_stats_json = "{}"
-                        if self.safe_get_attribute('db_resilience', True):
-                            self.execute_with_retry(
-                                self.db.insert_file_metadata,
-                                filename=filename,
-                                file_size=file_size,
-                                records_imported=records_inserted,
-                                parsing_stats=parsing_stats_json
-                            )
-                        else:
-                            self.db.insert_file_metadata(
-                                filename=filename,
-                                file_size=file_size,
-                                records_imported=records_inserted,
-                                parsing_stats=parsing_stats_json,
-                            )
-                    except Exception as metadata_error:
-                        if self.error_manager:
-                            self.error_manager.handle_error(metadata_error,
-                                context={'operation': 'file_metadata_insert', 'file': file_path},
-                                show_dialog=False)
-                        print(f"Warning: Could not insert file metadata: {metadata_error}")
-                    
                     # Clean up checkpoint on successful completion
                     if checkpoint_id and self.import_recovery:
                         try:
@@ -3846,11 +3859,13 @@ Source: {result.get('source', 'unknown')} database
                     filename = os.path.basename(file_path)
                     parsing_stats_json = "{}"
 
-                    self.db.insert_file_metadata(
+                    self.db.submit_write(
+                        self.db.insert_file_metadata,
                         filename=filename,
                         file_size=os.path.getsize(file_path),
                         records_imported=records_inserted,
                         parsing_stats=parsing_stats_json,
+                        coalesce=True,
                     )
 
                     self.progress_dialog.mark_complete()
@@ -4100,11 +4115,13 @@ Source: {result.get('source', 'unknown')} database
                         filename = os.path.basename(file_path) + " (TB/HALfault filtered)"
                         parsing_stats_json = f'{{"filtered_lines": {len(filtered_lines)}, "total_records": {records_inserted}}}'
 
-                        self.db.insert_file_metadata(
+                        self.db.submit_write(
+                            self.db.insert_file_metadata,
                             filename=filename,
                             file_size=len(''.join(filtered_lines)),
                             records_imported=records_inserted,
                             parsing_stats=parsing_stats_json,
+                            coalesce=True,
                         )
 
                         progress_dialog.setValue(100)
@@ -4204,11 +4221,13 @@ Source: {result.get('source', 'unknown')} database
                         filename = os.path.basename(file_path) + " (TB/HALfault filtered)"
                         parsing_stats_json = f'{{"filtered_lines": {len(filtered_lines)}, "total_records": {records_inserted}}}'
 
-                        self.db.insert_file_metadata(
+                        self.db.submit_write(
+                            self.db.insert_file_metadata,
                             filename=filename,
                             file_size=len(''.join(filtered_lines)),
                             records_imported=records_inserted,
                             parsing_stats=parsing_stats_json,
+                            coalesce=True,
                         )
 
                         self.progress_dialog.setValue(100)
@@ -4261,7 +4280,7 @@ Source: {result.get('source', 'unknown')} database
                         progress_dialog.show()
                         QtWidgets.QApplication.processEvents()
 
-                        self.db.clear_all()
+                        self.run_db_write(self.db.clear_all)
 
                         progress_dialog.setValue(50)
                         QtWidgets.QApplication.processEvents()
@@ -4882,6 +4901,10 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the parser's process pool in frozen (PyInstaller) builds
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     print("🔥 HALog Starting...")
 
     try:
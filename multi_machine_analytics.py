@@ -27,6 +27,11 @@ class MultiMachineAnalyzer:
     def calculate_machine_rankings(self, data_dict: Dict[str, pd.DataFrame], parameters: List[str]) -> pd.DataFrame:
         """Calculate machine performance rankings based on multiple parameters
         
+        All machines are scored together: the readings of the ranked parameters
+        are gathered into one frame and every (machine, parameter) score comes
+        from one grouped aggregation instead of filtering each machine's data
+        per parameter.
+        
         Args:
             data_dict: Dictionary mapping machine IDs to their data
             parameters: List of parameters to use for ranking
@@ -38,67 +43,45 @@ class MultiMachineAnalyzer:
             if not data_dict or not parameters:
                 return pd.DataFrame()
             
-            ranking_data = []
-            
-            for machine_id, machine_data in data_dict.items():
-                if machine_data.empty:
-                    continue
-                
-                machine_scores = {
-                    'machine_id': machine_id,
-                    'total_score': 0.0,
-                    'data_quality_score': 0.0,
-                    'completeness_score': 0.0,
-                    'stability_score': 0.0,
-                    'parameter_scores': {}
-                }
-                
-                valid_parameters = 0
-                total_parameter_score = 0.0
-                
-                for parameter in parameters:
-                    # Filter data for this parameter
-                    param_data = machine_data[
-                        machine_data.get('parameter_type', machine_data.get('param', pd.Series())) == parameter
-                    ]
-                    
-                    if param_data.empty:
-                        continue
-                    
-                    # Calculate parameter-specific scores
-                    param_score = self._calculate_parameter_score(param_data)
-                    machine_scores['parameter_scores'][parameter] = param_score
-                    total_parameter_score += param_score
-                    valid_parameters += 1
-                
-                if valid_parameters > 0:
-                    # Data quality score (based on completeness and validity)
-                    machine_scores['data_quality_score'] = self._calculate_data_quality_score(machine_data)
-                    
-                    # Completeness score (based on parameter coverage)
-                    machine_scores['completeness_score'] = valid_parameters / len(parameters)
-                    
-                    # Stability score (based on data consistency)
-                    machine_scores['stability_score'] = self._calculate_stability_score(machine_data)
-                    
-                    # Total score (weighted combination)
-                    machine_scores['total_score'] = (
-                        0.4 * (total_parameter_score / valid_parameters) +
-                        0.3 * machine_scores['data_quality_score'] +
-                        0.2 * machine_scores['completeness_score'] +
-                        0.1 * machine_scores['stability_score']
-                    )
-                
-                ranking_data.append(machine_scores)
-            
-            # Convert to DataFrame and rank
-            if ranking_data:
-                rankings_df = pd.DataFrame(ranking_data)
-                rankings_df = rankings_df.sort_values('total_score', ascending=False).reset_index(drop=True)
-                rankings_df['rank'] = range(1, len(rankings_df) + 1)
-                return rankings_df
-            else:
+            machine_ids = [machine_id for machine_id, machine_data in data_dict.items() if not machine_data.empty]
+            if not machine_ids:
                 return pd.DataFrame()
+            
+            unique_parameters = list(dict.fromkeys(parameters))
+            readings, machines, gaps = self._collect_ranking_data(data_dict, machine_ids, unique_parameters)
+            
+            # machine x parameter scores; repeated entries of parameters count repeatedly
+            score_rows = self._calculate_parameter_scores(readings, machines['has_value'].to_numpy()).reindex(
+                index=range(len(machine_ids)), columns=range(len(unique_parameters))
+            ).to_numpy()
+            repeats = np.array([parameters.count(parameter) for parameter in unique_parameters])
+            valid_parameters = (~np.isnan(score_rows) * repeats).sum(axis=1)
+            mean_parameter_score = (np.nan_to_num(score_rows) * repeats).sum(axis=1) / np.maximum(valid_parameters, 1)
+            
+            scored = valid_parameters > 0
+            data_quality = np.where(scored, self._calculate_data_quality_scores(machines), 0.0)
+            completeness = valid_parameters / len(parameters)
+            stability = np.where(scored, self._calculate_stability_scores(gaps, len(machine_ids)), 0.0)
+            total = np.where(
+                scored,
+                0.4 * mean_parameter_score + 0.3 * data_quality + 0.2 * completeness + 0.1 * stability,
+                0.0
+            )
+            
+            rankings_df = pd.DataFrame({
+                'machine_id': machine_ids,
+                'total_score': total,
+                'data_quality_score': data_quality,
+                'completeness_score': completeness,
+                'stability_score': stability,
+                'parameter_scores': [
+                    {parameter: float(score) for parameter, score in zip(unique_parameters, row) if not np.isnan(score)}
+                    for row in score_rows
+                ]
+            })
+            rankings_df = rankings_df.sort_values('total_score', ascending=False).reset_index(drop=True)
+            rankings_df['rank'] = range(1, len(rankings_df) + 1)
+            return rankings_df
                 
         except Exception as e:
             print(f"Error calculating machine rankings: {e}")
@@ -345,99 +328,211 @@ class MultiMachineAnalyzer:
             print(f"Error calculating fleet statistics: {e}")
             return {'error': str(e)}
     
-    def _calculate_parameter_score(self, param_data: pd.DataFrame) -> float:
-        """Calculate a quality score for a parameter's data"""
+    def calculate_federated_fleet_statistics(self, fleet_view=None, statistic_type: str = 'avg',
+                                             percentiles: Tuple[float, ...] = (0.25, 0.5, 0.75)) -> Dict[str, Any]:
+        """Calculate fleet-wide statistics inside SQLite over the machine databases
+        
+        Unlike calculate_fleet_statistics, no machine data is loaded into
+        pandas; only per-machine and per-parameter aggregates come back.
+        
+        Args:
+            fleet_view: FederatedFleetView over the machine databases (default:
+                the database manager's get_federated_view())
+            statistic_type: Statistic rows to aggregate ('avg', 'min', 'max')
+            percentiles: Quantiles reported per parameter
+            
+        Returns:
+            Dictionary with fleet_summary, machine_contributions,
+            parameter_coverage and parameter_statistics (one record per parameter)
+        """
         try:
-            if param_data.empty:
-                return 0.0
+            fleet_stats = {
+                'fleet_summary': {},
+                'machine_contributions': {},
+                'parameter_coverage': {},
+                'parameter_statistics': []
+            }
             
-            score = 0.0
+            if fleet_view is None:
+                if not hasattr(self.db, 'get_federated_view'):
+                    return {'error': 'No machine databases available'}
+                fleet_view = self.db.get_federated_view()
             
-            # Data completeness (non-null values)
-            if 'value' in param_data.columns:
-                completeness = param_data['value'].notna().sum() / len(param_data)
-                score += 0.3 * completeness
+            machines = fleet_view.machine_summary()
+            if machines.empty:
+                return fleet_stats
             
-            # Data consistency (low coefficient of variation)
-            if 'value' in param_data.columns:
-                values = param_data['value'].dropna()
-                if len(values) > 1 and values.std() > 0:
-                    cv = values.std() / abs(values.mean()) if values.mean() != 0 else 1
-                    consistency = max(0, 1 - min(cv, 1))  # Cap CV at 1 for scoring
-                    score += 0.4 * consistency
-                else:
-                    score += 0.2  # Some points for having data, less for no variation
+            # Fleet summary
+            total_records = int(machines['record_count'].sum())
+            active = machines[machines['record_count'] > 0]
+            fleet_stats['fleet_summary'] = {
+                'total_machines': len(machines),
+                'active_machines': len(active),
+                'inactive_machines': len(machines) - len(active),
+                'total_records': total_records,
+                'average_records_per_machine': total_records / len(active) if len(active) > 0 else 0,
+                'date_range': (machines['start_date'].min(), machines['end_date'].max())
+            }
             
-            # Data volume (more data points = higher score)
-            volume_score = min(len(param_data) / 1000, 1.0)  # Cap at 1000 records
-            score += 0.3 * volume_score
+            # Machine contributions
+            for row in active.itertuples(index=False):
+                fleet_stats['machine_contributions'][row.machine_id] = {
+                    'record_count': int(row.record_count),
+                    'fleet_contribution_percent': row.record_count / total_records * 100,
+                    'parameters_monitored': int(row.parameter_count)
+                }
             
-            return min(score, 1.0)  # Cap at 1.0
+            # Parameter coverage
+            pairs = fleet_view.machine_parameters()
+            all_parameters = set(pairs['parameter_type'])
+            fleet_stats['parameter_coverage'] = {
+                'total_parameters': len(all_parameters),
+                'parameters_list': sorted(all_parameters),
+                'coverage_by_machine': {}
+            }
+            for machine_id, machine_pairs in pairs.groupby('machine_id'):
+                params = set(machine_pairs['parameter_type'])
+                fleet_stats['parameter_coverage']['coverage_by_machine'][machine_id] = {
+                    'parameters_count': len(params),
+                    'coverage_percent': len(params) / len(all_parameters) * 100,
+                    'missing_parameters': sorted(all_parameters - params)
+                }
             
-        except Exception:
-            return 0.0
-    
-    def _calculate_data_quality_score(self, machine_data: pd.DataFrame) -> float:
-        """Calculate overall data quality score for a machine"""
-        try:
-            if machine_data.empty:
-                return 0.0
+            # Per-parameter distribution across the whole fleet
+            parameter_stats = fleet_view.parameter_statistics(statistic_type=statistic_type,
+                                                              percentiles=percentiles)
+            fleet_stats['parameter_statistics'] = parameter_stats.to_dict('records')
             
-            score = 0.0
+            return fleet_stats
             
-            # Missing data ratio
-            total_cells = machine_data.size
-            non_null_cells = machine_data.count().sum()
-            completeness = non_null_cells / total_cells if total_cells > 0 else 0
-            score += 0.5 * completeness
+        except Exception as e:
+            print(f"Error calculating federated fleet statistics: {e}")
+            return {'error': str(e)}
+    
+    @staticmethod
+    def _parameter_column(machine_data: pd.DataFrame) -> Optional[str]:
+        """Name of the parameter column of a machine's data"""
+        for column in ('parameter_type', 'param'):
+            if column in machine_data.columns:
+                return column
+        return None
+    
+    def _collect_ranking_data(self, data_dict: Dict[str, pd.DataFrame], machine_ids: List[str],
+                              parameters: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Gather what the ranking scores need in one pass over each machine's data
+        
+        Machines and parameters are referred to by their position in
+        machine_ids and parameters.
+        
+        Returns:
+            (readings: machine, parameter, value of the ranked parameters;
+             machines: has_value, completeness, parameter_count, latest, datetime_status
+             (0 no datetime column, 1 unparsable, 2 parsed);
+             gaps: machine, gap in ns between consecutive sorted timestamps)
+        """
+        parameter_index = pd.Index(parameters)
+        readings, machines, gaps = [], [], []
+        for position, machine_id in enumerate(machine_ids):
+            machine_data = data_dict[machine_id]
+            machine = {
+                'has_value': 'value' in machine_data.columns,
+                'completeness': machine_data.count().sum() / machine_data.size,
+                'parameter_count': 0,
+                'latest': np.datetime64('NaT', 'ns'),
+                'datetime_status': 0
+            }
+            
+            param_col = self._parameter_column(machine_data)
+            if param_col:
+                codes, uniques = pd.factorize(machine_data[param_col])
+                machine['parameter_count'] = len(uniques)
+                # Missing values (code -1) map to the trailing -1
+                parameter = np.append(parameter_index.get_indexer(uniques), -1)[codes]
+                ranked = parameter >= 0
+                values = pd.to_numeric(machine_data['value'], errors='coerce').to_numpy(dtype=float)[ranked] \
+                    if machine['has_value'] else np.full(int(ranked.sum()), np.nan)
+                readings.append((np.full(len(values), position), parameter[ranked], values))
             
-            # Data freshness (if datetime column exists)
             if 'datetime' in machine_data.columns:
                 try:
-                    latest_date = pd.to_datetime(machine_data['datetime']).max()
-                    days_old = (pd.Timestamp.now() - latest_date).days
-                    freshness = max(0, 1 - days_old / 30)  # Decay over 30 days
-                    score += 0.3 * freshness
-                except:
-                    score += 0.1  # Some credit for having datetime column
-            
-            # Parameter diversity
-            param_col = 'parameter_type' if 'parameter_type' in machine_data.columns else 'param'
-            if param_col in machine_data.columns:
-                unique_params = machine_data[param_col].nunique()
-                diversity = min(unique_params / 20, 1.0)  # Normalize to 20 parameters
-                score += 0.2 * diversity
-            
-            return min(score, 1.0)
-            
-        except Exception:
-            return 0.0
+                    timestamps = machine_data['datetime']
+                    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                        timestamps = pd.to_datetime(timestamps)
+                    ns = np.sort(timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64))
+                    ns = ns[ns != np.iinfo(np.int64).min]  # NaT
+                    if len(ns):
+                        machine['latest'] = ns[-1].view('datetime64[ns]')
+                        gaps.append((np.full(len(ns) - 1, position), np.diff(ns).astype(float)))
+                    machine['datetime_status'] = 2
+                except Exception:
+                    machine['datetime_status'] = 1
+            machines.append(machine)
+        
+        def stack(parts, columns):
+            return pd.DataFrame({
+                column: np.concatenate([part[i] for part in parts]) if parts else np.array([])
+                for i, column in enumerate(columns)
+            })
+        
+        return stack(readings, ['machine', 'parameter', 'value']), pd.DataFrame(machines), stack(gaps, ['machine', 'gap'])
     
-    def _calculate_stability_score(self, machine_data: pd.DataFrame) -> float:
-        """Calculate stability score based on data consistency over time"""
-        try:
-            if machine_data.empty or 'datetime' not in machine_data.columns:
-                return 0.5  # Neutral score if no temporal data
-            
-            # Check for consistent data collection over time
-            try:
-                machine_data['datetime'] = pd.to_datetime(machine_data['datetime'])
-                machine_data = machine_data.sort_values('datetime')
-                
-                # Calculate gaps in data collection
-                time_diffs = machine_data['datetime'].diff().dropna()
-                if len(time_diffs) > 0:
-                    median_gap = time_diffs.median()
-                    gap_consistency = 1 - (time_diffs.std() / median_gap if median_gap.total_seconds() > 0 else 1)
-                    return max(0, min(gap_consistency, 1.0))
-                
-            except:
-                pass
-            
-            return 0.5  # Default neutral score
-            
-        except Exception:
-            return 0.5
+    def _calculate_parameter_scores(self, readings: pd.DataFrame, has_value: np.ndarray) -> pd.DataFrame:
+        """Quality score of every (machine, parameter) from one grouped aggregation
+        
+        Per parameter: completeness of the values (0.3), consistency as a low
+        coefficient of variation (0.4, or 0.2 without variation) and data
+        volume capped at 1000 records (0.3).
+        
+        Returns:
+            DataFrame indexed by machine with one column per parameter
+        """
+        if readings.empty:
+            return pd.DataFrame()
+        
+        groups = readings.groupby(['machine', 'parameter'], sort=False)['value'].agg(['size', 'count', 'mean', 'std'])
+        rows = groups['size'].to_numpy(dtype=float)
+        values = groups['count'].to_numpy(dtype=float)
+        mean = groups['mean'].to_numpy()
+        std = groups['std'].to_numpy()
+        
+        varies = (values > 1) & (std > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv = np.where(mean != 0, std / np.abs(mean), 1.0)
+        consistency = np.maximum(0.0, 1 - np.minimum(cv, 1.0))
+        value_score = 0.3 * (values / rows) + np.where(varies, 0.4 * consistency, 0.2)
+        
+        machine_has_value = has_value[groups.index.get_level_values('machine').to_numpy(dtype=int)]
+        score = np.where(machine_has_value, value_score, 0.0) + 0.3 * np.minimum(rows / 1000, 1.0)
+        return pd.Series(np.minimum(score, 1.0), index=groups.index).unstack('parameter')
+    
+    def _calculate_data_quality_scores(self, machines: pd.DataFrame) -> np.ndarray:
+        """Data quality score per machine: cell completeness (0.5), freshness
+        decaying over 30 days (0.3) and parameter diversity up to 20 parameters (0.2)"""
+        days_old = (pd.Timestamp.now() - pd.DatetimeIndex(machines['latest'])).days.to_numpy(dtype=float)
+        freshness = np.nan_to_num(np.maximum(0.0, 1 - days_old / 30), nan=0.0)
+        # Unparsable datetime columns get partial credit
+        status = machines['datetime_status'].to_numpy()
+        freshness_score = np.where(status == 2, 0.3 * freshness, np.where(status == 1, 0.1, 0.0))
+        
+        diversity_score = 0.2 * np.minimum(machines['parameter_count'].to_numpy() / 20, 1.0)
+        
+        return np.minimum(0.5 * machines['completeness'].to_numpy() + freshness_score + diversity_score, 1.0)
+    
+    def _calculate_stability_scores(self, gaps: pd.DataFrame, machine_count: int) -> np.ndarray:
+        """Stability score per machine from the regularity of its data collection
+        
+        1 - std/median of the gaps between consecutive timestamps, clipped to
+        [0, 1]; 0.5 (neutral) without temporal data.
+        """
+        stability = np.full(machine_count, 0.5)
+        if gaps.empty:
+            return stability
+        
+        gap_stats = gaps.groupby('machine')['gap'].agg(['median', 'std'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            consistency = np.where(gap_stats['median'] > 0, 1 - gap_stats['std'] / gap_stats['median'], 0.0)
+        stability[gap_stats.index.to_numpy(dtype=int)] = np.nan_to_num(np.clip(consistency, 0.0, 1.0), nan=0.0)
+        return stability
     
     def _calculate_machine_metrics(self, machine_data: pd.DataFrame) -> Dict[str, float]:
         """Calculate key metrics for outlier detection"""
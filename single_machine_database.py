@@ -8,6 +8,9 @@ This module implements:
 - Machine database discovery and management
 - Data migration from combined database to per-machine databases
 - Connection management with single machine context
+- Parallel fleet queries across all machine databases (see fleet_query.py)
+- A federated (ATTACH + UNION ALL) fleet view for aggregations in SQLite
+- Cached machine discovery from a persisted registry (see machine_registry.py)
 
 Developer: HALog Enhancement Team
 Company: gobioeng.com
@@ -24,10 +27,30 @@ import traceback
 from datetime import datetime
 
 from database import DatabaseManager
+from connection_pool import SQLiteConnectionPool
+from fleet_query import FleetQueryExecutor, FederatedFleetView
+from machine_registry import MachineRegistry
+
+
+def _insert_or_ignore(table, conn, keys, data_iter) -> int:
+    """pandas to_sql method that skips readings already stored (see NATURAL_KEY_COLUMNS)"""
+    cursor = conn.executemany(
+        f"INSERT OR IGNORE INTO {table.name} ({', '.join(keys)}) VALUES ({', '.join('?' * len(keys))})",
+        data_iter,
+    )
+    return cursor.rowcount
 
 
 class SingleMachineDatabaseManager:
     """Enhanced database manager with single-machine architecture for better performance"""
+
+    # Smaller cache for single machine databases
+    CONNECTION_PRAGMAS = SQLiteConnectionPool.DEFAULT_PRAGMAS + ["PRAGMA cache_size=10000"]
+
+    # A reading is stored once per machine database; re-imported or repeated
+    # log lines are ignored on insert
+    NATURAL_KEY_INDEX = "idx_water_logs_natural_key"
+    NATURAL_KEY_COLUMNS = ("datetime", "serial_number", "parameter_type", "statistic_type")
     
     def __init__(self, app_data_dir: str = "data"):
         self.app_data_dir = Path(app_data_dir)
@@ -47,6 +70,16 @@ class SingleMachineDatabaseManager:
         
         # Connection pool for comparison mode (machine_id -> connection)
         self.comparison_connections = {}
+
+        # Connection pools per machine database path; idle connections are evicted
+        self.connection_pools = {}
+
+        # Parallel read-only queries across machine databases
+        self.fleet_executor = FleetQueryExecutor()
+
+        # Cached machine discovery, kept outside machines_dir so its writes
+        # do not change the directory mtime it watches
+        self.machine_registry = MachineRegistry(self.machines_dir, self.db_dir / "machine_registry.db")
         
         print("✓ Single Machine Database Manager initialized")
     
@@ -122,44 +155,27 @@ class SingleMachineDatabaseManager:
         return str(self.machines_dir / filename)
     
     def discover_available_machines(self) -> List[str]:
-        """Discover available machines by scanning database files"""
+        """Discover available machines from the machine registry
+
+        Only machine databases whose files changed since the last call are
+        opened (see machine_registry.py); the rest is served from the catalog.
+        """
         machine_ids = []
         
         try:
-            if not self.machines_dir.exists():
-                return machine_ids
-                
-            for db_file in self.machines_dir.glob("halog_machine_*.db"):
-                # Extract machine ID from filename
-                filename = db_file.name
-                if filename.startswith("halog_machine_") and filename.endswith(".db"):
-                    machine_id = filename[14:-3]  # Remove "halog_machine_" and ".db"
-                    
-                    # Verify the database is valid (allow empty databases for now)
-                    try:
-                        with sqlite3.connect(str(db_file)) as conn:
-                            # Check if table exists
-                            cursor = conn.execute("""
-                                SELECT name FROM sqlite_master 
-                                WHERE type='table' AND name='water_logs'
-                            """)
-                            if cursor.fetchone():
-                                cursor = conn.execute("SELECT COUNT(*) FROM water_logs")
-                                record_count = cursor.fetchone()[0]
-                                machine_ids.append(machine_id)
-                                # Cache basic info
-                                self._available_machines_cache[machine_id] = {
-                                    'db_path': str(db_file),
-                                    'record_count': record_count,
-                                    'last_checked': datetime.now()
-                                }
-                    except Exception as e:
-                        print(f"Warning: Could not validate database for machine {machine_id}: {e}")
-                        
+            machine_ids = self.machine_registry.refresh()
+            self._available_machines_cache = {}
+            for machine_id in machine_ids:
+                entry = self.machine_registry.get(machine_id)
+                if entry:
+                    self._available_machines_cache[machine_id] = {
+                        'db_path': entry['db_path'],
+                        'record_count': entry['record_count'],
+                        'last_checked': datetime.fromisoformat(entry['last_checked'])
+                    }
         except Exception as e:
             print(f"Error discovering machines: {e}")
             
-        machine_ids.sort()
         return machine_ids
     
     def switch_to_machine(self, machine_id: str) -> bool:
@@ -206,32 +222,113 @@ class SingleMachineDatabaseManager:
             print(f"Error switching to machine {machine_id}: {e}")
             return False
     
+    def _get_pool(self, db_path: str) -> SQLiteConnectionPool:
+        """Connection pool for a machine database, created on first use"""
+        pool = self.connection_pools.get(db_path)
+        if pool is None:
+            pool = SQLiteConnectionPool(db_path, max_readers=2, pragmas=self.CONNECTION_PRAGMAS)
+            self.connection_pools[db_path] = pool
+        return pool
+
     @contextmanager
     def get_connection(self):
-        """Get a database connection for current machine with performance optimizations"""
+        """Get the writer connection of the current machine database"""
         if not self.current_db_path:
             raise RuntimeError("No machine selected. Call switch_to_machine() first.")
-        
-        # Create new connection for this context
-        conn = sqlite3.connect(self.current_db_path, timeout=30.0, isolation_level=None)
-        
-        try:
-            # Apply performance optimizations
-            conn.execute("PRAGMA foreign_keys=ON")
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")  # Smaller cache for single machine
-            conn.execute("PRAGMA temp_store=MEMORY")
-            conn.execute("PRAGMA busy_timeout=30000")
-            
+
+        with self._get_pool(self.current_db_path).writer() as conn:
             yield conn
-            
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
-    
+
+    @contextmanager
+    def get_read_connection(self):
+        """Get a pooled reader connection of the current machine database"""
+        if not self.current_db_path:
+            raise RuntimeError("No machine selected. Call switch_to_machine() first.")
+
+        with self._get_pool(self.current_db_path).reader() as conn:
+            yield conn
+
+    @contextmanager
+    def machine_writer(self, machine_id: str):
+        """Writer connection of any machine database, without switching the current machine
+
+        The database must exist (see create_machine_database).
+        """
+        with self._get_pool(self.get_machine_database_path(machine_id)).writer() as conn:
+            yield conn
+
+    def get_pool_metrics(self) -> Dict[str, Dict]:
+        """Connection pool metrics per machine database path"""
+        return {db_path: pool.get_metrics() for db_path, pool in self.connection_pools.items()}
+
+    def _machine_databases(self, machine_ids: Optional[List[str]] = None) -> Dict[str, str]:
+        """machine_id -> database path of the given (default: all discovered) machines with a database file"""
+        if machine_ids is None:
+            machine_ids = self.discover_available_machines()
+        databases = {}
+        for machine_id in machine_ids:
+            db_path = self.get_machine_database_path(machine_id)
+            if os.path.exists(db_path):
+                databases[machine_id] = db_path
+            else:
+                print(f"Warning: Database not found for machine {machine_id}")
+        return databases
+
+    def query_fleet(self, query: str, params=(), machine_ids: Optional[List[str]] = None,
+                    parse_dates: Optional[List[str]] = None,
+                    dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Run one query on several machine databases in parallel
+
+        Args:
+            query: SQL with ? placeholders
+            params: Parameters for every machine, or a dict keyed by machine_id
+            machine_ids: Machines to query (default: all discovered machines)
+            parse_dates: Columns to convert to datetime
+            dtypes: Column dtypes of the combined result
+
+        Returns:
+            Concatenated results with a machine_id column
+        """
+        return self.fleet_executor.query(
+            self._machine_databases(machine_ids), query, params,
+            parse_dates=parse_dates, dtypes=dtypes,
+        )
+
+    def get_federated_view(self, machine_ids: Optional[List[str]] = None) -> FederatedFleetView:
+        """Federated fleet_logs view over the given (default: all discovered) machine databases"""
+        return FederatedFleetView(self._machine_databases(machine_ids))
+
+    def get_fleet_summaries(self, machine_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """get_machine_summary of several machines, queried in parallel
+
+        Returns:
+            machine_id -> summary dictionary (machines that failed are left out)
+        """
+        databases = self._machine_databases(machine_ids)
+        summary_rows = self.fleet_executor.query(
+            databases,
+            """
+            SELECT COUNT(*) AS record_count,
+                   COUNT(DISTINCT parameter_type) AS parameter_count,
+                   MIN(datetime) AS start_date,
+                   MAX(datetime) AS end_date
+            FROM water_logs WHERE serial_number = ?
+            """,
+            {machine_id: (machine_id,) for machine_id in databases},
+        )
+
+        summaries = {}
+        for row in summary_rows.itertuples(index=False):
+            summaries[row.machine_id] = {
+                'machine_id': row.machine_id,
+                'record_count': int(row.record_count),
+                'parameter_count': int(row.parameter_count),
+                'start_date': row.start_date if row.start_date else 'N/A',
+                'end_date': row.end_date if row.end_date else 'N/A',
+                'database_path': databases[row.machine_id]
+            }
+        return summaries
+
     def create_machine_database(self, machine_id: str) -> bool:
         """Create a new database for specified machine
         
@@ -247,7 +344,7 @@ class SingleMachineDatabaseManager:
             # Don't overwrite existing database
             if os.path.exists(db_path):
                 print(f"Database for machine {machine_id} already exists")
-                return True
+                return self._ensure_natural_key(machine_id)
             
             # Create the database with same schema as main database
             conn = sqlite3.connect(db_path)
@@ -304,6 +401,10 @@ class SingleMachineDatabaseManager:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_water_logs_datetime ON water_logs(datetime)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_water_logs_serial ON water_logs(serial_number)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_water_logs_parameter ON water_logs(parameter_type)")
+            conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {self.NATURAL_KEY_INDEX} "
+                f"ON water_logs({', '.join(self.NATURAL_KEY_COLUMNS)})"
+            )
             conn.execute("CREATE INDEX IF NOT EXISTS idx_water_logs_composite ON water_logs(serial_number, parameter_type, datetime)")
             
             conn.commit()
@@ -317,6 +418,45 @@ class SingleMachineDatabaseManager:
             traceback.print_exc()
             return False
     
+    def _ensure_natural_key(self, machine_id: str) -> bool:
+        """Add the natural-key unique index to a machine database created without it
+        
+        Duplicate readings are removed first, keeping the earliest stored row.
+        
+        Returns:
+            True if the index exists afterwards
+        """
+        try:
+            with self.machine_writer(machine_id) as conn:
+                if conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (self.NATURAL_KEY_INDEX,)
+                ).fetchone():
+                    return True
+                
+                key_columns = ", ".join(self.NATURAL_KEY_COLUMNS)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    removed = conn.execute(f"""
+                        DELETE FROM water_logs WHERE id NOT IN (
+                            SELECT MIN(id) FROM water_logs GROUP BY {key_columns}
+                        )
+                    """).rowcount
+                    conn.execute(f"CREATE UNIQUE INDEX {self.NATURAL_KEY_INDEX} ON water_logs({key_columns})")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            
+            if removed:
+                # Rows were deleted below the registry's counted id
+                self.machine_registry.invalidate(machine_id)
+                print(f"🔄 Removed {removed} duplicate readings from machine {machine_id} database")
+            return True
+            
+        except Exception as e:
+            print(f"Error adding natural key to machine {machine_id} database: {e}")
+            return False
+    
     def migrate_machine_data(self, source_db_manager: DatabaseManager, machine_id: str) -> bool:
         """Migrate data for specific machine from combined database to machine-specific database
         
@@ -373,7 +513,8 @@ class SingleMachineDatabaseManager:
             machine_conn = sqlite3.connect(machine_db_path)
             
             if not water_logs_df.empty:
-                water_logs_df.to_sql('water_logs', machine_conn, if_exists='append', index=False)
+                water_logs_df.to_sql('water_logs', machine_conn, if_exists='append', index=False,
+                                     method=_insert_or_ignore)
                 print(f"  ✓ Migrated {len(water_logs_df)} water log records")
             
             if not metadata_df.empty:
@@ -463,7 +604,7 @@ class SingleMachineDatabaseManager:
                 if not self.switch_to_machine(machine_id):
                     return {'error': f'Could not switch to machine {machine_id}'}
             
-            with self.get_connection() as conn:
+            with self.get_read_connection() as conn:
                 # Get record count
                 cursor = conn.execute("SELECT COUNT(*) FROM water_logs WHERE serial_number = ?", (target_machine,))
                 record_count = cursor.fetchone()[0]
@@ -507,7 +648,7 @@ class SingleMachineDatabaseManager:
             batch_size: Number of records per batch
             
         Returns:
-            Number of records inserted
+            Number of records inserted (readings already stored are skipped)
         """
         if not self.current_db_path:
             raise RuntimeError("No machine selected. Call switch_to_machine() first.")
@@ -518,8 +659,8 @@ class SingleMachineDatabaseManager:
                 total_inserted = 0
                 for i in range(0, len(df), batch_size):
                     batch_df = df.iloc[i:i + batch_size]
-                    batch_df.to_sql('water_logs', conn, if_exists='append', index=False)
-                    total_inserted += len(batch_df)
+                    total_inserted += batch_df.to_sql('water_logs', conn, if_exists='append', index=False,
+                                                      method=_insert_or_ignore) or 0
                 
                 print(f"✓ Inserted {total_inserted} records into machine {self.current_machine_id} database")
                 return total_inserted
@@ -545,41 +686,38 @@ class SingleMachineDatabaseManager:
         }
         
         try:
-            # Load data for each machine
+            # Load both machines in parallel
+            machine_ids = [machine1_id, machine2_id]
+            fleet_data = self.query_fleet(
+                """
+                SELECT datetime, value, statistic_type, unit
+                FROM water_logs 
+                WHERE serial_number = ? AND parameter_type = ?
+                ORDER BY datetime
+                """,
+                {machine_id: (machine_id, parameter) for machine_id in machine_ids},
+                machine_ids=machine_ids,
+                parse_dates=['datetime'],
+            )
+            if fleet_data.empty:
+                return comparison_data
+
             for machine_key, machine_id in [('machine1', machine1_id), ('machine2', machine2_id)]:
-                machine_db_path = self.get_machine_database_path(machine_id)
+                data = fleet_data[fleet_data['machine_id'] == machine_id].drop(columns='machine_id')
                 
-                if not os.path.exists(machine_db_path):
-                    print(f"Warning: Database not found for machine {machine_id}")
-                    continue
-                
-                with sqlite3.connect(machine_db_path) as conn:
-                    query = """
-                        SELECT datetime, value, statistic_type, unit
-                        FROM water_logs 
-                        WHERE serial_number = ? AND parameter_type = ?
-                        ORDER BY datetime
-                    """
-                    
-                    data = pd.read_sql_query(
-                        query, conn,
-                        params=[machine_id, parameter],
-                        parse_dates=['datetime']
-                    )
+                if not data.empty:
+                    comparison_data[machine_key]['data'] = data.reset_index(drop=True)
                     
-                    if not data.empty:
-                        comparison_data[machine_key]['data'] = data
-                        
-                        # Calculate statistics
-                        avg_data = data[data['statistic_type'] == 'avg']['value']
-                        if not avg_data.empty:
-                            comparison_data[machine_key]['stats'] = {
-                                'mean': avg_data.mean(),
-                                'std': avg_data.std(),
-                                'min': avg_data.min(),
-                                'max': avg_data.max(),
-                                'count': len(avg_data)
-                            }
+                    # Calculate statistics
+                    avg_data = data[data['statistic_type'] == 'avg']['value']
+                    if not avg_data.empty:
+                        comparison_data[machine_key]['stats'] = {
+                            'mean': avg_data.mean(),
+                            'std': avg_data.std(),
+                            'min': avg_data.min(),
+                            'max': avg_data.max(),
+                            'count': len(avg_data)
+                        }
             
             return comparison_data
             
@@ -594,4 +732,9 @@ class SingleMachineDatabaseManager:
                 conn.close()
             except:
                 pass
-        self.comparison_connections.clear()
\ No newline at end of file
+        self.comparison_connections.clear()
+
+        # Machine databases other than the current one
+        for db_path in list(self.connection_pools):
+            if db_path != self.current_db_path:
+                self.connection_pools.pop(db_path).close_all()
\ No newline at end of file
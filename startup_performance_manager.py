@@ -43,7 +43,7 @@ class StartupPerformanceManager:
         try:
             sha256_hash = hashlib.sha256()
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
                     sha256_hash.update(chunk)
             return sha256_hash.hexdigest()
         except Exception as e:
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+HALbasic Machine Import Router Tests
+Checks that multi-machine log imports are split by serial number, stored once
+per reading and rolled back when routing fails
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import sqlite3
+import sys
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+from machine_import_router import MachineImportRouter
+from single_machine_database import SingleMachineDatabaseManager
+from unified_parser import UnifiedParser
+
+SERIALS = ("2123", "2207")
+PARAMETERS = (
+    "logStatistics FanhumidityStatistics",
+    "logStatistics CoolingpumpPressureStatistics",
+    "logStatistics FanfanSpeed1Statistics",
+)
+CHUNK_SIZE = 50
+
+
+def write_log(path: Path, readings: int = 120) -> Path:
+    """Log with two serial numbers whose duplicate lines land in different parse chunks"""
+    lines = []
+    for i in range(readings):
+        for serial in SERIALS:
+            for n, parameter in enumerate(PARAMETERS):
+                avg = 20 + (i % 7) + n
+                lines.append(
+                    f"2025-08-01\t{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}\tINFO\tSTN\tSN# {serial}\t"
+                    f"{parameter}: count=54, max={avg + 1:.2f}, min={avg - 1:.2f}, avg={avg:.2f}"
+                )
+    # Repeat a block of earlier readings several chunks later
+    lines.extend(lines[:CHUNK_SIZE * 2])
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def machine_row_count(machine_db: SingleMachineDatabaseManager, machine_id: str) -> int:
+    with closing(sqlite3.connect(machine_db.get_machine_database_path(machine_id))) as conn:
+        return conn.execute("SELECT COUNT(*) FROM water_logs").fetchone()[0]
+
+
+def test_import_matches_parser():
+    """Streamed import stores the same readings per machine as a full parse"""
+    print("🔍 Testing multi-machine import...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = write_log(Path(tmp) / "fleet.log")
+        expected = UnifiedParser().parse_linac_file(str(log_path), enable_validation=False)
+        expected_counts = expected["serial_number"].value_counts().to_dict()
+
+        machine_db = SingleMachineDatabaseManager(str(Path(tmp) / "app"))
+        with MachineImportRouter(machine_db, commit_rows=100) as router:
+            router.import_file(UnifiedParser(), str(log_path), chunk_size=CHUNK_SIZE)
+
+        assert router.skipped_records > 0, "duplicate lines were not spread across chunks"
+        for serial in SERIALS:
+            stored = machine_row_count(machine_db, serial)
+            assert stored == expected_counts[serial] == router.record_counts[serial], (
+                serial, stored, expected_counts[serial], router.record_counts[serial]
+            )
+            print(f"  ✓ Machine {serial}: {stored} records")
+
+        # Importing the same file again adds nothing
+        with MachineImportRouter(machine_db) as router:
+            router.import_file(UnifiedParser(), str(log_path), chunk_size=CHUNK_SIZE)
+        assert router.total_records == 0
+        for serial in SERIALS:
+            assert machine_row_count(machine_db, serial) == expected_counts[serial]
+        print("  ✓ Re-import skipped")
+
+    print("✅ Multi-machine import stores every reading once")
+
+
+def test_failed_route_is_rolled_back():
+    """Nothing reaches the machine databases when routing raises"""
+    print("\n🔍 Testing rollback of a failed import...")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = write_log(Path(tmp) / "fleet.log")
+        df = UnifiedParser().parse_linac_file(str(log_path), enable_validation=False)
+
+        machine_db = SingleMachineDatabaseManager(str(Path(tmp) / "app"))
+        router = MachineImportRouter(machine_db, commit_rows=None)
+        machine_log_rows = router._machine_log_rows
+        partitions = []
+
+        def fail_on_second_machine(partition):
+            partitions.append(partition)
+            if len(partitions) == 2:
+                raise RuntimeError("simulated write failure")
+            return machine_log_rows(partition)
+
+        router._machine_log_rows = fail_on_second_machine
+        try:
+            with router:
+                router.route(df)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("route did not raise")
+
+        assert len(partitions) == 2
+        for serial in SERIALS:
+            assert machine_row_count(machine_db, serial) == 0, serial
+            assert router.record_counts.get(serial, 0) == 0, serial
+            print(f"  ✓ Machine {serial}: nothing committed")
+
+    print("✅ Failed import left the machine databases unchanged")
+
+
+def main():
+    """Run all router tests"""
+    print("🧪 HALbasic Machine Import Router Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Multi-machine import", test_import_matches_parser),
+        ("Rollback", test_failed_route_is_rolled_back),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+        except Exception as e:
+            print(f"\n❌ {test_name} test failed: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"🧪 Test Results: {len(tests) - failed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -11,13 +11,299 @@ Company: gobioeng.com
 """
 
 import pandas as pd
+import numpy as np
 import re
+import mmap
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import os
 import random
 
 
+class ColumnarRecordBuilder:
+    """
+    Typed column buffers for parsed LINAC statistics records.
+
+    Numeric fields go into array.array buffers and repeated strings
+    (datetime, serial number, parameter, quality) are interned into
+    integer category codes, so a parse holds a few bytes per record
+    instead of a 10-key dict. The DataFrame is built once at the end.
+    """
+
+    def __init__(self):
+        self.datetime_codes = array('i')
+        self.serial_codes = array('i')
+        self.parameter_codes = array('i')
+        self.quality_codes = array('i')
+        self.count = array('q')
+        self.max_value = array('d')
+        self.min_value = array('d')
+        self.avg_value = array('d')
+        self.line_number = array('q')
+
+        # Category tables: code -> value, plus value -> code lookups
+        self.datetimes: List[str] = []
+        self.serials: List[Optional[str]] = []
+        self.parameters: List[str] = []
+        self.qualities: List[str] = []
+        self._datetime_index: Dict[str, int] = {}
+        self._serial_index: Dict[Optional[str], int] = {}
+        self._parameter_index: Dict[str, int] = {}
+        self._quality_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.line_number)
+
+    @staticmethod
+    def _intern(index: Dict, values: List, value) -> int:
+        """Return the category code for value, adding it if unseen"""
+        code = index.get(value)
+        if code is None:
+            code = len(values)
+            index[value] = code
+            values.append(value)
+        return code
+
+    def append(self, datetime_str: str, serial_number: Optional[str], parameter_type: str,
+               count: int, max_val: float, min_val: float, avg_val: float,
+               line_number: int, quality: str):
+        """Append one combined statistics record"""
+        # count is the only field that can overflow its buffer - append it first
+        self.count.append(count)
+        self.max_value.append(max_val)
+        self.min_value.append(min_val)
+        self.avg_value.append(avg_val)
+        self.line_number.append(line_number)
+        self.datetime_codes.append(self._intern(self._datetime_index, self.datetimes, datetime_str))
+        self.serial_codes.append(self._intern(self._serial_index, self.serials, serial_number))
+        self.parameter_codes.append(self._intern(self._parameter_index, self.parameters, parameter_type))
+        self.quality_codes.append(self._intern(self._quality_index, self.qualities, quality))
+
+    def extend(self, other: "ColumnarRecordBuilder", line_offset: int = 0):
+        """Append all records of another builder, remapping its category codes"""
+        if not len(other):
+            return
+
+        for codes, other_codes, index, values, other_values in (
+            (self.datetime_codes, other.datetime_codes, self._datetime_index, self.datetimes, other.datetimes),
+            (self.serial_codes, other.serial_codes, self._serial_index, self.serials, other.serials),
+            (self.parameter_codes, other.parameter_codes, self._parameter_index, self.parameters, other.parameters),
+            (self.quality_codes, other.quality_codes, self._quality_index, self.qualities, other.qualities),
+        ):
+            remap = np.array([self._intern(index, values, v) for v in other_values], dtype=np.intc)
+            codes.frombytes(remap[np.frombuffer(other_codes, dtype=np.intc)].tobytes())
+
+        self.count.extend(other.count)
+        self.max_value.extend(other.max_value)
+        self.min_value.extend(other.min_value)
+        self.avg_value.extend(other.avg_value)
+        if line_offset:
+            shifted = np.frombuffer(other.line_number, dtype=np.int64) + line_offset
+            self.line_number.frombytes(shifted.tobytes())
+        else:
+            self.line_number.extend(other.line_number)
+
+    @staticmethod
+    def _decode(codes: array, values: List, start: int) -> np.ndarray:
+        """Expand category codes back to an object array of values"""
+        categories = np.empty(len(values), dtype=object)
+        categories[:] = values
+        return categories[np.frombuffer(codes, dtype=np.intc)[start:]]
+
+    def to_dataframe(self, start: int = 0) -> pd.DataFrame:
+        """Build the records DataFrame (same layout as the per-line dict records)
+
+        Args:
+            start: First record to include, used for per-chunk validation
+        """
+        rows = len(self) - start
+        if rows <= 0:
+            return pd.DataFrame()
+
+        return pd.DataFrame({
+            'datetime': self._decode(self.datetime_codes, self.datetimes, start),
+            'serial_number': self._decode(self.serial_codes, self.serials, start),
+            'parameter_type': self._decode(self.parameter_codes, self.parameters, start),
+            'statistic_type': np.full(rows, 'combined', dtype=object),
+            'count': np.frombuffer(self.count, dtype=np.int64)[start:].copy(),
+            'max_value': np.frombuffer(self.max_value, dtype=np.float64)[start:].copy(),
+            'min_value': np.frombuffer(self.min_value, dtype=np.float64)[start:].copy(),
+            'avg_value': np.frombuffer(self.avg_value, dtype=np.float64)[start:].copy(),
+            'line_number': np.frombuffer(self.line_number, dtype=np.int64)[start:].copy(),
+            'quality': self._decode(self.quality_codes, self.qualities, start),
+        })
+
+
+class ParameterNameResolver:
+    """
+    Resolves raw log parameter names to unified names, built once from
+    parameter_mapping.
+
+    Priority rules (same results as the original nested pattern loops):
+    1. Exact case-insensitive match - first pattern in mapping order wins
+    2. Substring match of a pattern longer than 5 chars - the earliest
+       pattern in mapping order wins, found with an Aho-Corasick automaton
+    3. Cleaned key lookup in pattern_to_unified
+    """
+
+    # Keywords that mark a parameter as a target for short data files
+    TARGET_KEYWORDS = [
+        # Fan and speed parameters
+        'fanremotetemp', 'fanhumidity', 'fanfanspeed', 'fanspeed', 'fan',
+
+        # Water system parameters
+        'magnetronflow', 'targetandcirculatorflow', 'citywaterflow',
+        'pumpressure', 'waterflow', 'flow', 'pump', 'chiller', 'watertank',
+
+        # Temperature parameters
+        'magnetrontemp', 'colboardtemp', 'pdutemp', 'watertanktemp',
+        'ambienttemp', 'chillertemp', 'temp', 'temperature',
+
+        # Voltage parameters
+        'mlc_adc_chan_temp_banka', 'mlc_adc_chan_temp_bankb',
+        'col_adc_chan_temp', 'voltage', 'volt', '24v', '48v', '5v',
+        'banka', 'bankb', 'adc', 'mlc', 'col',
+
+        # Humidity parameters
+        'humidity', 'humid',
+
+        # Pressure parameters
+        'pressure', 'psi', 'bar'
+    ]
+
+    def __init__(self, parameter_mapping: Dict, pattern_to_unified: Dict[str, str]):
+        self.pattern_to_unified = pattern_to_unified
+        self.exact = {}
+        substring_patterns = []
+
+        for unified_name, config in parameter_mapping.items():
+            for pattern in config["patterns"]:
+                self.exact.setdefault(pattern.lower(), unified_name)
+                if len(pattern) > 5:  # Avoid short matches
+                    substring_patterns.append((pattern.lower(), unified_name))
+
+        # Automaton payload is the mapping-order priority, lower wins
+        self._substring_names = [unified_name for _, unified_name in substring_patterns]
+        self._substring_automaton = self._build_automaton(
+            [(pattern, priority) for priority, (pattern, _) in enumerate(substring_patterns)]
+        )
+
+        # Target check: keywords plus cleaned patterns, and the reverse
+        # "name inside a pattern" check against all cleaned patterns
+        cleaned_patterns = [self.clean_key(pattern) for pattern in pattern_to_unified]
+        self._target_automaton = self._build_automaton(
+            [(keyword, 0) for keyword in self.TARGET_KEYWORDS + cleaned_patterns]
+        )
+        self._joined_patterns = "\0".join(cleaned_patterns)
+
+    @staticmethod
+    def clean_key(name: str) -> str:
+        """Lowercase and drop spaces, colons and underscores"""
+        return name.lower().replace(" ", "").replace(":", "").replace("_", "")
+
+    @staticmethod
+    def strip_prefix(name: str) -> str:
+        """Remove a leading 'logStatistics ' prefix"""
+        if name.lower().startswith('logstatistics '):
+            return name[14:]
+        return name
+
+    @staticmethod
+    def _build_automaton(patterns: List[Tuple[str, int]]) -> Tuple[List[Dict], List[Optional[int]]]:
+        """Build Aho-Corasick goto tables and the best (lowest) priority per state
+
+        Returns:
+            (goto, best) where goto[state] maps a character to the next state
+            and best[state] is the lowest priority of any pattern ending
+            there or at one of its suffix states (None if none end)
+        """
+        goto = [{}]
+        best = [None]
+
+        for pattern, priority in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    best.append(None)
+                state = next_state
+            if best[state] is None or priority < best[state]:
+                best[state] = priority
+
+        # Breadth-first failure links, folding suffix outputs into best
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                inherited = best[fail[next_state]]
+                if inherited is not None and (best[next_state] is None or inherited < best[next_state]):
+                    best[next_state] = inherited
+
+        # Complete the transitions so searching never follows failure links;
+        # transitions out of the root are looked up directly in _search
+        for state in queue:
+            if fail[state]:
+                for char, target in goto[fail[state]].items():
+                    goto[state].setdefault(char, target)
+
+        return goto, best
+
+    @staticmethod
+    def _search(automaton, text: str, first_only: bool = False) -> Optional[int]:
+        """Return the lowest priority of any pattern found in text (None if none)"""
+        goto, best = automaton
+        root = goto[0]
+        state = 0
+        found = None
+
+        for char in text:
+            state = goto[state].get(char) or root.get(char, 0)
+            priority = best[state]
+            if priority is not None and (found is None or priority < found):
+                if first_only:
+                    return priority
+                found = priority
+
+        return found
+
+    def resolve(self, param_name: str) -> Optional[str]:
+        """Return the unified name for a raw parameter name, or None if untracked"""
+        cleaned_lower = self.strip_prefix(param_name.strip()).lower()
+
+        unified_name = self.exact.get(cleaned_lower)
+        if unified_name:
+            return unified_name
+
+        priority = self._search(self._substring_automaton, cleaned_lower)
+        if priority is not None:
+            return self._substring_names[priority]
+
+        return self.pattern_to_unified.get(self.clean_key(cleaned_lower), None)
+
+    def is_target(self, param_name: str) -> bool:
+        """Check if a raw parameter name is one of the target parameters"""
+        param_lower = self.clean_key(self.strip_prefix(param_name))
+
+        if self._search(self._target_automaton, param_lower, first_only=True) is not None:
+            return True
+
+        # Parameter name is itself part of one of our patterns
+        return bool(self.pattern_to_unified) and "\0" not in param_lower and param_lower in self._joined_patterns
+
+
 class UnifiedParser:
     """
     Unified parser for all HALog data types:
@@ -33,6 +319,8 @@ class UnifiedParser:
             "records_extracted": 0,
             "errors_encountered": 0,
             "processing_time": 0,
+            "fused_pattern_hits": 0,  # lines matched by the single statistics_line pattern
+            "fallback_pattern_lines": 0,  # lines that needed the separate patterns
         }
         self.fault_codes: Dict[str, Dict[str, str]] = {}
         self.parameter_mapping = {}  # Initialize before calling _init_parameter_mapping
@@ -90,6 +378,28 @@ class UnifiedParser:
             "serial_number": re.compile(r"SN#?\s*(\d+)", re.IGNORECASE),
             "serial_alt": re.compile(r"Serial[:\s]+(\d+)", re.IGNORECASE),
             "machine_id": re.compile(r"Machine[:\s]+(\d+)", re.IGNORECASE),
+            # Fused pattern for the standard HAL statistics line layout:
+            # "<date> <time> ... SN# <serial> <parameter>: count=N, max=N, min=N, avg=N"
+            # The prefix may not contain '#', '=' or an earlier serial, so a match
+            # gives the same fields as the separate patterns above
+            "statistics_line": re.compile(
+                r"\s*(?P<date>\d{4}-\d{2}-\d{2})[ \t]+(?P<time>\d{2}:\d{2}:\d{2})"
+                r"(?:(?!SN#?\s*\d)[^#=\n])*"
+                r"SN#\s*(?P<serial>\d+)\s+"
+                r"(?P<param>[a-zA-Z][a-zA-Z0-9_\s]*[a-zA-Z0-9])"
+                r"[:\s]*count\s*=\s*(?P<count>\d+),?\s*"
+                r"max\s*=\s*(?P<max>[\d.-]+),?\s*"
+                r"min\s*=\s*(?P<min>[\d.-]+),?\s*"
+                r"avg\s*=\s*(?P<avg>[\d.-]+)",
+                re.IGNORECASE,
+            ),
+        }
+
+        # Bytes versions of the statistics-line patterns for the mmap scanner,
+        # so candidate lines can be matched before anything is decoded
+        self.byte_patterns = {
+            name: re.compile(self.patterns[name].pattern.encode("ascii"), self.patterns[name].flags & re.IGNORECASE)
+            for name in ("statistics_line", "datetime", "datetime_alt", "water_parameters", "serial_number")
         }
 
     def _init_parameter_mapping(self):
@@ -408,6 +718,9 @@ class UnifiedParser:
                 key = pattern.lower().replace(" ", "").replace(":", "").replace("_", "")
                 self.pattern_to_unified[key] = unified_name
 
+        # Precompiled resolver shared by the LINAC and short data paths
+        self.name_resolver = ParameterNameResolver(self.parameter_mapping, self.pattern_to_unified)
+
         # Cache for parameter normalization (performance optimization)
         self._param_cache = {}
 
@@ -418,9 +731,40 @@ class UnifiedParser:
         progress_callback=None,
         cancel_callback=None,
         enable_validation: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        explode_statistics: bool = True,
+        start_offset: int = 0,
+        end_offset: Optional[int] = None,
+        start_line: int = 1,
     ) -> pd.DataFrame:
-        """Parse LINAC log file with optimized chunked processing and real-time validation"""
-        records = []
+        """Parse LINAC log file with optimized chunked processing and real-time validation
+
+        The file is memory-mapped and scanned at the bytes level; only lines
+        containing statistics are matched and decoded (see _iter_candidate_lines).
+        With parallel=True the file is split into newline-aligned byte ranges
+        that are parsed in a process pool (see parse_linac_file_parallel).
+        With explode_statistics=False the wide avg/min/max frame is returned
+        instead of one row per statistic (see _clean_and_validate_data).
+        start_offset/end_offset restrict parsing to a byte window starting at
+        a line boundary (used by incremental ingest); start_line is the file
+        line number of the line at start_offset.
+        """
+        if parallel:
+            return self.parse_linac_file_parallel(
+                file_path,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                cancel_callback=cancel_callback,
+                enable_validation=enable_validation,
+                max_workers=max_workers,
+                explode_statistics=explode_statistics,
+                start_offset=start_offset,
+                end_offset=end_offset,
+                start_line=start_line,
+            )
+
+        builder = ColumnarRecordBuilder()
         
         # Initialize validator if validation is enabled
         validator = None
@@ -436,78 +780,76 @@ class UnifiedParser:
         try:
             # Optimized file reading - stream processing instead of loading entire file
             self.parsing_stats["lines_processed"] = 0
+            self.parsing_stats["fused_pattern_hits"] = 0
+            self.parsing_stats["fallback_pattern_lines"] = 0
             chunk_count = 0
 
-            # Get file size for better progress estimation
-            import os
             file_size = os.path.getsize(file_path)
-            estimated_total_lines = file_size // 100  # Rough estimate: 100 bytes per line average
+            end_offset = file_size if end_offset is None else min(end_offset, file_size)
+            window_size = max(end_offset - start_offset, 1)
+            line_offset = start_line - 1
 
-            # Use buffered reading for better performance
-            with open(file_path, 'r', encoding='utf-8', buffering=8192) as file:
-                chunk_lines = []
-                line_number = 0
-
-                for line in file:
-                    if cancel_callback and cancel_callback():
-                        break
+            # Memory-map the file and only look at lines containing statistics
+            # (mmap cannot map an empty file)
+            with open(file_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file_size else nullcontext(b"") as mm:
+                candidates = []
+                cancelled = False
 
-                    line_number += 1
-                    line = line.strip()
+                for line_number, line, line_end in self._iter_candidate_lines(mm, start_offset, end_offset):
+                    candidates.append((line_number + line_offset, line))
 
-                    # Skip empty lines early
-                    if not line:
-                        continue
+                    # Process chunk when it reaches desired size
+                    if len(candidates) >= chunk_size:
+                        if cancel_callback and cancel_callback():
+                            cancelled = True
+                            break
 
-                    chunk_lines.append((line_number, line))
+                        chunk_start = len(builder)
+                        self._process_candidates_columnar(candidates, builder)
+                        self.parsing_stats["lines_processed"] = line_number
+                        progress_msg = f"Processing line {line_number:,}..."
 
-                    # Process chunk when it reaches desired size
-                    if len(chunk_lines) >= chunk_size:
-                        chunk_records = self._process_chunk_optimized(chunk_lines)
-                        
                         # Validate chunk if validation is enabled
-                        if enable_validation and validator and chunk_records:
-                            chunk_df = pd.DataFrame(chunk_records)
+                        if enable_validation and validator and len(builder) > chunk_start:
+                            chunk_df = builder.to_dataframe(start=chunk_start)
                             validation_result = validator.validate_chunk(chunk_df, chunk_count)
-                            
+
                             # Add validation info to progress callback if available
                             if progress_callback and validation_result:
                                 quality_score = validation_result.get('chunk_quality_score', 0)
                                 anomalies = validation_result.get('chunk_anomalies', 0)
-                                progress_msg = f"Processing line {self.parsing_stats['lines_processed']:,}... (Quality: {quality_score:.1f}%, Anomalies: {anomalies})"
-                            else:
-                                progress_msg = f"Processing line {self.parsing_stats['lines_processed']:,}..."
-                        else:
-                            progress_msg = f"Processing line {self.parsing_stats['lines_processed']:,}..."
-                        
-                        records.extend(chunk_records)
-                        self.parsing_stats["lines_processed"] += len(chunk_lines)
+                                progress_msg = f"Processing line {line_number:,}... (Quality: {quality_score:.1f}%, Anomalies: {anomalies})"
+
                         chunk_count += 1
 
                         if progress_callback:
-                            # Better progress calculation
-                            progress = min(95.0, (self.parsing_stats["lines_processed"] / max(estimated_total_lines, line_number)) * 100.0)
+                            progress = min(95.0, ((line_end - start_offset) / window_size) * 100.0)
                             progress_callback(progress, progress_msg)
 
-                        chunk_lines = []  # Reset chunk
+                        candidates = []  # Reset chunk
+
+                # Process remaining candidate lines
+                if candidates:
+                    chunk_start = len(builder)
+                    self._process_candidates_columnar(candidates, builder)
 
-                # Process remaining lines
-                if chunk_lines:
-                    chunk_records = self._process_chunk_optimized(chunk_lines)
-                    
                     # Validate final chunk
-                    if enable_validation and validator and chunk_records:
-                        chunk_df = pd.DataFrame(chunk_records)
+                    if enable_validation and validator and len(builder) > chunk_start:
+                        chunk_df = builder.to_dataframe(start=chunk_start)
                         validator.validate_chunk(chunk_df, chunk_count)
-                    
-                    records.extend(chunk_records)
-                    self.parsing_stats["lines_processed"] += len(chunk_lines)
+
+                # Every line was scanned, not only the candidates
+                if not cancelled:
+                    self.parsing_stats["lines_processed"] = self._count_lines(mm, start_offset, end_offset)
 
         except Exception as e:
             print(f"Error reading file {file_path}: {e}")
             self.parsing_stats["errors_encountered"] += 1
 
-        df = pd.DataFrame(records)
+        # Build the DataFrame once from the column buffers
+        df = builder.to_dataframe()
+        del builder
         
         # Store validation results in parsing stats if validation was performed
         if enable_validation and validator:
@@ -516,7 +858,304 @@ class UnifiedParser:
             print(f"✓ Validation completed - Quality Score: {validation_summary['overall_quality_score']:.1f}%, "
                   f"Anomalies: {validation_summary['total_anomalies']}")
         
-        return self._clean_and_validate_data(df)
+        return self._clean_and_validate_data(df, explode_statistics=explode_statistics)
+
+    def iter_linac_file_chunks(
+        self,
+        file_path: str,
+        chunk_size: int = 5000,
+        cancel_callback=None,
+        start_offset: int = 0,
+        end_offset: Optional[int] = None,
+        start_line: int = 1,
+    ) -> Iterator[Tuple[pd.DataFrame, int]]:
+        """Yield cleaned wide record chunks of a LINAC log as they are parsed
+
+        Streaming counterpart of parse_linac_file: each chunk of up to
+        chunk_size statistics lines becomes its own cleaned DataFrame
+        (avg/min/max columns, see _clean_records), so memory stays bounded
+        by the chunks the consumer holds. Duplicates are only removed within
+        a chunk.
+
+        Yields:
+            (DataFrame, byte position reached in the file)
+        """
+        self.parsing_stats["lines_processed"] = 0
+        self.parsing_stats["fused_pattern_hits"] = 0
+        self.parsing_stats["fallback_pattern_lines"] = 0
+
+        file_size = os.path.getsize(file_path)
+        end_offset = file_size if end_offset is None else min(end_offset, file_size)
+        if file_size == 0 or end_offset <= start_offset:
+            return
+
+        with open(file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            candidates = []
+            line_offset = start_line - 1
+
+            for line_number, line, line_end in self._iter_candidate_lines(mm, start_offset, end_offset):
+                candidates.append((line_number + line_offset, line))
+                if len(candidates) >= chunk_size:
+                    if cancel_callback and cancel_callback():
+                        return
+                    builder = ColumnarRecordBuilder()
+                    self._process_candidates_columnar(candidates, builder)
+                    self.parsing_stats["lines_processed"] = line_number
+                    candidates = []
+                    if len(builder):
+                        yield self._clean_records(builder.to_dataframe()), line_end
+
+            if candidates:
+                builder = ColumnarRecordBuilder()
+                self._process_candidates_columnar(candidates, builder)
+                if len(builder):
+                    yield self._clean_records(builder.to_dataframe()), end_offset
+
+            self.parsing_stats["lines_processed"] = self._count_lines(mm, start_offset, end_offset)
+
+    # Byte range size for parallel parsing - keeps per-worker memory bounded
+    # and gives the progress bar reasonable granularity on large files
+    PARALLEL_RANGE_SIZE = 16 * 1024 * 1024
+
+    def parse_linac_file_parallel(
+        self,
+        file_path: str,
+        chunk_size: int = 1000,
+        progress_callback=None,
+        cancel_callback=None,
+        enable_validation: bool = True,
+        max_workers: Optional[int] = None,
+        range_size: Optional[int] = None,
+        explode_statistics: bool = True,
+        start_offset: int = 0,
+        end_offset: Optional[int] = None,
+        start_line: int = 1,
+    ) -> pd.DataFrame:
+        """Parse LINAC log file in a process pool, one newline-aligned byte range per task
+
+        Ranges are merged back in file order with global line numbers, so the
+        result matches the serial parse_linac_file output.
+        """
+        builder = ColumnarRecordBuilder()
+        range_size = range_size or self.PARALLEL_RANGE_SIZE
+
+        validator = None
+        if enable_validation:
+            try:
+                from data_validator import DataValidator
+                validator = DataValidator(self.parameter_mapping)
+                print("✓ Data validation enabled during parsing")
+            except ImportError as e:
+                print(f"⚠️ Could not import DataValidator: {e}")
+                enable_validation = False
+
+        self.parsing_stats["lines_processed"] = 0
+        self.parsing_stats["fused_pattern_hits"] = 0
+        self.parsing_stats["fallback_pattern_lines"] = 0
+
+        try:
+            file_size = os.path.getsize(file_path)
+            end_offset = file_size if end_offset is None else min(end_offset, file_size)
+            byte_ranges = self._compute_byte_ranges(file_path, range_size, start_offset, end_offset)
+        except OSError as e:
+            print(f"Error reading file {file_path}: {e}")
+            self.parsing_stats["errors_encountered"] += 1
+            return self._clean_and_validate_data(builder.to_dataframe(),
+                                                 explode_statistics=explode_statistics)
+
+        # Small files are not worth the process start-up cost
+        if len(byte_ranges) <= 1:
+            return self.parse_linac_file(
+                file_path,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                cancel_callback=cancel_callback,
+                enable_validation=enable_validation,
+                explode_statistics=explode_statistics,
+                start_offset=start_offset,
+                end_offset=end_offset,
+                start_line=start_line,
+            )
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_parallel_worker
+            ) as executor:
+                futures = [
+                    executor.submit(_parse_byte_range_worker, file_path, start, end, chunk_size)
+                    for start, end in byte_ranges
+                ]
+
+                line_offset = start_line - 1
+                for range_index, future in enumerate(futures):
+                    if cancel_callback and cancel_callback():
+                        for pending in futures[range_index:]:
+                            pending.cancel()
+                        break
+
+                    result = future.result()
+
+                    # Merge in file order, shifting range-local line numbers
+                    range_start = len(builder)
+                    builder.extend(result["records"], line_offset=line_offset)
+                    line_offset += result["line_count"]
+
+                    self.parsing_stats["lines_processed"] += result["lines_processed"]
+                    self.parsing_stats["errors_encountered"] += result["errors_encountered"]
+                    self.parsing_stats["fused_pattern_hits"] += result["fused_pattern_hits"]
+                    self.parsing_stats["fallback_pattern_lines"] += result["fallback_pattern_lines"]
+
+                    progress_msg = f"Processing line {self.parsing_stats['lines_processed']:,}..."
+                    if enable_validation and validator and len(builder) > range_start:
+                        validation_result = validator.validate_chunk(
+                            builder.to_dataframe(start=range_start), range_index
+                        )
+                        if validation_result:
+                            quality_score = validation_result.get('chunk_quality_score', 0)
+                            anomalies = validation_result.get('chunk_anomalies', 0)
+                            progress_msg = f"Processing line {self.parsing_stats['lines_processed']:,}... (Quality: {quality_score:.1f}%, Anomalies: {anomalies})"
+
+                    if progress_callback:
+                        progress = min(95.0, ((byte_ranges[range_index][1] - start_offset)
+                                              / max(end_offset - start_offset, 1)) * 100.0)
+                        progress_callback(progress, progress_msg)
+
+        except Exception as e:
+            print(f"Error in parallel parsing of {file_path}: {e}")
+            print("⚠️ Falling back to serial parsing")
+            self.parsing_stats["errors_encountered"] += 1
+            return self.parse_linac_file(
+                file_path,
+                chunk_size=chunk_size,
+                progress_callback=progress_callback,
+                cancel_callback=cancel_callback,
+                enable_validation=enable_validation,
+                explode_statistics=explode_statistics,
+                start_offset=start_offset,
+                end_offset=end_offset,
+                start_line=start_line,
+            )
+
+        df = builder.to_dataframe()
+        del builder
+
+        if enable_validation and validator:
+            validation_summary = validator.get_validation_summary()
+            self.parsing_stats["validation_summary"] = validation_summary
+            print(f"✓ Validation completed - Quality Score: {validation_summary['overall_quality_score']:.1f}%, "
+                  f"Anomalies: {validation_summary['total_anomalies']}")
+
+        return self._clean_and_validate_data(df, explode_statistics=explode_statistics)
+
+    def _compute_byte_ranges(self, file_path: str, range_size: int, start_offset: int = 0,
+                             end_offset: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Split a file (or a byte window of it) into (start, end) ranges that each end on a newline"""
+        file_size = os.path.getsize(file_path)
+        end_offset = file_size if end_offset is None else min(end_offset, file_size)
+        byte_ranges = []
+        start = start_offset
+
+        with open(file_path, 'rb') as file:
+            while start < end_offset:
+                end = start + range_size
+                if end >= end_offset:
+                    end = end_offset
+                else:
+                    # Move the boundary forward to the end of the current line
+                    file.seek(end)
+                    file.readline()
+                    end = min(file.tell(), end_offset)
+                byte_ranges.append((start, end))
+                start = end
+
+        return byte_ranges
+
+    # Block size for counting newlines in a mapped file without copying it whole
+    LINE_COUNT_BLOCK_SIZE = 16 * 1024 * 1024
+
+    def _iter_candidate_lines(self, mm, start: int, end: int):
+        """Yield (line_number, line_bytes, line_end) for statistics lines in mm[start:end]
+
+        Uses mmap.find(b'count=') to jump between candidate lines, so lines
+        without statistics are never split out or decoded. Line numbers are
+        1-based and relative to start; LF and CRLF line endings are supported.
+        """
+        find = mm.find
+        rfind = mm.rfind
+        newlines_before = 0
+        counted_to = start
+
+        position = find(b'count=', start, end)
+        while position != -1:
+            line_start = rfind(b'\n', start, position) + 1 or start
+            line_end = find(b'\n', position, end)
+            if line_end == -1:
+                line_end = end
+
+            newlines_before += mm[counted_to:line_start].count(b'\n')
+            counted_to = line_start
+
+            line = mm[line_start:line_end]
+            if b'avg=' in line:
+                yield newlines_before + 1, line, line_end
+
+            position = find(b'count=', line_end, end) if line_end < end else -1
+
+    def _count_lines(self, mm, start: int, end: int) -> int:
+        """Count lines in mm[start:end], including a final line without a newline"""
+        if end <= start:
+            return 0
+
+        newlines = 0
+        for block_start in range(start, end, self.LINE_COUNT_BLOCK_SIZE):
+            block_end = min(block_start + self.LINE_COUNT_BLOCK_SIZE, end)
+            newlines += mm[block_start:block_end].count(b'\n')
+
+        return newlines + (0 if mm[end - 1:end] == b'\n' else 1)
+
+    def _parse_byte_range(self, file_path: str, start: int, end: int, chunk_size: int = 1000) -> Dict:
+        """Parse one byte range of a log file (runs inside a pool worker)
+
+        Line numbers in the returned records are relative to the start of the
+        range; line_count lets the caller rebase them to file line numbers.
+        """
+        builder = ColumnarRecordBuilder()
+        line_count = 0
+        lines_processed = 0
+        errors_encountered = 0
+        self.parsing_stats["errors_encountered"] = 0
+        self.parsing_stats["fused_pattern_hits"] = 0
+        self.parsing_stats["fallback_pattern_lines"] = 0
+
+        try:
+            with open(file_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                candidates = []
+                for line_number, line, _ in self._iter_candidate_lines(mm, start, end):
+                    candidates.append((line_number, line))
+                    if len(candidates) >= chunk_size:
+                        self._process_candidates_columnar(candidates, builder)
+                        candidates = []
+
+                if candidates:
+                    self._process_candidates_columnar(candidates, builder)
+
+                line_count = self._count_lines(mm, start, end)
+                lines_processed = line_count
+
+        except Exception as e:
+            print(f"Error reading byte range {start}-{end} of {file_path}: {e}")
+            errors_encountered += 1
+
+        return {
+            "records": builder,
+            "line_count": line_count,
+            "lines_processed": lines_processed,
+            "errors_encountered": errors_encountered + self.parsing_stats["errors_encountered"],
+            "fused_pattern_hits": self.parsing_stats["fused_pattern_hits"],
+            "fallback_pattern_lines": self.parsing_stats["fallback_pattern_lines"],
+        }
 
     def _process_chunk(self, chunk_lines: List[Tuple[int, str]]) -> List[Dict]:
         """Process a chunk of lines (legacy method for compatibility)"""
@@ -560,6 +1199,117 @@ class UnifiedParser:
         """Optimized line parsing with pre-compiled patterns and reduced regex calls"""
         records = []
 
+        fields = self._extract_statistics(line, water_pattern, datetime_pattern,
+                                          datetime_alt_pattern, serial_pattern)
+        if fields:
+            datetime_str, serial_number, normalized_param, count, max_val, min_val, avg_val = fields
+            record = {
+                'datetime': datetime_str,
+                'serial_number': serial_number,
+                'parameter_type': normalized_param,
+                'statistic_type': 'combined',
+                'count': count,
+                'max_value': max_val,
+                'min_value': min_val,
+                'avg_value': avg_val,
+                'line_number': line_number,
+                'quality': self._assess_data_quality_fast(normalized_param, avg_val, count)
+            }
+            records.append(record)
+
+        return records
+
+    def _process_chunk_columnar(self, chunk_lines: List[Tuple[int, str]],
+                                builder: ColumnarRecordBuilder) -> int:
+        """Chunk processing that appends straight into column buffers
+
+        Returns:
+            Number of records appended to the builder
+        """
+        appended = 0
+
+        water_pattern = self.patterns["water_parameters"]
+        datetime_pattern = self.patterns["datetime"]
+        datetime_alt_pattern = self.patterns["datetime_alt"]
+        serial_pattern = self.patterns["serial_number"]
+
+        for line_number, line in chunk_lines:
+            try:
+                # Early filtering - skip lines that clearly don't contain parameters
+                if 'count=' not in line or 'avg=' not in line:
+                    continue
+
+                fields = self._extract_statistics(line, water_pattern, datetime_pattern,
+                                                  datetime_alt_pattern, serial_pattern)
+                if fields:
+                    datetime_str, serial_number, normalized_param, count, max_val, min_val, avg_val = fields
+                    builder.append(datetime_str, serial_number, normalized_param,
+                                   count, max_val, min_val, avg_val, line_number,
+                                   self._assess_data_quality_fast(normalized_param, avg_val, count))
+                    appended += 1
+            except Exception as e:
+                self.parsing_stats["errors_encountered"] += 1
+
+        return appended
+
+    def _process_candidates_columnar(self, candidates: List[Tuple[int, bytes]],
+                                     builder: ColumnarRecordBuilder) -> int:
+        """Match candidate lines from the mmap scanner and append them to column buffers
+
+        Returns:
+            Number of records appended to the builder
+        """
+        appended = 0
+        fused_hits = 0
+        fallback_lines = 0
+        fused_match = self.byte_patterns["statistics_line"].match
+
+        for line_number, line in candidates:
+            try:
+                match = fused_match(line)
+                if match:
+                    fused_hits += 1
+                    fields = self._fields_from_fused_match(match)
+                else:
+                    # Unusual layout - fall back to the separate patterns
+                    fallback_lines += 1
+                    fields = self._extract_statistics_bytes(line)
+
+                if fields:
+                    datetime_str, serial_number, normalized_param, count, max_val, min_val, avg_val = fields
+                    builder.append(datetime_str, serial_number, normalized_param,
+                                   count, max_val, min_val, avg_val, line_number,
+                                   self._assess_data_quality_fast(normalized_param, avg_val, count))
+                    appended += 1
+            except Exception as e:
+                self.parsing_stats["errors_encountered"] += 1
+
+        self.parsing_stats["fused_pattern_hits"] += fused_hits
+        self.parsing_stats["fallback_pattern_lines"] += fallback_lines
+        return appended
+
+    def _fields_from_fused_match(self, match) -> Optional[Tuple]:
+        """Convert a statistics_line byte match to the _extract_statistics tuple"""
+        normalized_param = self._normalize_parameter_name_cached(match.group('param').decode('ascii').strip())
+        if not normalized_param:  # Parameter not in our target list
+            return None
+
+        date_part, time_part, serial, count, max_val, min_val, avg_val = match.group(
+            'date', 'time', 'serial', 'count', 'max', 'min', 'avg'
+        )
+        try:
+            return (f"{date_part.decode('ascii')} {time_part.decode('ascii')}", serial.decode('ascii'),
+                    normalized_param, int(count), float(max_val), float(min_val), float(avg_val))
+        except ValueError:
+            return None  # Skip malformed numeric data
+
+    def _extract_statistics(self, line: str, water_pattern, datetime_pattern,
+                            datetime_alt_pattern, serial_pattern) -> Optional[Tuple]:
+        """Extract (datetime, serial, parameter, count, max, min, avg) from a statistics line
+
+        Returns None when the line has no datetime, no statistics, an
+        untracked parameter, or malformed numbers.
+        """
         # Extract datetime with optimized patterns
         datetime_str = None
         match = datetime_pattern.search(line)
@@ -571,7 +1321,7 @@ class UnifiedParser:
                 datetime_str = f"{match.group(1)} {match.group(2)}"
 
         if not datetime_str:
-            return records
+            return None
 
         # Extract serial number (cached for performance)
         serial_number = None
@@ -581,37 +1331,61 @@ class UnifiedParser:
 
         # Extract parameters with statistics
         water_match = water_pattern.search(line)
-        if water_match:
-            param_name = water_match.group(1).strip()
+        if not water_match:
+            return None
 
-            # Optimized parameter filtering - use cached mapping
-            normalized_param = self._normalize_parameter_name_cached(param_name)
-            if not normalized_param:  # Parameter not in our target list
-                return records
+        param_name = water_match.group(1).strip()
 
-            try:
-                count = int(water_match.group(2))
-                max_val = float(water_match.group(3))
-                min_val = float(water_match.group(4))
-                avg_val = float(water_match.group(5))
-            except (ValueError, IndexError):
-                return records  # Skip malformed numeric data
+        # Optimized parameter filtering - use cached mapping
+        normalized_param = self._normalize_parameter_name_cached(param_name)
+        if not normalized_param:  # Parameter not in our target list
+            return None
 
-            record = {
-                'datetime': datetime_str,
-                'serial_number': serial_number,
-                'parameter_type': normalized_param,
-                'statistic_type': 'combined',
-                'count': count,
-                'max_value': max_val,
-                'min_value': min_val,
-                'avg_value': avg_val,
-                'line_number': line_number,
-                'quality': self._assess_data_quality_fast(normalized_param, avg_val, count)
-            }
-            records.append(record)
+        try:
+            count = int(water_match.group(2))
+            max_val = float(water_match.group(3))
+            min_val = float(water_match.group(4))
+            avg_val = float(water_match.group(5))
+        except (ValueError, IndexError):
+            return None  # Skip malformed numeric data
 
-        return records
+        return datetime_str, serial_number, normalized_param, count, max_val, min_val, avg_val
+
+    def _extract_statistics_bytes(self, line: bytes) -> Optional[Tuple]:
+        """Bytes version of _extract_statistics using the byte_patterns
+
+        Only the matched fields are decoded; int() and float() accept the
+        ASCII digit groups directly.
+        """
+        patterns = self.byte_patterns
+
+        match = patterns["datetime"].search(line) or patterns["datetime_alt"].search(line)
+        if not match:
+            return None
+        datetime_str = f"{match.group(1).decode('ascii')} {match.group(2).decode('ascii')}"
+
+        serial_number = None
+        match = patterns["serial_number"].search(line)
+        if match:
+            serial_number = match.group(1).decode('ascii')
+
+        water_match = patterns["water_parameters"].search(line)
+        if not water_match:
+            return None
+
+        normalized_param = self._normalize_parameter_name_cached(water_match.group(1).decode('ascii').strip())
+        if not normalized_param:  # Parameter not in our target list
+            return None
+
+        try:
+            count = int(water_match.group(2))
+            max_val = float(water_match.group(3))
+            min_val = float(water_match.group(4))
+            avg_val = float(water_match.group(5))
+        except (ValueError, IndexError):
+            return None  # Skip malformed numeric data
+
+        return datetime_str, serial_number, normalized_param, count, max_val, min_val, avg_val
 
     def _extract_datetime(self, line: str) -> Optional[str]:
         """Extract datetime with multiple pattern support"""
@@ -674,83 +1448,13 @@ class UnifiedParser:
         if param_name in self._param_cache:
             return self._param_cache[param_name]
 
-        # Clean parameter name - remove logStatistics prefix if present
-        cleaned_param = param_name.strip()
-        if cleaned_param.lower().startswith('logstatistics '):
-            cleaned_param = cleaned_param[14:]  # Remove "logStatistics " prefix
-
-        # First try exact match
-        for unified_name, config in self.parameter_mapping.items():
-            for pattern in config["patterns"]:
-                if pattern.lower() == cleaned_param.lower():
-                    self._param_cache[param_name] = unified_name
-                    return unified_name
-
-        # Then try pattern matching with full string contains
-        for unified_name, config in self.parameter_mapping.items():
-            for pattern in config["patterns"]:
-                if pattern.lower() in cleaned_param.lower() and len(pattern) > 5:  # Avoid short matches
-                    self._param_cache[param_name] = unified_name
-                    return unified_name
-
-        # Fallback to cleaned lookup
-        lookup_key = cleaned_param.lower().replace(" ", "").replace(":", "").replace("_", "")
-        result = self.pattern_to_unified.get(lookup_key, None)
+        result = self.name_resolver.resolve(param_name)
         self._param_cache[param_name] = result
         return result
 
     def _is_target_parameter(self, param_name: str) -> bool:
         """Check if parameter is one of the comprehensive target parameters"""
-        # Clean parameter name - remove logStatistics prefix if present
-        cleaned_param = param_name
-        if cleaned_param.lower().startswith('logstatistics '):
-            cleaned_param = cleaned_param[14:]  # Remove "logStatistics " prefix
-
-        param_lower = cleaned_param.lower().replace(" ", "").replace(":", "").replace("_", "")
-
-        # Comprehensive target keywords for all parameter types
-        target_keywords = [
-            # Fan and speed parameters
-            'fanremotetemp', 'fanhumidity', 'fanfanspeed', 'fanspeed', 'fan',
-
-            # Water system parameters
-            'magnetronflow', 'targetandcirculatorflow', 'citywaterflow',
-            'pumpressure', 'waterflow', 'flow', 'pump', 'chiller', 'watertank',
-
-            # Temperature parameters  
-            'magnetrontemp', 'colboardtemp', 'pdutemp', 'watertanktemp',
-            'ambienttemp', 'chillertemp', 'temp', 'temperature',
-
-            # Voltage parameters
-            'mlc_adc_chan_temp_banka', 'mlc_adc_chan_temp_bankb',
-            'col_adc_chan_temp', 'voltage', 'volt', '24v', '48v', '5v',
-            'banka', 'bankb', 'adc', 'mlc', 'col',
-
-            # Humidity parameters
-            'humidity', 'humid',
-
-            # Pressure parameters
-            'pressure', 'psi', 'bar'
-        ]
-
-        # Check if any target keyword is in the parameter name
-        for keyword in target_keywords:
-            if keyword in param_lower:
-                return True
-
-        # Also check our pattern mapping for exact matches
-        target_patterns = []
-        for param_config in self.parameter_mapping.values():
-            for pattern in param_config["patterns"]:
-                target_patterns.append(pattern.lower().replace(" ", "").replace(":", "").replace("_", ""))
-
-        # Check if the parameter name contains any of our target patterns
-        for pattern in target_patterns:
-            pattern_clean = pattern.lower().replace(" ", "").replace(":", "").replace("_", "")
-            if pattern_clean in param_lower or param_lower in pattern_clean:
-                return True
-
-        return False
+        return self.name_resolver.is_target(param_name)
 
     def _assess_data_quality(self, param_name: str, value: float, count: int) -> str:
         """Assess data quality for each reading"""
@@ -781,52 +1485,25 @@ class UnifiedParser:
         else:
             return "fair"
 
-    def _clean_and_validate_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate the parsed data"""
+    def _clean_and_validate_data(self, df: pd.DataFrame, explode_statistics: bool = True) -> pd.DataFrame:
+        """Clean and validate the parsed data
+
+        Args:
+            df: Combined records (one row per statistics line)
+            explode_statistics: Expand each row into avg/min/max rows for the
+                long water_logs layout. Pass False to keep the wide
+                avg_value/min_value/max_value frame for wide-format storage
+                (DatabaseManager.insert_data_batch accepts both).
+        """
         if df.empty:
             return df
 
         try:
-            # Convert datetime
-            df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+            df = self._clean_records(df)
 
-            # Remove rows with invalid datetime
-            df = df.dropna(subset=["datetime"])
-
-            # Sort by datetime
-            df = df.sort_values("datetime")
-
-            # Remove duplicates
-            df = df.drop_duplicates(
-                subset=["datetime", "serial_number", "parameter_type", "statistic_type"]
-            )
-
-            # Create additional columns needed by database manager for compatibility
-            if 'avg_value' in df.columns:
-                # Create separate records for avg, min, max for database compatibility
-                records = []
-                for _, row in df.iterrows():
-                    base_record = row.to_dict()
-
-                    # Average record
-                    avg_record = base_record.copy()
-                    avg_record['value'] = row['avg_value']
-                    avg_record['statistic_type'] = 'avg'
-                    records.append(avg_record)
-
-                    # Min record
-                    min_record = base_record.copy()
-                    min_record['value'] = row['min_value']
-                    min_record['statistic_type'] = 'min'
-                    records.append(min_record)
-
-                    # Max record
-                    max_record = base_record.copy()
-                    max_record['value'] = row['max_value']
-                    max_record['statistic_type'] = 'max'
-                    records.append(max_record)
-
-                df = pd.DataFrame(records)
+            # Create separate records for avg, min, max for database compatibility
+            if explode_statistics and 'avg_value' in df.columns:
+                df = self._explode_statistics(df)
 
             # Reset index
             df = df.reset_index(drop=True)
@@ -838,6 +1515,42 @@ class UnifiedParser:
 
         return df
 
+    def _clean_records(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Parse datetimes, drop invalid rows, sort and de-duplicate combined records"""
+        # Convert datetime
+        df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+
+        # Remove rows with invalid datetime
+        df = df.dropna(subset=["datetime"])
+
+        # Sort by datetime
+        df = df.sort_values("datetime")
+
+        # Remove duplicates
+        return df.drop_duplicates(
+            subset=["datetime", "serial_number", "parameter_type", "statistic_type"]
+        )
+
+    # Statistic rows produced per combined record, in output order
+    STATISTIC_COLUMNS = [("avg", "avg_value"), ("min", "min_value"), ("max", "max_value")]
+
+    def _explode_statistics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized wide-to-long transform: one avg, min and max row per combined row
+
+        Each input row is repeated once per statistic (keeping avg/min/max
+        order per reading), statistic_type is overwritten and the matching
+        value is placed in a new trailing 'value' column.
+        """
+        stat_names = [name for name, _ in self.STATISTIC_COLUMNS]
+        value_columns = [column for _, column in self.STATISTIC_COLUMNS]
+        row_count = len(df)
+
+        long_df = df.iloc[np.repeat(np.arange(row_count), len(stat_names))].copy()
+        long_df["statistic_type"] = np.tile(np.array(stat_names, dtype=object), row_count)
+        # Row-major ravel of the (rows x [avg, min, max]) block interleaves values per reading
+        long_df["value"] = df[value_columns].to_numpy(dtype=float).ravel()
+        return long_df
+
     # Fault Code Parsing Methods
     def load_fault_codes_from_file(self, file_path, source_type='uploaded'):
         """Load fault codes from file with specified source type"""
@@ -1377,4 +2090,19 @@ class UnifiedParser:
             return result_df.sort_values('datetime')
 
         except Exception as e:
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+
+# Per-process parser used by parse_linac_file_parallel pool workers
+_worker_parser: Optional[UnifiedParser] = None
+
+
+def _init_parallel_worker():
+    """Process pool initializer - build the parser once per worker process"""
+    global _worker_parser
+    _worker_parser = UnifiedParser()
+
+
+def _parse_byte_range_worker(file_path: str, start: int, end: int, chunk_size: int) -> Dict:
+    """Module-level entry point so the task can be pickled to pool workers"""
+    return _worker_parser._parse_byte_range(file_path, start, end, chunk_size)
@@ -107,8 +107,13 @@ class FileProcessingWorker(QThread, ThreadCrashSafetyMixin):
     status_update = pyqtSignal(str)  # status message
     finished = pyqtSignal(int, dict)  # records_count, parsing_stats
     error = pyqtSignal(str)  # error message
+    stage_progress = pyqtSignal(str, float, str)  # stage ("parse"/"write"), percentage, message
 
-    def __init__(self, file_path: str, file_size: int, database: DatabaseManager):
+    # Files above this size are parsed in a process pool
+    PARALLEL_PARSE_THRESHOLD = 64 * 1024 * 1024  # 64MB
+
+    def __init__(self, file_path: str, file_size: int, database: DatabaseManager,
+                 parallel_threshold: int = None, incremental: bool = False):
         QThread.__init__(self)
         ThreadCrashSafetyMixin.__init__(self)
         
@@ -117,6 +122,14 @@ class FileProcessingWorker(QThread, ThreadCrashSafetyMixin):
         self.database = database
         self.parser = UnifiedParser()
         self._cancel_requested = False
+
+        # Only import lines appended since the last import of this file
+        self.incremental = incremental
+
+        # Enable multi-process parsing for large files
+        if parallel_threshold is None:
+            parallel_threshold = self.PARALLEL_PARSE_THRESHOLD
+        self.use_parallel_parse = file_size > parallel_threshold
         
         # Optimize chunk size based on file size
         if file_size > 100 * 1024 * 1024:  # > 100MB
@@ -148,46 +161,61 @@ class FileProcessingWorker(QThread, ThreadCrashSafetyMixin):
         self._safe_emit(self.status_update, "Initializing parser...")
         self._safe_emit(self.progress_update, 10, "Starting file processing...", 0, 0, 0, self.file_size)
 
-        # Parse file with chunked processing
-        df = self.parser.parse_linac_file(
-            file_path=self.file_path,
-            chunk_size=self.chunk_size,
-            progress_callback=self._progress_callback,
-            cancel_callback=self._cancel_callback,
-        )
+        if self.incremental:
+            self._incremental_processing()
+            return
+
+        # Skip files whose content was imported before, import grown copies as a delta
+        import_check = self._check_import_registry()
+        if import_check and import_check["status"] == "duplicate":
+            known = import_check["known"]
+            self._safe_emit(self.status_update, f"Already imported as {known['filename']} - skipped")
+            parsing_stats = self.parser.get_parsing_stats()
+            parsing_stats["duplicate_of"] = known["filename"]
+            self._safe_emit(self.progress_update, 100, "File already imported",
+                           0, 0, self.file_size, self.file_size)
+            self._safe_emit(self.finished, 0, parsing_stats)
+            return
+
+        start_offset = import_check["start_offset"] if import_check else 0
+        start_line = import_check["start_line"] if import_check else 1
+        if start_offset:
+            self._safe_emit(self.status_update,
+                            f"Importing new data after byte {start_offset:,} "
+                            f"(extends {import_check['known']['filename']})")
+
+        if self.use_parallel_parse:
+            records_parsed, records_inserted = self._parse_then_insert(start_offset, start_line)
+        else:
+            records_parsed, records_inserted = self._pipelined_import(start_offset, start_line)
 
         if self._cancel_requested:
             self._safe_emit(self.status_update, "Processing cancelled by user")
             return
 
-        if df.empty:
+        if records_parsed == 0:
+            self._register_import(import_check, 0)
             self._safe_emit(self.finished, 0, self.parser.get_parsing_stats())
             return
 
-        # Update progress for database insertion
-        self._safe_emit(self.status_update, "Saving data to database...")
-        self._safe_emit(self.progress_update, 90, "Inserting records into database...",
-                       self.parser.parsing_stats["lines_processed"],
-                       self.parser.parsing_stats["lines_processed"],
-                       self.file_size, self.file_size)
-
-        # Insert data into database in optimized batches
-        batch_size = min(1000, max(100, len(df) // 10))  # Dynamic batch size
-        records_inserted = self.database.insert_data_batch(df, batch_size=batch_size)
-
-        # Insert file metadata
+        # Insert file metadata (queued with the other small writes)
         filename = os.path.basename(self.file_path)
         parsing_stats_json = json.dumps(self.parser.get_parsing_stats())
-        self.database.insert_file_metadata(
+        self.database.submit_write(
+            self.database.insert_file_metadata,
             filename=filename,
             file_size=self.file_size,
             records_imported=records_inserted,
             parsing_stats=parsing_stats_json,
+            coalesce=True,
         )
 
-        # Create backup after successful processing
+        if records_inserted == records_parsed:
+            self._register_import(import_check, records_inserted)
+
+        # Create backup after successful processing, once the queued writes are in
         if hasattr(self.database, 'create_backup'):
-            self.database.create_backup()
+            self.database.submit_write(self.database.create_backup).result()
 
         # Final progress update
         self._safe_emit(self.progress_update, 100, "Processing completed successfully!",
@@ -198,6 +226,136 @@ class FileProcessingWorker(QThread, ThreadCrashSafetyMixin):
         # Emit completion signal
         self._safe_emit(self.finished, records_inserted, self.parser.get_parsing_stats())
         
+    def _parse_then_insert(self, start_offset: int, start_line: int):
+        """Parse the whole file (process pool), then insert it
+
+        Returns:
+            (database rows parsed, database rows inserted)
+        """
+        df = self.parser.parse_linac_file(
+            file_path=self.file_path,
+            chunk_size=self.chunk_size,
+            progress_callback=self._progress_callback,
+            cancel_callback=self._cancel_callback,
+            parallel=self.use_parallel_parse,
+            explode_statistics=False,  # database expands avg/min/max on insert
+            start_offset=start_offset,
+            start_line=start_line,
+        )
+
+        if self._cancel_requested or df.empty:
+            return 0, 0
+
+        # Update progress for database insertion
+        self._safe_emit(self.status_update, "Saving data to database...")
+        self._safe_emit(self.progress_update, 90, "Inserting records into database...",
+                       self.parser.parsing_stats["lines_processed"],
+                       self.parser.parsing_stats["lines_processed"],
+                       self.file_size, self.file_size)
+
+        # Bulk-load the parsed file straight from its column arrays
+        records_inserted = self.database.submit_write(self.database.insert_bulk, df).result()
+        return len(df) * 3, records_inserted
+
+    def _pipelined_import(self, start_offset: int, start_line: int):
+        """Parse in this thread while a writer thread inserts finished chunks
+
+        Returns:
+            (database rows parsed, database rows inserted)
+        """
+        from ingest_pipeline import stream_linac_file
+
+        byte_span = max(self.file_size - start_offset, 1)
+
+        def stage_percentage(position):
+            if position is None:
+                return 100.0
+            return max(0.0, min(100.0, (position - start_offset) / byte_span * 100.0))
+
+        def on_parsed(lines_processed, position):
+            percentage = stage_percentage(position)
+            message = f"Parsed {lines_processed:,} lines"
+            self._safe_emit(self.stage_progress, "parse", percentage, message)
+
+        def on_written(rows_inserted, position):
+            percentage = stage_percentage(position)
+            message = f"Saved {rows_inserted:,} records"
+            self._safe_emit(self.stage_progress, "write", percentage, message)
+
+            # Overall progress follows the slower (writer) stage
+            lines_processed = self.parser.parsing_stats.get("lines_processed", 0)
+            self._safe_emit(self.progress_update, 10 + percentage * 0.85, message,
+                            lines_processed, max(lines_processed, int(self.file_size / 100)),
+                            int(position or self.file_size), self.file_size)
+
+        self._safe_emit(self.status_update, "Parsing and saving data...")
+        result = stream_linac_file(
+            self.file_path,
+            self.database,
+            parser=self.parser,
+            chunk_size=self.chunk_size,
+            parse_progress_callback=on_parsed,
+            write_progress_callback=on_written,
+            cancel_callback=self._cancel_callback,
+            start_offset=start_offset,
+            start_line=start_line,
+        )
+
+        if "validation_summary" in result["parsing_stats"]:
+            self.parser.parsing_stats["validation_summary"] = result["parsing_stats"]["validation_summary"]
+
+        return result["records_parsed"], result["records_inserted"]
+
+    def _check_import_registry(self):
+        """Look the file up in the content-hash import registry (None if unavailable)"""
+        try:
+            from import_registry import ImportRegistry
+            self._safe_emit(self.status_update, "Checking for previously imported content...")
+            return ImportRegistry(self.database).check_file(self.file_path)
+        except Exception as e:
+            print(f"⚠️ Import registry check failed: {e}")
+            return None
+
+    def _register_import(self, import_check, records_inserted: int):
+        """Record the imported content so re-imports of it are skipped"""
+        if not import_check:
+            return
+        try:
+            from import_registry import ImportRegistry
+            ImportRegistry(self.database).register(
+                import_check,
+                filename=os.path.basename(self.file_path),
+                lines_parsed=self.parser.parsing_stats["lines_processed"],
+                records_imported=records_inserted,
+            )
+        except Exception as e:
+            print(f"⚠️ Could not register import: {e}")
+
+    def _incremental_processing(self):
+        """Tail-follow import - parse and insert only the appended part of the file"""
+        from incremental_ingest import IncrementalIngestor
+
+        ingestor = IncrementalIngestor(self.database, self.parser)
+        result = ingestor.ingest(
+            self.file_path,
+            progress_callback=self._progress_callback,
+            cancel_callback=self._cancel_callback,
+        )
+
+        if self._cancel_requested:
+            self._safe_emit(self.status_update, "Processing cancelled by user")
+            return
+
+        parsing_stats = self.parser.get_parsing_stats()
+        parsing_stats["incremental_mode"] = result["mode"]
+        parsing_stats["start_offset"] = result["start_offset"]
+        parsing_stats["end_offset"] = result["end_offset"]
+
+        self._safe_emit(self.progress_update, 100, "Processing completed successfully!",
+                       parsing_stats["lines_processed"], parsing_stats["lines_processed"],
+                       self.file_size, self.file_size)
+        self._safe_emit(self.finished, result["records_inserted"], parsing_stats)
+
     def _cleanup_resources(self):
         """Override cleanup to handle file processing specific resources"""
         try:
@@ -323,19 +481,19 @@ class DatabaseWorker(QThread, ThreadCrashSafetyMixin):
         """Main database operation logic wrapped by crash safety"""
         if self.operation == "clear_all":
             self._safe_emit(self.db_progress, 50, "Clearing database...")
-            self.database.clear_all()
+            self.database.submit_write(self.database.clear_all).result()
             self._safe_emit(self.db_progress, 100, "Database cleared successfully")
             self._safe_emit(self.db_finished, True, "Database cleared successfully")
 
         elif self.operation == "vacuum":
             self._safe_emit(self.db_progress, 50, "Optimizing database...")
-            self.database.vacuum_database()
+            self.database.submit_write(self.database.vacuum_database).result()
             self._safe_emit(self.db_progress, 100, "Database optimized")
             self._safe_emit(self.db_finished, True, "Database optimized successfully")
             
         elif self.operation == "backup":
             self._safe_emit(self.db_progress, 50, "Creating database backup...")
-            success = self.database.create_backup()
+            success = self.database.submit_write(self.database.create_backup).result()
             self._safe_emit(self.db_progress, 100, "Backup completed")
             self._safe_emit(self.db_finished, success, "Backup created successfully" if success else "Backup failed")
 
@@ -0,0 +1,189 @@
+"""
+Database Write Queue for HALbasic
+Single-writer service for database mutations.
+
+Write jobs (batch inserts, file metadata, validation logs, clear_all, backups)
+are submitted from any thread and run one at a time on a dedicated thread
+that holds the connection pool's writer, so callers never wait on a SQLite
+write lock. Each submission returns a concurrent.futures.Future.
+
+Small jobs submitted with coalesce=True are grouped into one transaction,
+each inside its own SAVEPOINT so a failing job is rolled back alone. Their
+futures complete after the shared COMMIT. Other jobs run on their own and
+manage their transactions themselves (e.g. insert_wide_batch).
+
+Developer: HALog Enhancement Team
+Company: gobioeng.com
+"""
+
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Callable, Dict, List, Optional
+
+
+_STOP = object()
+
+
+class _WriteJob:
+    __slots__ = ("fn", "args", "kwargs", "coalesce", "future")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, coalesce: bool):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.coalesce = coalesce
+        self.future = Future()
+
+
+class DatabaseWriteQueue(threading.Thread):
+    """Runs submitted write jobs in order on one thread holding the database writer"""
+
+    def __init__(self, database, max_coalesced_jobs: int = 256):
+        """
+        Args:
+            database: DatabaseManager whose get_connection() is the writer
+            max_coalesced_jobs: Coalesced jobs committed in one transaction at most
+        """
+        super().__init__(name="database-write-queue", daemon=True)
+        self.database = database
+        self.max_coalesced_jobs = max(1, max_coalesced_jobs)
+        self.queue = Queue()
+        self._held_job = None  # non-coalesced job that ended a coalesced group
+        self._stopped = False
+        self._metrics = {
+            "jobs_submitted": 0,
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "transactions": 0,
+            "coalesced_jobs": 0,
+            "busy_time": 0.0,
+        }
+
+    def submit(self, fn: Callable, *args, coalesce: bool = False, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) to run on the writer thread
+
+        Args:
+            coalesce: Run inside a transaction shared with other small jobs;
+                fn must not BEGIN or COMMIT itself
+
+        Returns:
+            Future with fn's return value or exception
+        """
+        if self._stopped:
+            raise RuntimeError("Database write queue is shut down")
+        job = _WriteJob(fn, args, kwargs, coalesce)
+        self._metrics["jobs_submitted"] += 1
+        self.queue.put(job)
+        return job.future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every job submitted so far has finished"""
+        if not self.is_alive():
+            return self.queue.empty()
+        try:
+            self.submit(lambda: None).result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def shutdown(self, wait: bool = True):
+        """Finish the queued jobs, then stop the thread"""
+        if not self._stopped:
+            self._stopped = True
+            self.queue.put(_STOP)
+        if wait and self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+    def get_metrics(self) -> Dict:
+        """Job and transaction counters plus the current queue depth"""
+        metrics = dict(self._metrics)
+        metrics["queue_depth"] = self.queue.qsize()
+        return metrics
+
+    def _next_job(self):
+        if self._held_job is not None:
+            job, self._held_job = self._held_job, None
+            return job
+        return self.queue.get()
+
+    def _collect_group(self, first: _WriteJob) -> List[_WriteJob]:
+        """first plus the coalesced jobs queued right behind it"""
+        group = [first]
+        while len(group) < self.max_coalesced_jobs:
+            try:
+                job = self.queue.get_nowait()
+            except Empty:
+                break
+            if job is _STOP or not job.coalesce:
+                self._held_job = job
+                break
+            group.append(job)
+        return group
+
+    def run(self):
+        while True:
+            job = self._next_job()
+            if job is _STOP:
+                return
+            start = time.time()
+            if job.coalesce:
+                self._run_group(self._collect_group(job))
+            else:
+                self._run_job(job)
+            self._metrics["busy_time"] += time.time() - start
+
+    def _finish(self, job: _WriteJob, result=None, error: Optional[BaseException] = None):
+        if error is None:
+            job.future.set_result(result)
+            self._metrics["jobs_completed"] += 1
+        else:
+            job.future.set_exception(error)
+            self._metrics["jobs_failed"] += 1
+
+    def _run_job(self, job: _WriteJob):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            # Waits for the writer as long as it takes; callers hold a future instead
+            with self.database.get_connection(timeout=-1):
+                result = job.fn(*job.args, **job.kwargs)
+            self._metrics["transactions"] += 1
+            self._finish(job, result)
+        except BaseException as e:
+            print(f"❌ Database write job failed: {e}")
+            self._finish(job, error=e)
+
+    def _run_group(self, group: List[_WriteJob]):
+        group = [job for job in group if job.future.set_running_or_notify_cancel()]
+        if not group:
+            return
+
+        outcomes = []
+        try:
+            with self.database.get_connection(timeout=-1) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for job in group:
+                    conn.execute("SAVEPOINT write_job")
+                    try:
+                        result = job.fn(*job.args, **job.kwargs)
+                        conn.execute("RELEASE write_job")
+                        outcomes.append((job, result, None))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_job")
+                        conn.execute("RELEASE write_job")
+                        outcomes.append((job, None, e))
+                conn.execute("COMMIT")
+        except BaseException as e:
+            print(f"❌ Coalesced database write of {len(group)} jobs failed: {e}")
+            traceback.print_exc()
+            for job in group:
+                self._finish(job, error=e)
+            return
+
+        self._metrics["transactions"] += 1
+        self._metrics["coalesced_jobs"] += len(group)
+        for job, result, error in outcomes:
+            self._finish(job, result, error)